@@ -1,6 +1,47 @@
-"""Blender Building Generator Package"""
+"""Blender Building Generator Package
 
-from .utils import clear_scene, create_material, export_to_gltf, OUTPUT_DIR
-from .building import create_building, create_floor, create_entrance, create_text_on_wall, create_text_on_roof_edge
-from .environment import create_tree, create_road
-from .scenes import create_combined_scene
+하위 모듈은 처음 쓰는 이름에 맞춰 필요할 때 불러온다 (모듈 __getattr__).
+설정 검증 / 계획만 하는 도구나 배치 워커는 bpy와 Blender 쪽 모듈을 불러오지 않고,
+bpy는 Blender 오브젝트를 만지는 함수 안에서만 import한다.
+"""
+
+import importlib
+
+# 패키지에서 바로 꺼낼 수 있는 이름 -> 하위 모듈
+_EXPORTS = {
+    'clear_scene': 'utils',
+    'create_material': 'utils',
+    'material_cache': 'utils',
+    'export_to_gltf': 'utils',
+    'OUTPUT_DIR': 'utils',
+    'MESH_MODE_OPS': 'mesh_data',
+    'MESH_MODE_DATA': 'mesh_data',
+    'create_building': 'building',
+    'create_floor': 'building',
+    'create_entrance': 'building',
+    'create_text_on_wall': 'building',
+    'create_text_on_roof_edge': 'building',
+    'merge_building': 'building',
+    'create_building_lods': 'building',
+    'create_tree': 'environment',
+    'create_tree_instances': 'environment',
+    'create_road': 'environment',
+    'create_combined_scene': 'scenes',
+    'ConfigError': 'schema',
+    'validate_config': 'schema',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
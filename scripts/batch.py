@@ -0,0 +1,169 @@
+"""여러 씬 설정을 병렬로 생성하는 배치 진입점
+
+씬 하나마다 별도 프로세스 (blender --background 또는 bpy 모듈을 쓰는 python)를
+띄워 create_scene_from_config를 실행하므로, 한 씬이 죽어도 나머지는 계속된다.
+
+사용 예:
+    python -m scripts.batch "configs/*.json" --workers 8 --blender blender
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "batch")
+
+# 자식 프로세스가 create_scene_from_config 결과를 돌려줄 때 쓰는 표식
+RESULT_MARKER = "BATCH_RESULT "
+
+_SCENE_SCRIPT = (
+    "import sys, json; sys.path.insert(0, {root!r}); "
+    "from scripts.{module} import {function}; "
+    "stats = {function}({config!r}, output_dir={output_dir!r}, **{options!r}); "
+    "print({marker!r} + json.dumps(stats))"
+)
+
+
+def find_configs(patterns):
+    """디렉토리 또는 glob 패턴들에서 설정 JSON 파일 목록 반환 (정렬, 중복 제거)"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.json")
+        paths.update(os.path.abspath(p) for p in glob.glob(pattern))
+    return sorted(paths)
+
+
+def scene_command(config_path, output_dir, blender=None, options=None):
+    """씬 하나를 생성하는 자식 프로세스 명령
+
+    Args:
+        blender: Blender 실행 파일 (None이면 현재 python에서 bpy 모듈 사용)
+        options: create_scene_from_config에 넘길 추가 키워드 인자
+            ('tile_size'가 있으면 create_tiled_scene_from_config로 타일 단위 생성)
+    """
+    options = options or {}
+    tiled = options.get('tile_size') is not None
+    code = _SCENE_SCRIPT.format(
+        root=PROJECT_ROOT,
+        module="tiles" if tiled else "scenes",
+        function="create_tiled_scene_from_config" if tiled else "create_scene_from_config",
+        config=config_path,
+        output_dir=output_dir,
+        options=options,
+        marker=RESULT_MARKER,
+    )
+    if blender:
+        return [blender, "--background", "--factory-startup", "--python-exit-code", "1",
+                "--python-expr", code]
+    return [sys.executable, "-c", code]
+
+
+def run_scene(config_path, output_dir, blender=None, timeout=None, options=None):
+    """씬 하나를 자식 프로세스로 생성하고 결과 dict 반환 (예외를 던지지 않음)"""
+    stem = os.path.splitext(os.path.basename(config_path))[0]
+    scene_output_dir = os.path.join(output_dir, stem)
+    result = {'config': config_path, 'output_dir': scene_output_dir, 'ok': False}
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            scene_command(config_path, scene_output_dir, blender, options),
+            capture_output=True, text=True, timeout=timeout, cwd=PROJECT_ROOT
+        )
+    except subprocess.TimeoutExpired:
+        result['error'] = f"timeout after {timeout}s"
+    except OSError as e:
+        result['error'] = str(e)
+    else:
+        result['returncode'] = proc.returncode
+        for line in proc.stdout.splitlines():
+            if line.startswith(RESULT_MARKER):
+                result['stats'] = json.loads(line[len(RESULT_MARKER):])
+        result['ok'] = proc.returncode == 0 and 'stats' in result
+        if not result['ok']:
+            result['error'] = (proc.stderr or proc.stdout).strip()[-2000:]
+    result['seconds'] = round(time.perf_counter() - start, 3)
+
+    return result
+
+
+def run_batch(config_paths, workers=None, output_dir=DEFAULT_OUTPUT_DIR, blender=None,
+              timeout=None, options=None):
+    """설정 파일들을 workers개 프로세스로 나눠 생성하고 요약 리포트 반환"""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = []
+
+    # 실제 작업은 자식 프로세스가 하므로 스레드는 대기만 한다
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_scene, path, output_dir, blender, timeout, options)
+                   for path in config_paths]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "ok" if result['ok'] else "FAILED"
+            print(f"[{status}] {result['config']} ({result['seconds']}s)")
+            results.append(result)
+
+    results.sort(key=lambda r: r['config'])
+    seconds = [r['seconds'] for r in results if r['ok']]
+    return {
+        'workers': workers,
+        'total': len(results),
+        'succeeded': len(seconds),
+        'failed': len(results) - len(seconds),
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'scene_seconds': {
+            'sum': round(sum(seconds), 3),
+            'max': max(seconds) if seconds else 0,
+            'mean': round(sum(seconds) / len(seconds), 3) if seconds else 0,
+        },
+        'scenes': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 씬 설정을 병렬로 생성")
+    parser.add_argument("configs", nargs="+", help="설정 JSON 디렉토리 또는 glob 패턴")
+    parser.add_argument("--workers", type=int, default=None, help="동시 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--blender", default=None, help="Blender 실행 파일 (없으면 python + bpy 모듈)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--timeout", type=float, default=None, help="씬 하나당 제한 시간 (초)")
+    parser.add_argument("--report", default=None, help="요약 리포트 JSON 경로")
+    parser.add_argument("--mesh-mode", default="ops", choices=["ops", "data"])
+    parser.add_argument("--merge", action="store_true")
+    parser.add_argument("--instancing", action="store_true")
+    parser.add_argument("--incremental", action="store_true", help="엔티티 캐시로 바뀐 것만 재생성")
+    parser.add_argument("--exporter", default="blender", choices=["blender", "direct"])
+    parser.add_argument("--lods", action="store_true", help="건물 간략화 단계 (LOD1, LOD2) 함께 내보내기")
+    parser.add_argument("--tile-size", type=float, default=None, help="격자 타일 크기 (지정하면 타일별 GLB로 저장)")
+    args = parser.parse_args(argv)
+
+    config_paths = find_configs(args.configs)
+    if not config_paths:
+        parser.error("no config files matched")
+
+    options = {'mesh_mode': args.mesh_mode, 'merge': args.merge, 'instancing': args.instancing,
+               'incremental': args.incremental, 'exporter': args.exporter, 'lods': args.lods}
+    if args.tile_size is not None:
+        options['tile_size'] = args.tile_size
+    report = run_batch(config_paths, args.workers, args.output_dir, args.blender, args.timeout, options)
+
+    report_path = args.report or os.path.join(args.output_dir, "batch_report.json")
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"{report['succeeded']}/{report['total']} scenes in {report['wall_seconds']}s "
+          f"({report['workers']} workers), report: {report_path}")
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""씬 생성/내보내기 규모별 벤치마크
+
+scene_config.json과 같은 스키마의 합성 설정 (건물/나무 10, 100, 1000, 10000개)
+을 만들어 크기마다 새 프로세스에서 create_scene_from_config를 실행하고,
+단계별 시간, 최대 RSS, 오브젝트 수, 출력 파일 크기를 기록한다.
+결과는 JSON 기록 파일에 쌓이고 compare로 두 실행을 비교한다.
+
+사용 예:
+    python scripts/benchmark.py run --sizes 10 100 1000 --blender blender
+    python scripts/benchmark.py compare            # 기록의 마지막 두 실행 비교
+    python scripts/benchmark.py compare 0 3 --threshold 0.2
+    python scripts/benchmark.py imports --repeat 5   # 패키지 / 모듈 import 시간
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output", "benchmark")
+DEFAULT_HISTORY = os.path.join(DEFAULT_OUTPUT_DIR, "history.json")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+RESULT_MARKER = "BENCHMARK_RESULT "
+
+# 건물 한 칸 간격 (미터) - 가장 큰 합성 건물보다 넉넉하게
+LOT_SIZE = 24
+
+_MEASURE_SCRIPT = (
+    "import sys, json; sys.path.insert(0, {root!r}); "
+    "from scripts.benchmark import measure_scene; "
+    "print({marker!r} + json.dumps(measure_scene({config!r}, {output_dir!r}, {options!r})))"
+)
+
+_IMPORT_SCRIPT = (
+    "import sys, time, json; sys.path.insert(0, {root!r}); "
+    "start = time.perf_counter(); {statement}; seconds = time.perf_counter() - start; "
+    "print({marker!r} + json.dumps({{'seconds': seconds, 'bpy': 'bpy' in sys.modules, "
+    "'modules': len(sys.modules)}}))"
+)
+
+# import 시간을 재는 문장 - 도구 / 배치 워커가 실제로 쓰는 진입점
+IMPORT_TARGETS = (
+    "import scripts",
+    "from scripts import validate_config",
+    "from scripts.config_stream import iter_config",
+    "from scripts.batch import run_batch",
+    "from scripts.scenes import create_scene_from_config",
+    "from scripts import create_combined_scene",
+)
+
+# 낮을수록 좋은 비교 지표 (단계별 시간은 'stages'에서 따로 비교)
+METRICS = ('seconds', 'peak_rss_mb', 'objects', 'output_bytes')
+
+
+def synthetic_config(count, seed=0):
+    """건물 count개, 나무 count개짜리 설정 dict (격자 배치, 시드 고정)"""
+    rng = random.Random(seed)
+    columns = max(1, math.ceil(math.sqrt(count)))
+    labels = ("SHOP", "OFFICE", "CAFE", "BANK", "HOTEL")
+
+    buildings = []
+    for i in range(count):
+        row, column = divmod(i, columns)
+        floors = rng.randint(1, 3)
+        building = {
+            "type": "synthetic",
+            "name": f"Building_{i}",
+            "position": [column * LOT_SIZE, row * LOT_SIZE],
+            "floors": floors,
+            "width": rng.choice((8, 10, 12, 14)),
+            "depth": rng.choice((6, 8, 10)),
+            "floorHeight": 4,
+            "wallColor": [round(rng.uniform(0.2, 0.95), 2) for _ in range(3)],
+            "entrance": {"width": 3, "height": 2.8},
+        }
+        if rng.random() < 0.5:
+            building.update({"text": rng.choice(labels), "textColor": [0.1, 0.1, 0.1],
+                             "textPosition": rng.choice(("wall", "roof")), "textFloor": floors})
+        buildings.append(building)
+
+    trees = [
+        {"position": [(i % columns) * LOT_SIZE + LOT_SIZE / 2, (i // columns) * LOT_SIZE - LOT_SIZE / 2],
+         "height": round(rng.uniform(3.5, 5), 2)}
+        for i in range(count)
+    ]
+
+    return {
+        "scene": {"name": f"benchmark_{count}"},
+        "buildings": buildings,
+        "road": {"enabled": True, "position": [(columns - 1) * LOT_SIZE / 2, -LOT_SIZE, 0],
+                 "length": columns * LOT_SIZE, "width": 8},
+        "trees": trees,
+    }
+
+
+def _peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _output_bytes(output_file):
+    """.gltf/.glb 와 같은 이름의 .bin 크기"""
+    sizes = {}
+    stem = os.path.splitext(output_file)[0]
+    for path in (output_file, stem + ".bin"):
+        if os.path.exists(path):
+            sizes[os.path.splitext(path)[1].lstrip('.')] = os.path.getsize(path)
+    return sizes
+
+
+def measure_scene(config_path, output_dir, options=None):
+    """(자식 프로세스 안에서) 씬 하나를 생성하고 측정값 dict 반환"""
+    import bpy
+    from scripts.scenes import create_scene_from_config
+    from scripts.instrument import instrumented
+
+    start = time.perf_counter()
+    with instrumented() as profile:
+        stats = create_scene_from_config(config_path, output_dir=output_dir, **(options or {}))
+    seconds = time.perf_counter() - start
+
+    sizes = _output_bytes(stats['output'])
+    return {
+        'seconds': round(seconds, 4),
+        'stages': {name: round(entry['seconds'], 4) for name, entry in profile['spans'].items()},
+        'counters': profile['counters'],
+        'peak_rss_mb': _peak_rss_mb(),
+        'objects': len(bpy.data.objects),
+        'meshes': len(bpy.data.meshes),
+        'materials': len(bpy.data.materials),
+        'output_bytes': sum(sizes.values()),
+        'output_files': sizes,
+    }
+
+
+def _command(code, blender=None):
+    if blender:
+        return [blender, "--background", "--factory-startup", "--python-exit-code", "1",
+                "--python-expr", code]
+    return [sys.executable, "-c", code]
+
+
+def run_case(count, output_dir=DEFAULT_OUTPUT_DIR, blender=None, timeout=None, options=None):
+    """크기 하나를 새 프로세스에서 측정 (예외를 던지지 않음)"""
+    case_dir = os.path.join(output_dir, f"n{count}")
+    os.makedirs(case_dir, exist_ok=True)
+    config_path = os.path.join(case_dir, "config.json")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_config(count), f)
+
+    code = _MEASURE_SCRIPT.format(root=PROJECT_ROOT, marker=RESULT_MARKER, config=config_path,
+                                  output_dir=case_dir, options=options or {})
+    result = {'size': count, 'ok': False}
+    try:
+        proc = subprocess.run(_command(code, blender), capture_output=True, text=True,
+                              timeout=timeout, cwd=PROJECT_ROOT)
+    except subprocess.TimeoutExpired:
+        result['error'] = f"timeout after {timeout}s"
+        return result
+    except OSError as e:
+        result['error'] = str(e)
+        return result
+
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            result.update(json.loads(line[len(RESULT_MARKER):]))
+            result['ok'] = proc.returncode == 0
+    if not result['ok']:
+        result['error'] = (proc.stderr or proc.stdout).strip()[-2000:]
+    return result
+
+
+def measure_imports(targets=IMPORT_TARGETS, repeat=5, blender=None, timeout=60):
+    """import 문마다 새 프로세스를 repeat번 띄워 걸린 시간 측정
+
+    Returns:
+        [{'statement', 'seconds': 중앙값, 'min', 'bpy': bpy를 불러왔는지, 'modules': 불러온 모듈 수}
+        또는 실패 시 {'statement', 'error'}]
+    """
+    results = []
+    for statement in targets:
+        code = _IMPORT_SCRIPT.format(root=PROJECT_ROOT, statement=statement, marker=RESULT_MARKER)
+        samples = []
+        error = None
+        for _ in range(repeat):
+            proc = subprocess.run(_command(code, blender), capture_output=True, text=True, timeout=timeout)
+            lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+            if proc.returncode != 0 or not lines:
+                error = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+                break
+            samples.append(json.loads(lines[-1][len(RESULT_MARKER):]))
+        if error is not None:
+            results.append({'statement': statement, 'error': error})
+            continue
+        seconds = sorted(sample['seconds'] for sample in samples)
+        results.append({
+            'statement': statement,
+            'seconds': round(seconds[len(seconds) // 2], 4),
+            'min': round(seconds[0], 4),
+            'bpy': samples[-1]['bpy'],
+            'modules': samples[-1]['modules'],
+        })
+    return results
+
+
+def _git_revision():
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=PROJECT_ROOT)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, output_dir=DEFAULT_OUTPUT_DIR, blender=None, timeout=None,
+                  options=None):
+    """크기별로 측정해 실행 기록 dict 반환"""
+    run = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'revision': _git_revision(),
+        'options': options or {},
+        'cases': [],
+    }
+    for count in sizes:
+        case = run_case(count, output_dir, blender, timeout, options)
+        if case['ok']:
+            print(f"[n={count}] {case['seconds']}s, {case['peak_rss_mb']} MB, "
+                  f"{case['objects']} objects, {case['output_bytes']} bytes")
+        else:
+            print(f"[n={count}] FAILED: {case['error'].splitlines()[-1] if case['error'] else ''}")
+        run['cases'].append(case)
+    return run
+
+
+def load_history(path=DEFAULT_HISTORY):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def append_history(run, path=DEFAULT_HISTORY):
+    history = load_history(path)
+    history.append(run)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    return len(history) - 1
+
+
+def compare_runs(base, head, threshold=0.1, min_seconds=0.05):
+    """두 실행을 크기별로 비교해 threshold 비율보다 나빠진 항목 리스트 반환
+
+    min_seconds보다 짧은 시간 측정은 잡음이 커서 비교하지 않는다.
+    """
+    regressions = []
+    base_cases = {case['size']: case for case in base['cases'] if case.get('ok')}
+
+    for case in head['cases']:
+        before = base_cases.get(case['size'])
+        if before is None or not case.get('ok'):
+            continue
+
+        pairs = [(metric, before.get(metric), case.get(metric)) for metric in METRICS]
+        pairs += [(f"stages.{name}", before['stages'].get(name), value)
+                  for name, value in case['stages'].items()]
+        for metric, old, new in pairs:
+            if old is None or new is None:
+                continue
+            timed = metric == 'seconds' or metric.startswith('stages.')
+            if timed and max(old, new) < min_seconds:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append({
+                    'size': case['size'], 'metric': metric, 'base': old, 'head': new,
+                    'change': round(new / old - 1, 3) if old else None,
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="씬 생성 규모별 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="합성 설정으로 측정하고 기록에 추가")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run_parser.add_argument("--blender", default=None, help="Blender 실행 파일 (없으면 python + bpy 모듈)")
+    run_parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    run_parser.add_argument("--history", default=DEFAULT_HISTORY)
+    run_parser.add_argument("--timeout", type=float, default=None, help="크기 하나당 제한 시간 (초)")
+    run_parser.add_argument("--mesh-mode", default="ops", choices=["ops", "data"])
+    run_parser.add_argument("--merge", action="store_true")
+    run_parser.add_argument("--instancing", action="store_true")
+    run_parser.add_argument("--exporter", default="blender", choices=["blender", "direct"])
+
+    compare_parser = sub.add_parser("compare", help="기록의 두 실행 비교 (기본: 마지막 두 개)")
+    compare_parser.add_argument("base", type=int, nargs="?", default=-2, help="기준 실행 번호")
+    compare_parser.add_argument("head", type=int, nargs="?", default=-1, help="비교할 실행 번호")
+    compare_parser.add_argument("--history", default=DEFAULT_HISTORY)
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 볼 증가 비율")
+    imports_parser = sub.add_parser("imports", help="진입점별 import 시간 (새 프로세스)")
+    imports_parser.add_argument("--repeat", type=int, default=5)
+    imports_parser.add_argument("--blender", default=None, help="Blender 실행 파일 (없으면 python)")
+    args = parser.parse_args(argv)
+
+    if args.command == "imports":
+        results = measure_imports(repeat=args.repeat, blender=args.blender)
+        for r in results:
+            if 'error' in r:
+                print(f"  {r['statement']:<55} FAILED: {r['error']}")
+            else:
+                print(f"  {r['statement']:<55} {r['seconds'] * 1000:8.1f} ms (min {r['min'] * 1000:.1f}) "
+                      f"{r['modules']:4d} modules{'  +bpy' if r['bpy'] else ''}")
+        return 0 if all('error' not in r for r in results) else 1
+
+    if args.command == "run":
+        options = {'mesh_mode': args.mesh_mode, 'merge': args.merge, 'instancing': args.instancing,
+                   'exporter': args.exporter}
+        run = run_benchmark(args.sizes, args.output_dir, args.blender, args.timeout, options)
+        index = append_history(run, args.history)
+        print(f"Recorded run #{index} in {args.history}")
+        return 0 if all(case['ok'] for case in run['cases']) else 1
+
+    history = load_history(args.history)
+    if len(history) < 2:
+        parser.error(f"need at least two runs in {args.history}")
+    base, head = history[args.base], history[args.head]
+    regressions = compare_runs(base, head, args.threshold)
+
+    print(f"base: {base['timestamp']} ({base['revision']}), head: {head['timestamp']} ({head['revision']})")
+    for r in regressions:
+        change = f" (+{r['change']:.1%})" if r['change'] is not None else ""
+        print(f"  REGRESSION n={r['size']} {r['metric']}: {r['base']} -> {r['head']}{change}")
+    if not regressions:
+        print("  no regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
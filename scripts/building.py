@@ -1,409 +1,232 @@
-"""건물 관련 함수들"""
+"""건물 관련 함수들
+
+파트 배치는 layout 모듈이 계산하고, 여기서는 Blender 오브젝트로 옮긴다.
+"""
 
-import bpy
-import math
 from .utils import create_material
+from .text_cache import part_geometry
+from .instrument import count
+from .mesh_data import (MESH_MODE_OPS, MESH_MODE_DATA, check_mesh_mode, add_box, add_empty, add_part,
+                        link_objects, merge_objects, new_batch_object)
+from .layout import (LOD_LEVELS, LOD_DISTANCES, floor_parts, building_parts, building_lod_parts,
+                     entrance_parts, roof_text_part, wall_text_part, building_materials,
+                     entrance_materials, text_material)
+
+# 파트 오브젝트에 layout 머티리얼 슬롯을 남기는 커스텀 속성 (merge_building이 슬롯별로 묶음)
+SLOT_PROPERTY = "slot"
 
 
-def create_floor(width, depth, height, floor_num, materials, entrance_width=0, entrance_height=2.5):
+def create_floor(width, depth, height, floor_num, materials, entrance_width=0, entrance_height=2.5,
+                 mesh_mode=MESH_MODE_OPS, window_size=None, window_mask=None):
     """단일 층 생성
 
     Args:
         entrance_width: 1층 입구 너비 (0이면 입구 없음)
         entrance_height: 입구 높이
+        mesh_mode: 'ops' 또는 'data' ('data'면 씬에 링크되지 않은 오브젝트 반환)
+        window_size, window_mask: 창문 크기 / 패턴 (layout.floor_parts 참고)
     """
-    slab_thickness = 0.2
-    wall_thickness = 0.15
-
     floor_objects = []
-    floor_base_z = (floor_num - 1) * height
-
-    # 바닥 슬래브
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(0, 0, floor_base_z + slab_thickness/2)
-    )
-    floor_slab = bpy.context.active_object
-    floor_slab.name = f"Floor_{floor_num}_Slab"
-    floor_slab.scale = (width, depth, slab_thickness)
-    floor_slab.data.materials.append(materials['concrete'])
-    floor_objects.append(floor_slab)
-
-    # 벽 생성
-    wall_height = height - slab_thickness
-
-    # 뒷벽
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(
-        0, depth/2 - wall_thickness/2, floor_base_z + slab_thickness + wall_height/2
-    ))
-    back_wall = bpy.context.active_object
-    back_wall.name = f"Floor_{floor_num}_Wall_Back"
-    back_wall.scale = (width, wall_thickness, wall_height)
-    back_wall.data.materials.append(materials['wall'])
-    floor_objects.append(back_wall)
-
-    # 앞벽 - 1층이고 입구가 있으면 좌/우로 분리
-    if floor_num == 1 and entrance_width > 0:
-        # 입구 좌측 벽
-        left_wall_width = (width - entrance_width) / 2
-        if left_wall_width > 0:
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(
-                -width/2 + left_wall_width/2,
-                -depth/2 + wall_thickness/2,
-                floor_base_z + slab_thickness + wall_height/2
-            ))
-            left_front = bpy.context.active_object
-            left_front.name = f"Floor_{floor_num}_Wall_Front_Left"
-            left_front.scale = (left_wall_width, wall_thickness, wall_height)
-            left_front.data.materials.append(materials['wall'])
-            floor_objects.append(left_front)
-
-        # 입구 우측 벽
-        right_wall_width = (width - entrance_width) / 2
-        if right_wall_width > 0:
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(
-                width/2 - right_wall_width/2,
-                -depth/2 + wall_thickness/2,
-                floor_base_z + slab_thickness + wall_height/2
-            ))
-            right_front = bpy.context.active_object
-            right_front.name = f"Floor_{floor_num}_Wall_Front_Right"
-            right_front.scale = (right_wall_width, wall_thickness, wall_height)
-            right_front.data.materials.append(materials['wall'])
-            floor_objects.append(right_front)
-
-        # 입구 위쪽 벽 (문 위 공간 채우기)
-        above_entrance_height = wall_height - entrance_height
-        if above_entrance_height > 0:
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(
-                0,
-                -depth/2 + wall_thickness/2,
-                floor_base_z + slab_thickness + entrance_height + above_entrance_height/2
-            ))
-            above_entrance = bpy.context.active_object
-            above_entrance.name = f"Floor_{floor_num}_Wall_Front_Above"
-            above_entrance.scale = (entrance_width, wall_thickness, above_entrance_height)
-            above_entrance.data.materials.append(materials['wall'])
-            floor_objects.append(above_entrance)
-    else:
-        # 일반 앞벽
-        bpy.ops.mesh.primitive_cube_add(size=1, location=(
-            0, -depth/2 + wall_thickness/2, floor_base_z + slab_thickness + wall_height/2
-        ))
-        front_wall = bpy.context.active_object
-        front_wall.name = f"Floor_{floor_num}_Wall_Front"
-        front_wall.scale = (width, wall_thickness, wall_height)
-        front_wall.data.materials.append(materials['wall'])
-        floor_objects.append(front_wall)
-
-    # 우측벽
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(
-        width/2 - wall_thickness/2, 0, floor_base_z + slab_thickness + wall_height/2
-    ))
-    right_wall = bpy.context.active_object
-    right_wall.name = f"Floor_{floor_num}_Wall_Right"
-    right_wall.scale = (wall_thickness, depth - wall_thickness*2, wall_height)
-    right_wall.data.materials.append(materials['wall'])
-    floor_objects.append(right_wall)
-
-    # 좌측벽
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(
-        -width/2 + wall_thickness/2, 0, floor_base_z + slab_thickness + wall_height/2
-    ))
-    left_wall = bpy.context.active_object
-    left_wall.name = f"Floor_{floor_num}_Wall_Left"
-    left_wall.scale = (wall_thickness, depth - wall_thickness*2, wall_height)
-    left_wall.data.materials.append(materials['wall'])
-    floor_objects.append(left_wall)
-
-    # 창문 생성
-    window_width = 1.2
-    window_height = 1.5
-    window_depth = wall_thickness + 0.02
-    num_windows = max(1, int(width / 3))
-
-    for i in range(num_windows):
-        window_x = -width/2 + width/(num_windows+1) * (i+1)
-        window_z = floor_base_z + slab_thickness + wall_height/2
-
-        # 앞면 창문 - 1층 입구가 있으면 입구 영역 피하기
-        if floor_num == 1 and entrance_width > 0:
-            # 입구 영역 (-entrance_width/2 ~ entrance_width/2) 피하기
-            if abs(window_x) > entrance_width/2 + window_width/2:
-                bpy.ops.mesh.primitive_cube_add(
-                    size=1,
-                    location=(window_x, -depth/2 + wall_thickness/2, window_z)
-                )
-                window = bpy.context.active_object
-                window.name = f"Floor_{floor_num}_Window_Front_{i}"
-                window.scale = (window_width, window_depth, window_height)
-                window.data.materials.append(materials['glass'])
-                floor_objects.append(window)
-        else:
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=(window_x, -depth/2 + wall_thickness/2, window_z)
-            )
-            window = bpy.context.active_object
-            window.name = f"Floor_{floor_num}_Window_Front_{i}"
-            window.scale = (window_width, window_depth, window_height)
-            window.data.materials.append(materials['glass'])
-            floor_objects.append(window)
-
-        # 뒷면 창문
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(window_x, depth/2 - wall_thickness/2, window_z)
-        )
-        window = bpy.context.active_object
-        window.name = f"Floor_{floor_num}_Window_Back_{i}"
-        window.scale = (window_width, window_depth, window_height)
-        window.data.materials.append(materials['glass'])
-        floor_objects.append(window)
-
+    for part in floor_parts(width, depth, height, floor_num,
+                            entrance_width=entrance_width, entrance_height=entrance_height,
+                            window_size=window_size, window_mask=window_mask):
+        obj = add_box(part.name, part.location, part.size, materials[part.material], mesh_mode)
+        obj[SLOT_PROPERTY] = part.material
+        floor_objects.append(obj)
     return floor_objects
 
 
 def create_building(name, width=8, depth=6, floor_height=3.5, num_floors=2,
-                   wall_color=(0.85, 0.82, 0.78, 1.0), entrance_width=0, entrance_height=2.5):
+                   wall_color=(0.85, 0.82, 0.78, 1.0), entrance_width=0, entrance_height=2.5,
+                   mesh_mode=MESH_MODE_OPS, window_size=None, window_mask=None):
     """건물 생성
 
     Args:
         entrance_width: 1층 입구 너비 (0이면 입구 없음)
         entrance_height: 입구 높이
+        mesh_mode: 'ops'면 bpy.ops 프리미티브, 'data'면 메시 데이터를 직접 만들고 한 번에 링크
+        window_size, window_mask: 창문 크기 / 층별 패턴 (variation.BuildingVariant, None이면 기본)
     """
-    materials = {
-        'concrete': create_material(f"{name}_Concrete", (0.5, 0.5, 0.5, 1.0), roughness=0.9),
-        'wall': create_material(f"{name}_Wall", wall_color, roughness=0.7),
-        'glass': create_material(f"{name}_Glass", (0.6, 0.8, 0.9, 0.5), metallic=0.9, roughness=0.1),
-        'roof': create_material(f"{name}_Roof", (0.3, 0.3, 0.35, 1.0), roughness=0.8),
-    }
+    check_mesh_mode(mesh_mode)
 
-    building_objects = []
+    materials = {slot: create_material(*spec) for slot, spec in building_materials(name, wall_color).items()}
 
-    for floor_num in range(1, num_floors + 1):
-        floor_objects = create_floor(width, depth, floor_height, floor_num, materials,
-                                     entrance_width=entrance_width if floor_num == 1 else 0,
-                                     entrance_height=entrance_height if floor_num == 1 else 0)
-        building_objects.extend(floor_objects)
-
-    # 지붕 생성
-    roof_z = num_floors * floor_height + 0.15
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, roof_z))
-    roof = bpy.context.active_object
-    roof.name = f"{name}_Roof"
-    roof.scale = (width + 0.3, depth + 0.3, 0.3)
-    roof.data.materials.append(materials['roof'])
-    building_objects.append(roof)
+    building_objects = []
+    for part in building_parts(name, width, depth, floor_height, num_floors,
+                               entrance_width=entrance_width, entrance_height=entrance_height,
+                               window_size=window_size, window_mask=window_mask):
+        obj = add_box(part.name, part.location, part.size, materials[part.material], mesh_mode)
+        obj[SLOT_PROPERTY] = part.material
+        building_objects.append(obj)
 
     # 부모 오브젝트
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-    parent = bpy.context.active_object
-    parent.name = name
+    parent = add_empty(name, mesh_mode=mesh_mode)
 
     for obj in building_objects:
         obj.parent = parent
 
+    if mesh_mode == MESH_MODE_DATA:
+        link_objects(building_objects + [parent])
+
     return parent
 
 
-def create_text_on_roof_edge(text, building, width, depth, num_floors, floor_height,
-                             text_color=(0.1, 0.1, 0.1, 1.0), text_size=1.0):
-    """건물 지붕 가장자리에 텍스트 추가"""
-    bpy.ops.object.text_add()
-    text_obj = bpy.context.active_object
-    text_obj.data.body = text
-    text_obj.data.size = text_size
-    text_obj.data.extrude = 0.08
-    text_obj.data.align_x = 'CENTER'
-    text_obj.data.align_y = 'BOTTOM'
+def _create_text(part, building, text_color):
+    """layout 텍스트 파트로 텍스트 메시 오브젝트 생성
+
+    글꼴 테셀레이션은 text_cache가 문자열/글자 단위로 캐시하므로 같은 간판은
+    메시 데이터만 새로 만든다.
+    """
+    import bpy
+    vertices, polygons = part_geometry(part)
+    mesh = bpy.data.meshes.new(part.name)
+    mesh.from_pydata(vertices, [], polygons)
+    mesh.update()
+
+    mat = create_material(*text_material(part.name, text_color))
+    mesh.materials.append(mat)
+
+    text_obj = bpy.data.objects.new(part.name, mesh)
+    text_obj[SLOT_PROPERTY] = part.material
+    count('objects')
+    count('vertices', len(vertices))
+    link_objects([text_obj])
+    text_obj.location = part.location
+    text_obj.rotation_euler = part.rotation
+    text_obj.parent = building
 
-    bpy.ops.object.convert(target='MESH')
+    return text_obj
 
-    mat = create_material(f"{building.name}_RoofText_{text}", text_color, roughness=0.3)
-    text_obj.data.materials.append(mat)
 
-    roof_z = num_floors * floor_height + 0.3
-    text_obj.location = (0, -depth/2 - 0.15, roof_z)
-    text_obj.rotation_euler = (math.pi/2, 0, 0)
+def text_mesh_faces(part):
+    """텍스트 파트를 볼록 다각형 면 목록으로 변환 (씬에 오브젝트를 남기지 않음)
 
-    text_obj.name = f"{building.name}_RoofText_{text}"
-    text_obj.parent = building
+    gltf_writer의 text_mesher로 쓰인다. 좌표는 텍스트 오브젝트 로컬 기준.
+    """
+    vertices, polygons = part_geometry(part)
+    return [[vertices[i] for i in polygon] for polygon in polygons]
 
-    return text_obj
+
+def create_text_on_roof_edge(text, building, width, depth, num_floors, floor_height,
+                             text_color=(0.1, 0.1, 0.1, 1.0), text_size=1.0):
+    """건물 지붕 가장자리에 텍스트 추가"""
+    part = roof_text_part(text, building.name, depth, num_floors, floor_height, text_size=text_size)
+    return _create_text(part, building, text_color)
 
 
 def create_text_on_wall(text, building, floor_num=1, wall_side="front",
                         text_color=(0.1, 0.1, 0.1, 1.0)):
     """건물 벽면에 텍스트 추가"""
-    bpy.ops.object.text_add()
-    text_obj = bpy.context.active_object
-    text_obj.data.body = text
-    text_obj.data.size = 0.8
-    text_obj.data.extrude = 0.05
-    text_obj.data.align_x = 'CENTER'
-    text_obj.data.align_y = 'CENTER'
-
-    bpy.ops.object.convert(target='MESH')
-
-    mat = create_material(f"{building.name}_Text_{text}", text_color, roughness=0.3)
-    text_obj.data.materials.append(mat)
-
-    floor_height = 3.5
-    depth = 6
-    text_z = (floor_num - 1) * floor_height + floor_height * 0.6
-
-    if wall_side == "front":
-        text_obj.location = (0, -depth/2 - 0.01, text_z)
-        text_obj.rotation_euler = (math.pi/2, 0, 0)
-    elif wall_side == "back":
-        text_obj.location = (0, depth/2 + 0.01, text_z)
-        text_obj.rotation_euler = (math.pi/2, 0, math.pi)
-    elif wall_side == "left":
-        text_obj.location = (-depth/2 - 0.01, 0, text_z)
-        text_obj.rotation_euler = (math.pi/2, 0, -math.pi/2)
-    elif wall_side == "right":
-        text_obj.location = (depth/2 + 0.01, 0, text_z)
-        text_obj.rotation_euler = (math.pi/2, 0, math.pi/2)
-
-    text_obj.name = f"{building.name}_Text_{text}"
-    text_obj.parent = building
-
-    return text_obj
+    part = wall_text_part(text, building.name, floor_num=floor_num, wall_side=wall_side)
+    return _create_text(part, building, text_color)
 
 
 def create_entrance(building, width=2, height=2.5, depth=6):
     """건물 입구 생성 - 유리 도어문"""
-    frame_mat = create_material(f"{building.name}_EntranceFrame",
-                                (0.15, 0.15, 0.18, 1.0), metallic=0.9, roughness=0.2)
-    glass_mat = create_material(f"{building.name}_DoorGlass",
-                               (0.7, 0.85, 0.9, 1.0), metallic=0.1, roughness=0.05, alpha=0.3)
-    handle_mat = create_material(f"{building.name}_DoorHandle",
-                                (0.8, 0.8, 0.8, 1.0), metallic=1.0, roughness=0.1)
+    materials = {slot: create_material(*spec) for slot, spec in entrance_materials(building.name).items()}
 
     entrance_objects = []
-    frame_thickness = 0.05
-    frame_depth = 0.08
-
-    # 외부 프레임 - 상단
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, -depth/2 + frame_depth/2, height))
-    top_frame = bpy.context.active_object
-    top_frame.name = f"{building.name}_Entrance_TopFrame"
-    top_frame.scale = (width + frame_thickness*2, frame_depth, frame_thickness*2)
-    top_frame.data.materials.append(frame_mat)
-    top_frame.parent = building
-    entrance_objects.append(top_frame)
-
-    # 외부 프레임 - 좌측
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(-width/2 - frame_thickness/2, -depth/2 + frame_depth/2, height/2)
-    )
-    left_frame = bpy.context.active_object
-    left_frame.name = f"{building.name}_Entrance_LeftFrame"
-    left_frame.scale = (frame_thickness, frame_depth, height)
-    left_frame.data.materials.append(frame_mat)
-    left_frame.parent = building
-    entrance_objects.append(left_frame)
-
-    # 외부 프레임 - 우측
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(width/2 + frame_thickness/2, -depth/2 + frame_depth/2, height/2)
-    )
-    right_frame = bpy.context.active_object
-    right_frame.name = f"{building.name}_Entrance_RightFrame"
-    right_frame.scale = (frame_thickness, frame_depth, height)
-    right_frame.data.materials.append(frame_mat)
-    right_frame.parent = building
-    entrance_objects.append(right_frame)
-
-    # 유리 도어 (양쪽 여닫이)
-    door_width = (width - 0.06) / 2
-    door_height = height - 0.1
-
-    for i, x_offset in enumerate([-door_width/2 - 0.015, door_width/2 + 0.015]):
-        # 문 프레임
-        door_frame_positions = [
-            # 상단 프레임
-            ((x_offset, -depth/2 + frame_depth/2, door_height), (door_width, 0.04, 0.06)),
-            # 하단 프레임
-            ((x_offset, -depth/2 + frame_depth/2, 0.03), (door_width, 0.04, 0.06)),
-            # 좌측 프레임
-            ((x_offset - door_width/2 + 0.02, -depth/2 + frame_depth/2, door_height/2), (0.04, 0.04, door_height)),
-            # 우측 프레임
-            ((x_offset + door_width/2 - 0.02, -depth/2 + frame_depth/2, door_height/2), (0.04, 0.04, door_height)),
-        ]
-
-        for j, (pos, scale) in enumerate(door_frame_positions):
-            bpy.ops.mesh.primitive_cube_add(size=1, location=pos)
-            frame = bpy.context.active_object
-            frame.name = f"{building.name}_DoorFrame_{i}_{j}"
-            frame.scale = scale
-            frame.data.materials.append(frame_mat)
-            frame.parent = building
-            entrance_objects.append(frame)
-
-        # 유리 패널
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(x_offset, -depth/2 + frame_depth/2, door_height/2)
-        )
-        glass = bpy.context.active_object
-        glass.name = f"{building.name}_DoorGlass_{i}"
-        glass.scale = (door_width - 0.08, 0.02, door_height - 0.12)
-        glass.data.materials.append(glass_mat)
-        glass.parent = building
-        entrance_objects.append(glass)
-
-        # 문 손잡이
-        handle_x = x_offset + (door_width/2 - 0.15) * (-1 if i == 0 else 1)
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.02,
-            depth=0.15,
-            location=(handle_x, -depth/2 - 0.02, height * 0.45)
-        )
-        handle = bpy.context.active_object
-        handle.name = f"{building.name}_DoorHandle_{i}"
-        handle.rotation_euler = (math.pi/2, 0, 0)
-        handle.data.materials.append(handle_mat)
-        handle.parent = building
-        entrance_objects.append(handle)
-
-    # 중앙 세로 프레임
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(0, -depth/2 + frame_depth/2, door_height/2)
-    )
-    center_frame = bpy.context.active_object
-    center_frame.name = f"{building.name}_Entrance_CenterFrame"
-    center_frame.scale = (0.04, frame_depth, door_height)
-    center_frame.data.materials.append(frame_mat)
-    center_frame.parent = building
-    entrance_objects.append(center_frame)
-
-    # 캐노피 (유리 지붕)
-    canopy_mat = create_material(f"{building.name}_Canopy",
-                                (0.2, 0.2, 0.22, 1.0), metallic=0.9, roughness=0.2)
-    canopy_glass_mat = create_material(f"{building.name}_CanopyGlass",
-                                      (0.8, 0.9, 0.95, 0.2), metallic=0.1, roughness=0.05)
-
-    # 캐노피 프레임
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, -depth/2 - 0.6, height + 0.15))
-    canopy_frame = bpy.context.active_object
-    canopy_frame.name = f"{building.name}_CanopyFrame"
-    canopy_frame.scale = (width + 0.8, 1.0, 0.05)
-    canopy_frame.data.materials.append(canopy_mat)
-    canopy_frame.parent = building
-    entrance_objects.append(canopy_frame)
-
-    # 캐노피 유리
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, -depth/2 - 0.6, height + 0.12))
-    canopy_glass = bpy.context.active_object
-    canopy_glass.name = f"{building.name}_CanopyGlass"
-    canopy_glass.scale = (width + 0.6, 0.8, 0.02)
-    canopy_glass.data.materials.append(canopy_glass_mat)
-    canopy_glass.parent = building
-    entrance_objects.append(canopy_glass)
+    for part in entrance_parts(building.name, width=width, height=height, depth=depth):
+        obj = add_part(part, materials[part.material])
+        obj[SLOT_PROPERTY] = part.material
+        obj.parent = building
+        entrance_objects.append(obj)
 
     return entrance_objects
+
+
+def merge_building(building):
+    """건물 자식 파트들을 머티리얼별 메시 하나로 합침
+
+    create_building / 텍스트 / create_entrance 이후에 호출.
+    파트는 생성 때 남긴 layout 슬롯 (SLOT_PROPERTY) 별로 묶으므로, material_cache()가
+    다른 건물의 머티리얼을 돌려줘도 합쳐진 오브젝트 이름은 직접 쓰기 / create_culled_building과
+    같은 "{건물}_{슬롯}" 이다. 원래 파트 이름은 각 오브젝트의 "parts" 속성에 남는다.
+
+    Returns:
+        합쳐진 오브젝트 리스트
+    """
+    groups = {}
+    for child in building.children:
+        if child.type != 'MESH' or not child.data.materials or SLOT_PROPERTY not in child:
+            continue
+        groups.setdefault(child[SLOT_PROPERTY], []).append(child)
+
+    merged_objects = []
+    for slot, objects in groups.items():
+        material = objects[0].data.materials[0]
+        merged_objects.append(merge_objects(f"{building.name}_{slot}", objects, material, parent=building))
+
+    return merged_objects
+
+
+def create_culled_building(entity):
+    """가려진 면을 지운 건물 엔티티 (layout.building_entity(cull=True)) 를 오브젝트로 생성
+
+    create_building + 텍스트 + create_entrance + merge_building 대신 쓴다. 머티리얼마다
+    구운 메시 오브젝트 "{건물}_{슬롯}" 하나와, 굽지 않고 남은 파트 (텍스트, 가려진 면이
+    없는 상자, 원기둥 등) 를 건물 원점의 부모 아래에 둔다.
+    """
+    name = entity['name']
+    materials = entity['materials']
+    parent = add_empty(name, mesh_mode=MESH_MODE_DATA)
+    link_objects([parent])
+
+    slots = set(entity['meshes']) | {part.material for part in entity['parts'] if part.kind != 'text'}
+    blender_materials = {slot: create_material(*materials[slot]) for slot in slots}
+
+    for slot, batch in entity['meshes'].items():
+        new_batch_object(f"{name}_{slot}", batch, blender_materials[slot], parent=parent)
+    for part in entity['parts']:
+        if part.kind == 'text':
+            _create_text(part, parent, materials['text'].color)
+            continue
+        obj = add_part(part, blender_materials[part.material])
+        obj[SLOT_PROPERTY] = part.material
+        obj.parent = parent
+
+    return parent
+
+
+def create_building_lods(building, width=8, depth=6, floor_height=3.5, num_floors=2,
+                         wall_color=(0.85, 0.82, 0.78, 1.0), entrance_width=0):
+    """건물에 간략화 단계 (LOD1, LOD2) 추가
+
+    텍스트 / create_entrance / merge_building 이후에 호출. 기존 자식은
+    "{건물}_LOD0" 아래로 옮기고, 단계마다 "{건물}_LOD{n}" 아래에 머티리얼별로
+    합친 메시를 만든다. 각 단계 오브젝트의 "lod" 속성과 건물의 "lod_distances"
+    속성은 export_to_gltf(extras=True)로 내보내져 웹 뷰어가 거리별로 고른다.
+
+    Returns:
+        [LOD0, LOD1, LOD2] 부모 오브젝트 리스트
+    """
+    materials = {slot: create_material(*spec)
+                 for slot, spec in building_materials(building.name, wall_color).items()}
+
+    detail = add_empty(f"{building.name}_LOD0", mesh_mode=MESH_MODE_DATA)
+    link_objects([detail])
+    detail.parent = building
+    for child in list(building.children):
+        if child is not detail:
+            child.parent = detail
+    detail["lod"] = 0
+    levels = [detail]
+
+    for level in LOD_LEVELS[1:]:
+        name = f"{building.name}_LOD{level}"
+        root = add_empty(name, mesh_mode=MESH_MODE_DATA)
+        link_objects([root])
+        root.parent = building
+        root["lod"] = level
+
+        groups = {}
+        for part in building_lod_parts(building.name, width, depth, floor_height, num_floors, level,
+                                       entrance_width=entrance_width):
+            obj = add_box(part.name, part.location, part.size, materials[part.material], MESH_MODE_DATA)
+            groups.setdefault(part.material, []).append(obj)
+        for slot, objects in groups.items():
+            merge_objects(f"{name}_{slot}", objects, materials[slot], parent=root)
+        levels.append(root)
+
+    building["lod_distances"] = list(LOD_DISTANCES)
+    return levels
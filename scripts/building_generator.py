@@ -1,15 +1,36 @@
 """
 Blender Building Generator
 1-3층 규모의 빌딩을 GLTF 형식으로 생성하는 스크립트
+
+Blender에서 실행할 때 스크립트 인자는 "--" 뒤에 넘긴다:
+    blender --background --python-expr "from scripts.building_generator import main; main()" -- --profile summary
 """
 
+import argparse
 import os
+import sys
 from .utils import OUTPUT_DIR
 from .scenes import create_combined_scene
+from . import instrument
+
+
+def parse_args(argv=None):
+    """명령줄 인자 파싱 (Blender 인자는 "--" 앞까지 무시)"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="건물 씬 생성")
+    parser.add_argument("--profile", default=instrument.MODE_OFF, choices=instrument.MODES,
+                        help="계측: off, summary (표 출력), trace (Chrome trace JSON 저장)")
+    parser.add_argument("--trace-file", default=os.path.join(OUTPUT_DIR, "trace.json"),
+                        help="--profile trace 결과 경로")
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
     """메인 함수 - 통합 씬 생성"""
+    args = parse_args(argv)
+    instrument.configure(args.profile)
+
     print("="*50)
     print("Building Generator Started")
     print("="*50)
@@ -24,6 +45,12 @@ def main():
     print(f"Output directory: {OUTPUT_DIR}")
     print("="*50)
 
+    if args.profile != instrument.MODE_OFF:
+        print("\n" + instrument.format_summary())
+    if args.profile == instrument.MODE_TRACE:
+        instrument.write_trace(args.trace_file)
+        print(f"Trace written to: {args.trace_file}")
+
 
 if __name__ == "__main__":
     main()
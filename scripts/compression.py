@@ -0,0 +1,219 @@
+"""내보낸 glTF의 양자화 / 압축 후처리와 크기 / 디코드 시간 보고서
+
+압축 방식 (설정 scene.export.compression):
+    none     - 압축 없음 (quantize면 KHR_mesh_quantization만)
+    draco    - KHR_draco_mesh_compression (Blender 익스포터 옵션, 자체 양자화 포함)
+    meshopt  - EXT_meshopt_compression (gltfpack이 PATH에 있을 때)
+
+직접 쓰기 (gltf_writer) 는 KHR_mesh_quantization을 직접 쓰고, Blender 익스포터에는
+양자화 옵션이 없으므로 gltfpack으로 후처리한다.
+
+사용 예:
+    python -m scripts.compression report output/a.glb output/a_quantized.glb output/a_draco.glb
+"""
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+from .gltf_writer import GLB_MAGIC, GLB_CHUNK_BIN
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_DRACO = 'draco'
+COMPRESSION_MESHOPT = 'meshopt'
+
+# 파이썬에서 풀 수 없는 (전용 디코더가 필요한) 압축 확장
+COMPRESSED_EXTENSIONS = ('KHR_draco_mesh_compression', 'EXT_meshopt_compression')
+
+# componentType -> (struct 형식, 정규화 나눗수)
+_COMPONENTS = {
+    5120: ('b', 127.0),
+    5121: ('B', 255.0),
+    5122: ('h', 32767.0),
+    5123: ('H', 65535.0),
+    5125: ('I', None),
+    5126: ('f', None),
+}
+_TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}
+
+
+def gltfpack_path():
+    """PATH의 gltfpack 실행 파일 (없으면 None)"""
+    return shutil.which('gltfpack')
+
+
+def run_gltfpack(filepath, quantize=True, meshopt=False, timeout=600):
+    """gltfpack으로 filepath를 제자리에서 다시 씀 (노드 이름, 머티리얼, extras 유지)
+
+    .gltf면 같은 이름의 .bin도 함께 바뀐다.
+    """
+    gltfpack = gltfpack_path()
+    if gltfpack is None:
+        raise FileNotFoundError("gltfpack not found on PATH")
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    name = os.path.basename(filepath)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        command = [gltfpack, '-i', filepath, '-o', os.path.join(tmp, name), '-kn', '-km', '-ke']
+        if not quantize:
+            command.append('-noq')
+        if meshopt:
+            command.append('-cc')
+        subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+        for produced in os.listdir(tmp):
+            os.replace(os.path.join(tmp, produced), os.path.join(directory, produced))
+    return filepath
+
+
+def finish_export(filepath, export, quantized=False):
+    """scene.export 옵션 중 익스포터가 직접 못 한 부분을 gltfpack으로 마무리
+
+    Args:
+        export: schema.ExportOptions
+        quantized: 익스포터가 이미 KHR_mesh_quantization으로 썼는지 (gltf_writer)
+
+    Returns:
+        gltfpack을 실행했으면 True
+    """
+    meshopt = export.compression == COMPRESSION_MESHOPT
+    needs_quantize = export.quantize and not quantized and export.compression != COMPRESSION_DRACO
+    if not (meshopt or needs_quantize):
+        return False
+    if gltfpack_path() is None:
+        print(f"gltfpack not found, {filepath} left without "
+              f"{'meshopt compression' if meshopt else 'quantization'}")
+        return False
+    run_gltfpack(filepath, quantize=export.quantize, meshopt=meshopt)
+    return True
+
+
+def _read(filepath):
+    """(glTF JSON, [버퍼 bytes, ...], 파일 크기 합계)"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    total = len(data)
+
+    if data[:4] == struct.pack('<I', GLB_MAGIC):
+        json_length, _ = struct.unpack_from('<II', data, 12)
+        doc = json.loads(data[20:20 + json_length])
+        offset = 20 + json_length
+        glb_bin = None
+        if offset < len(data):
+            bin_length, chunk_type = struct.unpack_from('<II', data, offset)
+            if chunk_type == GLB_CHUNK_BIN:
+                glb_bin = data[offset + 8:offset + 8 + bin_length]
+    else:
+        doc = json.loads(data)
+        glb_bin = None
+
+    directory = os.path.dirname(os.path.abspath(filepath))
+    buffers = []
+    for buffer in doc.get('buffers', []):
+        uri = buffer.get('uri')
+        if uri is None:
+            buffers.append(glb_bin or b'')
+            continue
+        with open(os.path.join(directory, uri), 'rb') as f:
+            buffers.append(f.read())
+        total += len(buffers[-1])
+    for image in doc.get('images', []):
+        if 'uri' in image and not image['uri'].startswith('data:'):
+            total += os.path.getsize(os.path.join(directory, image['uri']))
+    return doc, buffers, total
+
+
+def scene_size(filepath):
+    """.glb 또는 .gltf + 외부 버퍼/이미지의 전체 바이트 수"""
+    return _read(filepath)[2]
+
+
+def compressed_extensions(doc):
+    used = doc.get('extensionsUsed', [])
+    return [ext for ext in COMPRESSED_EXTENSIONS if ext in used]
+
+
+def decode_accessors(doc, buffers):
+    """모든 접근자를 float 튜플 리스트로 풀어 전체 성분 수 반환 (정규화 / 양자화 해제 포함)"""
+    views = doc.get('bufferViews', [])
+    total = 0
+    for accessor in doc.get('accessors', []):
+        if 'bufferView' not in accessor:
+            continue
+        view = views[accessor['bufferView']]
+        fmt, divisor = _COMPONENTS[accessor['componentType']]
+        components = _TYPE_SIZES[accessor['type']]
+        element = struct.calcsize(fmt) * components
+        stride = view.get('byteStride', element)
+        data = buffers[view.get('buffer', 0)]
+        start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+        unpack = struct.Struct(f'<{components}{fmt}').unpack_from
+
+        values = [unpack(data, start + i * stride) for i in range(accessor['count'])]
+        if accessor.get('normalized') and divisor:
+            values = [tuple(max(c / divisor, -1.0) for c in value) for value in values]
+        total += len(values) * components
+    return total
+
+
+def measure_decode(filepath, repeat=3):
+    """파일 읽기 + JSON 파싱 + 접근자 디코드 시간 (repeat번 중 최소, 초)
+
+    draco / meshopt 압축 파일은 파이썬으로 풀 수 없으므로 None.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        doc, buffers, _ = _read(filepath)
+        if compressed_extensions(doc):
+            return None
+        decode_accessors(doc, buffers)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def compression_report(paths, repeat=3):
+    """파일별 크기 / 첫 파일 대비 비율 / 디코드 시간 / 사용 확장
+
+    Returns:
+        [{'file', 'bytes', 'ratio', 'decode_seconds', 'extensions'}, ...]
+    """
+    rows = []
+    for path in paths:
+        doc, _, size = _read(path)
+        rows.append({
+            'file': path,
+            'bytes': size,
+            'ratio': round(size / rows[0]['bytes'], 4) if rows and rows[0]['bytes'] else 1.0,
+            'decode_seconds': measure_decode(path, repeat),
+            'extensions': doc.get('extensionsUsed', []),
+        })
+    return rows
+
+
+def format_report(rows):
+    lines = [f"{'file':<48}{'bytes':>12}{'ratio':>8}{'decode s':>10}  extensions"]
+    for row in rows:
+        decode = 'n/a' if row['decode_seconds'] is None else f"{row['decode_seconds']:.4f}"
+        lines.append(f"{os.path.basename(row['file']):<48}{row['bytes']:>12}{row['ratio']:>8.3f}{decode:>10}  "
+                     f"{', '.join(row['extensions']) or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """python -m scripts.compression report A.glb B.glb ..."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] != 'report':
+        print("usage: python -m scripts.compression report A.glb [B.glb ...]")
+        return 2
+    print(format_report(compression_report(argv[1:])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
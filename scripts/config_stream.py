@@ -0,0 +1,179 @@
+"""대용량 씬 설정을 한 번에 읽지 않고 항목 단위로 흘려보내는 로더
+
+설정은 (섹션, 값) 쌍의 흐름으로 다룬다.
+
+- "buildings", "trees", "roads" 배열은 원소 하나마다 (섹션, 원소)
+  (빈 배열은 섹션이 있었다는 표시로 (섹션, EMPTY_SECTION) 하나)
+- 그 밖의 최상위 키 ("scene", "road", "roadNetwork" 등) 는 (키, 값 전체)
+
+JSON 파일은 CHUNK_SIZE씩 읽으며 json.JSONDecoder.raw_decode로 원소를 하나씩
+해석하므로, 파서가 붙잡는 메모리는 파일 크기가 아닌 원소 크기에 비례한다.
+
+JSON Lines (.jsonl) 는 한 줄에 항목 하나이고 "entity" 키로 종류를 밝힌다:
+    {"entity": "scene", "name": "city"}
+    {"entity": "building", "name": "Office", "position": [0, 0], ...}
+    {"entity": "tree", "position": [5, 5], "height": 4}
+    {"entity": "road", "position": [0, -18, 0], "length": 40}
+    {"entity": "road_network", "nodes": {...}, "roads": [...]}
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+# 원소 단위로 흘려보내는 배열 섹션
+STREAM_SECTIONS = ("buildings", "trees", "roads")
+
+# JSON Lines의 "entity" 값 -> 섹션
+ENTITY_SECTIONS = {"scene": "scene", "building": "buildings", "tree": "trees", "road": "roads",
+                   "road_network": "roadNetwork"}
+
+# 빈 배열 섹션 표시 ("roads": [] 처럼 명시적으로 비운 섹션과 빠진 섹션을 구분)
+EMPTY_SECTION = object()
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+class _ChunkReader:
+    """파일을 조금씩 읽으며 JSON 값을 하나씩 해석"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+
+    def _fill(self):
+        """이미 읽은 부분을 버리고 다음 조각을 붙임 (파일 끝이면 False)"""
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return ValueError(f"{message} at offset {self.offset + self.pos}")
+
+    def peek(self):
+        """공백을 건너뛰고 다음 글자 반환 (파일 끝이면 "")"""
+        while True:
+            self.pos = _whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        """다음 글자가 chars 중 하나인지 확인하고 소비한 뒤 반환"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error(f"Expected one of {chars!r}, got {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """다음 JSON 값 하나"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise self.error(f"Invalid JSON ({e.msg})") from None
+            # 숫자는 버퍼 끝에서 잘렸을 수 있으므로 더 읽어 본다
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_sections(f):
+    """JSON 설정 파일 객체에서 (섹션, 값) 을 순서대로 내보냄"""
+    reader = _ChunkReader(f)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        yield from _json_entries(reader)
+
+    if reader.peek():
+        raise reader.error("Unexpected content after the config object")
+
+
+def _json_entries(reader):
+    """최상위 객체의 키/값들 (여는 '{' 다음부터 닫는 '}'까지)"""
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise reader.error("Expected an object key")
+        reader.expect(":")
+
+        if key in STREAM_SECTIONS and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+                yield key, EMPTY_SECTION
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            yield key, reader.value()
+
+        if reader.expect(",}") == "}":
+            break
+
+
+def iter_jsonl_sections(f):
+    """JSON Lines 설정 파일 객체에서 (섹션, 값) 을 순서대로 내보냄"""
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        entry = json.loads(line)
+        section = ENTITY_SECTIONS.get(entry.pop("entity", None))
+        if section is None:
+            raise ValueError(f"line {line_number}: 'entity' must be one of {tuple(ENTITY_SECTIONS)}")
+        yield section, entry
+
+
+def iter_config(path):
+    """설정 파일 (.json 또는 .jsonl) 의 (섹션, 값) 제너레이터"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            yield from iter_jsonl_sections(f)
+        else:
+            yield from iter_json_sections(f)
+
+
+def config_sections(config):
+    """이미 읽은 설정 dict를 같은 (섹션, 값) 흐름으로"""
+    for key, value in config.items():
+        if key in STREAM_SECTIONS and isinstance(value, list):
+            if not value:
+                yield key, EMPTY_SECTION
+            for entry in value:
+                yield key, entry
+        else:
+            yield key, value
+
+
+def collect_config(sections):
+    """(섹션, 값) 흐름을 설정 dict로 모음 (JSON Lines를 dict로 읽을 때 등)"""
+    config = {}
+    for section, value in sections:
+        if section in STREAM_SECTIONS:
+            entries = config.setdefault(section, [])
+            if value is not EMPTY_SECTION:
+                entries.append(value)
+        elif section == "scene" and isinstance(config.get("scene"), dict):
+            config["scene"].update(value)
+        else:
+            config[section] = value
+    return config
@@ -0,0 +1,272 @@
+"""건물 파트의 가려진 면 제거와 같은 평면 사각형 병합
+
+layout이 만드는 건물은 상자를 겹쳐 쌓은 것이라 밖에서 절대 보이지 않는 면이 많다.
+
+- 좌/우벽 끝면은 앞/뒷벽에, 벽 윗면/아랫면은 위아래 슬래브와 지붕에 맞닿음
+- 위층 슬래브 윗면/아랫면과 벽 안쪽 면은 가장자리가 벽에 덮임
+
+cull_parts는 회전 없는 상자 파트를 면 (축 정렬 사각형) 6개로 펼친 뒤, 면 바로
+바깥쪽을 불투명 상자가 덮는 만큼 잘라낸다.
+
+- 다 덮인 면은 버림
+- 남은 부분이 사각형 하나면 그 사각형으로 줄임 (삼각형 수는 같고 overdraw만 줄어듦)
+- 남은 부분이 여러 조각이면 원래 면을 그대로 둠 (삼각형이 오히려 늘어나므로)
+
+그 다음 같은 머티리얼 / 같은 평면에서 변 하나를 통째로 공유하는 사각형을 합친다.
+알파가 1 미만인 머티리얼 (유리) 은 뒤가 비쳐 보이므로 가리는 쪽으로 쓰지 않는다.
+면을 버리거나 줄이기만 하므로 밖에서 보이는 모양은 바뀌지 않는다.
+
+구운 메시는 건물마다 정점 배열을 따로 가지므로, 면이 하나도 버려지거나 줄지 않은
+상자와 원기둥 / 구 / 회전된 상자는 굽지 않고 파트로 남겨 공유 도형 (직접 쓰기의
+단위 상자 접근자 등) 을 그대로 쓰게 한다.
+"""
+
+from .primitives import faces_batch, primitive_faces, triangle_count
+from .spatial import GridIndex
+from .tessellation import BOX_TRIANGLES, segments
+
+# 좌표 비교 허용 오차 (m) - 맞닿음 / 같은 평면 판정
+EPSILON = 1e-6
+
+# 가리는 상자를 찾는 (x, z) 격자 칸 크기 (m)
+CELL_SIZE = 2.0
+
+# 축 번호 -> 면 사각형의 (u, v) 축 (u × v 가 축 방향이 되는 순서)
+_PLANE_AXES = ((1, 2), (2, 0), (0, 1))
+
+
+def box_bounds(part):
+    """회전 없는 상자 파트의 ((min x, y, z), (max x, y, z))"""
+    lo = tuple(c - s / 2 for c, s in zip(part.location, part.size))
+    hi = tuple(c + s / 2 for c, s in zip(part.location, part.size))
+    return lo, hi
+
+
+def box_rects(lo, hi):
+    """상자의 면 6개를 (축, 방향, 평면 좌표, u0, u1, v0, v1) 사각형으로"""
+    rects = []
+    for axis, (u, v) in enumerate(_PLANE_AXES):
+        for sign, plane in ((-1, lo[axis]), (1, hi[axis])):
+            rects.append((axis, sign, plane, lo[u], hi[u], lo[v], hi[v]))
+    return rects
+
+
+def rect_face(rect):
+    """사각형을 바깥 방향에서 반시계 순서인 3D 다각형으로"""
+    axis, sign, plane, u0, u1, v0, v1 = rect
+    u, v = _PLANE_AXES[axis]
+    face = []
+    for pu, pv in ((u0, v0), (u1, v0), (u1, v1), (u0, v1)):
+        point = [0.0, 0.0, 0.0]
+        point[axis] = plane
+        point[u] = pu
+        point[v] = pv
+        face.append(tuple(point))
+    return tuple(face if sign > 0 else face[::-1])
+
+
+def _breaks(values):
+    """정렬 후 EPSILON 이내로 붙은 값을 하나로"""
+    result = []
+    for value in sorted(values):
+        if not result or value - result[-1] > EPSILON:
+            result.append(value)
+    return result
+
+
+def visible_rects(rect, covers):
+    """rect 중 covers ((u0, u1, v0, v1) 리스트) 에 덮이지 않은 부분의 사각형 리스트
+
+    covers 경계로 rect를 격자로 나눠 칸 중심이 덮였는지 보고, 덮이지 않은 칸을
+    가로 줄 단위로 이은 뒤 폭이 같은 줄끼리 세로로 합친다.
+    """
+    axis, sign, plane, u0, u1, v0, v1 = rect
+    us = _breaks([u0, u1] + [c[0] for c in covers] + [c[1] for c in covers])
+    vs = _breaks([v0, v1] + [c[2] for c in covers] + [c[3] for c in covers])
+
+    rows = []
+    for j in range(len(vs) - 1):
+        cv = (vs[j] + vs[j + 1]) / 2
+        row_covers = [c for c in covers if c[2] < cv < c[3]]
+        runs = []
+        for i in range(len(us) - 1):
+            cu = (us[i] + us[i + 1]) / 2
+            if any(c[0] < cu < c[1] for c in row_covers):
+                continue
+            if runs and runs[-1][1] == us[i]:
+                runs[-1][1] = us[i + 1]
+            else:
+                runs.append([us[i], us[i + 1]])
+        rows.append((vs[j], vs[j + 1], runs))
+
+    rects = []
+    open_runs = {}
+    for row_v0, row_v1, runs in rows:
+        current = {}
+        for ru0, ru1 in runs:
+            previous = open_runs.pop((ru0, ru1), None)
+            current[(ru0, ru1)] = (previous if previous is not None else row_v0, row_v1)
+        for (ru0, ru1), (rv0, rv1) in open_runs.items():
+            rects.append((axis, sign, plane, ru0, ru1, rv0, rv1))
+        open_runs = current
+    for (ru0, ru1), (rv0, rv1) in open_runs.items():
+        rects.append((axis, sign, plane, ru0, ru1, rv0, rv1))
+    return rects
+
+
+def merge_rects(rects):
+    """같은 평면에서 변 하나를 통째로 공유하는 사각형들을 합친 리스트
+
+    rects는 모두 같은 (축, 방향, 평면) 이어야 한다.
+    """
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            a = rects[i]
+            for j in range(i + 1, len(rects)):
+                b = rects[j]
+                same_u = abs(a[3] - b[3]) <= EPSILON and abs(a[4] - b[4]) <= EPSILON
+                same_v = abs(a[5] - b[5]) <= EPSILON and abs(a[6] - b[6]) <= EPSILON
+                if same_u and (abs(a[6] - b[5]) <= EPSILON or abs(b[6] - a[5]) <= EPSILON):
+                    rects[i] = a[:5] + (min(a[5], b[5]), max(a[6], b[6]))
+                elif same_v and (abs(a[4] - b[3]) <= EPSILON or abs(b[4] - a[3]) <= EPSILON):
+                    rects[i] = a[:3] + (min(a[3], b[3]), max(a[4], b[4])) + a[5:]
+                else:
+                    continue
+                del rects[j]
+                merged = True
+                break
+            if merged:
+                break
+    return rects
+
+
+class _Occluders:
+    """불투명 상자들의 (x, z) 격자 인덱스"""
+
+    __slots__ = ('bounds', 'index')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.index = GridIndex(CELL_SIZE)
+        for key, (lo, hi) in enumerate(bounds):
+            self.index.insert(key, (lo[0], lo[2], hi[0], hi[2]))
+
+    def covers(self, rect):
+        """rect 바로 바깥쪽을 채운 상자들이 rect 위에 덮는 (u0, u1, v0, v1) 리스트"""
+        axis, sign, plane, u0, u1, v0, v1 = rect
+        u, v = _PLANE_AXES[axis]
+        lo = [0.0, 0.0, 0.0]
+        hi = [0.0, 0.0, 0.0]
+        lo[axis] = hi[axis] = plane
+        lo[u], hi[u], lo[v], hi[v] = u0, u1, v0, v1
+
+        covers = []
+        for key in self.index.query((lo[0], lo[2], hi[0], hi[2]), EPSILON):
+            box_lo, box_hi = self.bounds[key]
+            # 면에서 바깥쪽으로 아주 조금 나간 점들을 상자가 품어야 함 (맞닿은 상자 포함)
+            if sign > 0:
+                if not (box_lo[axis] <= plane + EPSILON < box_hi[axis]):
+                    continue
+            elif not (box_lo[axis] < plane - EPSILON <= box_hi[axis]):
+                continue
+            cu0, cu1 = max(u0, box_lo[u]), min(u1, box_hi[u])
+            cv0, cv1 = max(v0, box_lo[v]), min(v1, box_hi[v])
+            if cu1 - cu0 > EPSILON and cv1 - cv0 > EPSILON:
+                covers.append((cu0, cu1, cv0, cv1))
+        return covers
+
+
+def empty_stats():
+    return {'parts': 0, 'kept': 0, 'before': 0, 'after': 0, 'hidden': 0, 'shrunk': 0, 'merged': 0}
+
+
+def add_stats(total, stats):
+    """cull_parts 통계를 total에 더함"""
+    for key, value in stats.items():
+        total[key] += value
+    return total
+
+
+def collect_stats(entities, total):
+    """엔티티를 그대로 흘려보내며 건물의 'cull' 통계를 total에 더하는 제너레이터"""
+    for entity in entities:
+        if 'cull' in entity:
+            add_stats(total, entity['cull'])
+        yield entity
+
+
+def format_stats(stats):
+    removed = stats['before'] - stats['after']
+    percent = 100 * removed / stats['before'] if stats['before'] else 0.0
+    return (f"Culling: {stats['before']} -> {stats['after']} triangles (-{percent:.1f}%), "
+            f"{stats['hidden']} hidden / {stats['shrunk']} shrunk / {stats['merged']} merged faces, "
+            f"{stats['parts'] - stats['kept']} of {stats['parts']} parts baked")
+
+
+def cull_parts(parts, materials):
+    """가려진 면이 있는 파트만 머티리얼별 면 목록으로 굽기 (텍스트 파트는 호출 전에 빼야 함)
+
+    Args:
+        parts: layout.Parts (건물 원점 기준)
+        materials: {슬롯: MaterialSpec} - alpha 1 미만 슬롯은 가리는 쪽에서 뺌
+
+    Returns:
+        (남긴 파트 (layout.Part 리스트), {슬롯: primitives.MeshBatch}, 통계) - 통계는 {'parts', 'kept': 굽지 않고
+        남긴 파트 수, 'before': 원래 삼각형 수, 'after': 남은 삼각형 수, 'hidden': 버린 면 수,
+        'shrunk': 줄인 면 수, 'merged': 합쳐서 없앤 면 수}
+    """
+    stats = empty_stats()
+    kept = []
+    boxes = []
+    for part in parts:
+        stats['parts'] += 1
+        if part.kind == 'box' and not any(part.rotation):
+            boxes.append((part, box_bounds(part)))
+            stats['before'] += BOX_TRIANGLES
+            continue
+        triangles = triangle_count(primitive_faces(part.kind, segments(part.kind, part.size)))
+        stats['before'] += triangles
+        stats['after'] += triangles
+        stats['kept'] += 1
+        kept.append(part)
+
+    occluders = _Occluders([bounds for part, bounds in boxes if materials[part.material].alpha >= 1.0])
+
+    planes = {}
+    for part, (lo, hi) in boxes:
+        rects = []
+        hidden = shrunk = 0
+        for rect in box_rects(lo, hi):
+            covers = occluders.covers(rect)
+            if covers:
+                remaining = visible_rects(rect, covers)
+                if not remaining:
+                    hidden += 1
+                    continue
+                if len(remaining) == 1:
+                    shrunk += 1
+                    rect = remaining[0]
+            rects.append(rect)
+
+        if not hidden and not shrunk:
+            stats['kept'] += 1
+            stats['after'] += BOX_TRIANGLES
+            kept.append(part)
+            continue
+        stats['hidden'] += hidden
+        stats['shrunk'] += shrunk
+        for rect in rects:
+            key = (part.material, rect[0], rect[1], round(rect[2], 6))
+            planes.setdefault(key, []).append(rect)
+
+    baked = {}
+    for (slot, *_), rects in planes.items():
+        merged = merge_rects(rects)
+        stats['merged'] += len(rects) - len(merged)
+        stats['after'] += 2 * len(merged)
+        baked.setdefault(slot, []).extend(rect_face(rect) for rect in merged)
+
+    return kept, {slot: faces_batch(faces) for slot, faces in baked.items()}, stats
@@ -0,0 +1,390 @@
+"""bpy를 띄워 둔 채로 생성 작업을 받는 상주 프로세스 (로컬 HTTP 작업 API + 설정 감시)
+
+blender --background / run_generator.py는 실행할 때마다 Blender 시작과 모듈 import
+비용을 다시 치른다. 데몬은 한 번 띄운 프로세스에서 scenes 모듈 (bpy, 글꼴 / 텍스트
+캐시 포함) 을 계속 쓰므로, 작은 설정 수정은 실제 생성 시간만 든다.
+
+    blender --background --python-expr "from scripts.daemon import main; main()" -- serve --watch
+    python -m scripts.daemon serve --watch          # bpy 모듈이 설치된 python
+
+HTTP API (127.0.0.1만):
+    POST /jobs        {"config": "scene_config.json"} 또는 {"inline": {...설정...}}
+                      + create_scene_from_config 옵션 (JOB_OPTIONS) -> {"id", "status", ...}
+    GET  /jobs        작업 목록
+    GET  /jobs/<id>   작업 상태 / 결과 (create_scene_from_config 통계)
+    GET  /health      데몬 상태
+    POST /shutdown    데몬 종료
+
+--watch면 config/의 .json / .jsonl 파일이 바뀔 때마다 그 설정을 output/으로 다시
+생성한다 (WATCH_INTERVAL마다 수정 시각을 보고, DEBOUNCE 동안 더 바뀌지 않으면 작업 추가).
+
+bpy는 스레드 안전하지 않으므로 HTTP 서버는 작업을 큐에 넣기만 하고, 생성은 전부
+메인 스레드가 하나씩 한다.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_DIR = os.path.join(PROJECT_ROOT, "config")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 설정 감시 주기 / 저장이 끝났다고 볼 때까지 기다리는 시간 (초)
+WATCH_INTERVAL = 0.1
+DEBOUNCE = 0.15
+
+# 작업 요청 본문 최대 크기 (바이트)
+MAX_BODY = 64 << 20
+
+# 끝난 작업 기록을 남기는 개수
+MAX_FINISHED = 200
+
+CONFIG_EXTENSIONS = (".json", ".jsonl")
+
+# 작업 요청에서 create_scene_from_config로 넘길 수 있는 옵션
+JOB_OPTIONS = ('mesh_mode', 'merge', 'instancing', 'incremental', 'exporter', 'binary', 'lods')
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job:
+    """생성 작업 하나 (source: 설정 경로 또는 inline 설정 dict)"""
+
+    __slots__ = ('id', 'source', 'options', 'origin', 'status', 'result', 'error',
+                 'submitted', 'started', 'finished')
+
+    def __init__(self, job_id, source, options, origin):
+        self.id = job_id
+        self.source = source
+        self.options = options
+        self.origin = origin
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'config': self.source if isinstance(self.source, str) else None,
+            'inline': not isinstance(self.source, str),
+            'options': self.options,
+            'origin': self.origin,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'queued_seconds': round((self.started or time.time()) - self.submitted, 3),
+            'seconds': round(self.finished - self.started, 3) if self.finished else None,
+        }
+
+
+def parse_job(request):
+    """작업 요청 dict -> (source, options) (잘못되면 ValueError)"""
+    if not isinstance(request, dict):
+        raise ValueError("job must be a JSON object")
+    request = dict(request)
+    config = request.pop('config', None)
+    inline = request.pop('inline', None)
+    if (config is None) == (inline is None):
+        raise ValueError("job needs exactly one of 'config' (path) or 'inline' (config object)")
+    if config is not None and not isinstance(config, str):
+        raise ValueError("'config' must be a path string")
+    if inline is not None and not isinstance(inline, dict):
+        raise ValueError("'inline' must be a config object")
+    unknown = sorted(set(request) - set(JOB_OPTIONS))
+    if unknown:
+        raise ValueError(f"unknown job options {unknown} (expected some of {JOB_OPTIONS})")
+    return (config if config is not None else inline), request
+
+
+class ConfigWatcher:
+    """디렉토리의 설정 파일 수정 시각을 폴링해 저장이 끝난 파일 경로를 돌려줌"""
+
+    __slots__ = ('directory', 'seen', 'pending')
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.seen = self._scan()
+        self.pending = {}
+
+    def _scan(self):
+        stamps = {}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return stamps
+        for name in names:
+            if not name.endswith(CONFIG_EXTENSIONS):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def poll(self, now=None):
+        """마지막 변경 뒤 DEBOUNCE가 지난 (새로 생겼거나 바뀐) 파일 경로 리스트"""
+        now = time.monotonic() if now is None else now
+        stamps = self._scan()
+        for path, stamp in stamps.items():
+            if self.seen.get(path) != stamp:
+                self.pending[path] = now
+        self.seen = stamps
+
+        ready = sorted(path for path, changed in self.pending.items()
+                       if now - changed >= DEBOUNCE and path in stamps)
+        for path in list(self.pending):
+            if path in ready or path not in stamps:
+                del self.pending[path]
+        return ready
+
+
+class GeneratorDaemon:
+    """작업 큐 + 메인 스레드 생성 루프"""
+
+    def __init__(self, output_dir=OUTPUT_DIR, watch_dir=None, watch_options=None):
+        self.output_dir = output_dir
+        self.watcher = ConfigWatcher(watch_dir) if watch_dir else None
+        self.watch_options = watch_options or {}
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.stopping = threading.Event()
+        self.started = time.time()
+        self.completed = 0
+
+    def submit(self, source, options=None, origin='api'):
+        """작업을 큐에 넣고 Job 반환 (같은 설정의 감시 작업이 아직 대기 중이면 그 작업)"""
+        options = options or {}
+        with self.lock:
+            if origin == 'watch':
+                for job in self.jobs.values():
+                    if job.status == QUEUED and job.origin == 'watch' and job.source == source:
+                        return job
+            job = Job(str(next(self.ids)), source, options, origin)
+            self.jobs[job.id] = job
+            self._trim()
+        self.queue.put(job)
+        return job
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del self.jobs[job_id]
+
+    def job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def job_list(self):
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def health(self):
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'pid': os.getpid(), 'uptime_seconds': round(time.time() - self.started, 3),
+                'completed': self.completed, 'jobs': counts,
+                'watch': self.watcher.directory if self.watcher else None}
+
+    def run_job(self, job):
+        """메인 스레드에서 작업 하나 실행 (예외는 작업 오류로 남김)"""
+        from .scenes import create_scene_from_config
+
+        with self.lock:
+            job.status = RUNNING
+            job.started = time.time()
+        try:
+            if isinstance(job.source, str):
+                stats = create_scene_from_config(job.source, output_dir=self.output_dir, **job.options)
+            else:
+                stats = create_scene_from_config(config=job.source, output_dir=self.output_dir, **job.options)
+        except Exception as e:
+            error = {'type': type(e).__name__, 'message': str(e)}
+            if hasattr(e, 'errors'):
+                error['errors'] = [list(item) for item in e.errors]
+            else:
+                error['traceback'] = traceback.format_exc()[-4000:]
+            with self.lock:
+                job.status, job.error = FAILED, error
+        else:
+            # 응답으로 보낼 수 있게 JSON으로 한 번 왕복 (튜플 등)
+            with self.lock:
+                job.status, job.result = DONE, json.loads(json.dumps(stats, default=str))
+        with self.lock:
+            job.finished = time.time()
+            self.completed += 1
+        print(f"[{job.status}] job {job.id} ({job.origin}) "
+              f"{job.source if isinstance(job.source, str) else '<inline>'} in {job.finished - job.started:.3f}s")
+
+    def serve_forever(self):
+        """작업 / 감시 루프 (stop() 또는 KeyboardInterrupt까지)"""
+        while not self.stopping.is_set():
+            if self.watcher is not None:
+                for path in self.watcher.poll():
+                    print(f"Config changed: {path}")
+                    self.submit(path, self.watch_options, origin='watch')
+            try:
+                job = self.queue.get(timeout=WATCH_INTERVAL)
+            except queue.Empty:
+                continue
+            self.run_job(job)
+
+    def stop(self):
+        self.stopping.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """GeneratorDaemon 작업 API (server.daemon)"""
+
+    server_version = "BuildingGenerator"
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        daemon = self.server.daemon
+        if self.path == '/health':
+            return self._send(200, daemon.health())
+        if self.path == '/jobs':
+            return self._send(200, {'jobs': daemon.job_list()})
+        if self.path.startswith('/jobs/'):
+            job = daemon.job(self.path[len('/jobs/'):])
+            return self._send(200, job) if job else self._send(404, {'error': 'unknown job'})
+        return self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        daemon = self.server.daemon
+        if self.path == '/shutdown':
+            daemon.stop()
+            return self._send(200, {'status': 'stopping'})
+        if self.path != '/jobs':
+            return self._send(404, {'error': 'not found'})
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            return self._send(413, {'error': f"body larger than {MAX_BODY} bytes"})
+        try:
+            source, options = parse_job(json.loads(self.rfile.read(length) or b'null'))
+        except ValueError as e:
+            return self._send(400, {'error': str(e)})
+        return self._send(202, daemon.submit(source, options).to_dict())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(daemon, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """작업 API 서버를 백그라운드 스레드로 시작하고 서버 반환"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon = daemon
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="daemon-http", daemon=True).start()
+    return server
+
+
+def submit_job(request, host=DEFAULT_HOST, port=DEFAULT_PORT, wait=False, poll=0.1, timeout=None):
+    """실행 중인 데몬에 작업을 보내고 작업 dict 반환 (wait면 끝날 때까지 기다림)"""
+    base = f"http://{host}:{port}"
+    data = json.dumps(request).encode('utf-8')
+    post = urllib.request.Request(f"{base}/jobs", data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(post, timeout=timeout) as response:
+        job = json.load(response)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while wait and job['status'] in (QUEUED, RUNNING):
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"job {job['id']} still {job['status']} after {timeout}s")
+        time.sleep(poll)
+        with urllib.request.urlopen(f"{base}/jobs/{job['id']}", timeout=timeout) as response:
+            job = json.load(response)
+    return job
+
+
+def parse_args(argv=None):
+    """명령줄 인자 파싱 (Blender 인자는 "--" 앞까지 무시)"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="상주 생성 데몬")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="데몬 실행 (bpy 필요)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--output-dir", default=OUTPUT_DIR)
+    serve.add_argument("--watch", action="store_true", help="config/ 변경 시 다시 생성")
+    serve.add_argument("--watch-dir", default=CONFIG_DIR)
+    serve.add_argument("--exporter", default="blender", choices=["blender", "direct"],
+                       help="감시 작업의 익스포터 (direct가 가장 빠름)")
+    serve.add_argument("--incremental", action="store_true", help="감시 작업에 엔티티 캐시 사용")
+
+    submit = commands.add_parser("submit", help="실행 중인 데몬에 작업 보내기")
+    submit.add_argument("config", help="설정 경로 (config/ 기준) 또는 '-' (표준 입력의 설정 JSON)")
+    submit.add_argument("--port", type=int, default=DEFAULT_PORT)
+    submit.add_argument("--options", default="{}", help="create_scene_from_config 옵션 JSON")
+    submit.add_argument("--wait", action="store_true", help="작업이 끝날 때까지 기다림")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "submit":
+        request = dict(json.loads(args.options))
+        if args.config == "-":
+            request['inline'] = json.load(sys.stdin)
+        else:
+            request['config'] = args.config
+        job = submit_job(request, port=args.port, wait=args.wait)
+        print(json.dumps(job, indent=2, ensure_ascii=False))
+        return 0 if job['status'] != FAILED else 1
+
+    # 첫 작업 전에 bpy / 생성 모듈을 미리 올려 둔다
+    start = time.perf_counter()
+    import bpy  # noqa: F401
+    from . import scenes  # noqa: F401
+    print(f"Generator modules loaded in {time.perf_counter() - start:.3f}s")
+
+    watch_options = {'exporter': args.exporter, 'incremental': args.incremental}
+    daemon = GeneratorDaemon(args.output_dir, args.watch_dir if args.watch else None, watch_options)
+    server = start_server(daemon, DEFAULT_HOST, args.port)
+    print(f"Generator daemon listening on http://{DEFAULT_HOST}:{args.port}"
+          + (f", watching {args.watch_dir}" if args.watch else ""))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,36 @@
-"""환경 요소 (나무, 도로 등)"""
+"""환경 요소 (나무, 도로 등)
+
+파트 배치는 layout 모듈이 계산하고, 여기서는 Blender 오브젝트로 옮긴다.
+"""
 
-import bpy
 from .utils import create_material
+from .instrument import count
+from .mesh_data import (add_part, collect_mesh_data, remove_objects, new_box_mesh, new_empty_object, link_objects,
+                        new_batch_object)
+from .layout import LEAF_COLOR, tree_parts, road_parts, tree_materials, road_materials
 
 
-def create_tree(location, height=4, name="Tree"):
-    """나무 생성"""
-    tree_objects = []
+def _create_tree_parts(height, name, variant=None):
+    """나무 줄기와 잎 오브젝트를 나무 밑동 기준 좌표로 생성 (부모 없음)
+
+    Returns:
+        (줄기 오브젝트, 잎 오브젝트 리스트)
+    """
+    leaf_color = variant.leaf_color if variant else LEAF_COLOR
+    materials = {slot: create_material(*spec) for slot, spec in tree_materials(name, leaf_color).items()}
+    objects = [add_part(part, materials[part.material]) for part in tree_parts(height, name, variant)]
+    return objects[0], objects[1:]
+
 
-    trunk_mat = create_material(f"{name}_Trunk", (0.35, 0.2, 0.1, 1.0), roughness=0.9)
-    trunk_radius = 0.15
-    trunk_height = height * 0.4
-
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=trunk_radius,
-        depth=trunk_height,
-        location=(location[0], location[1], trunk_height/2)
-    )
-    trunk = bpy.context.active_object
-    trunk.name = f"{name}_Trunk"
-    trunk.data.materials.append(trunk_mat)
-    tree_objects.append(trunk)
-
-    leaf_mat = create_material(f"{name}_Leaves", (0.2, 0.5, 0.15, 1.0), roughness=0.8)
-    leaf_positions = [
-        (0, 0, trunk_height + height * 0.3),
-        (0.3, 0.3, trunk_height + height * 0.15),
-        (-0.3, 0.3, trunk_height + height * 0.15),
-        (0.3, -0.3, trunk_height + height * 0.15),
-        (-0.3, -0.3, trunk_height + height * 0.15),
-    ]
-
-    for i, pos in enumerate(leaf_positions):
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=height * 0.25,
-            location=(location[0] + pos[0], location[1] + pos[1], pos[2])
-        )
-        leaf = bpy.context.active_object
-        leaf.name = f"{name}_Leaves_{i}"
-        leaf.data.materials.append(leaf_mat)
-        tree_objects.append(leaf)
+def create_tree(location, height=4, name="Tree", variant=None):
+    """나무 생성 (variant: variation.TreeVariant 잎 모양, None이면 기본)"""
+    import bpy
+    trunk, leaves = _create_tree_parts(height, name, variant)
+    tree_objects = [trunk] + leaves
 
     bpy.ops.object.empty_add(type='PLAIN_AXES', location=location)
+    count('ops')
+    count('objects')
     parent = bpy.context.active_object
     parent.name = name
 
@@ -51,71 +40,127 @@ def create_tree(location, height=4, name="Tree"):
     return parent
 
 
-def create_road(length=30, width=6, location=(0, -15, 0)):
-    """도로 생성"""
-    road_objects = []
+def _bake_mesh(name, objects):
+    """오브젝트들을 원점 기준 메시 하나로 굽고 오브젝트는 삭제"""
+    import bpy
+    material = objects[0].data.materials[0]
+    vertices, faces, _ = collect_mesh_data(objects)
+    remove_objects(objects)
 
-    asphalt_mat = create_material("Asphalt", (0.15, 0.15, 0.15, 1.0), roughness=0.95)
-    line_mat = create_material("RoadLine", (0.95, 0.95, 0.9, 1.0), roughness=0.5)
-
-    # 도로 표면
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(location[0], location[1], location[2] - 0.05)
-    )
-    road = bpy.context.active_object
-    road.name = "Road_Surface"
-    road.scale = (length, width, 0.1)
-    road.data.materials.append(asphalt_mat)
-    road_objects.append(road)
-
-    # 중앙선
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(location[0], location[1], location[2] + 0.01)
-    )
-    center_line = bpy.context.active_object
-    center_line.name = "Road_CenterLine"
-    center_line.scale = (length, 0.15, 0.02)
-    center_line.data.materials.append(line_mat)
-    road_objects.append(center_line)
-
-    # 차선 (점선)
-    dash_length = 2
-    gap_length = 1
-    num_dashes = int(length / (dash_length + gap_length))
-
-    for i in range(num_dashes):
-        x_pos = -length/2 + (dash_length + gap_length) * i + dash_length/2 + 1
-        for y_offset in [-width/4, width/4]:
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=(x_pos, location[1] + y_offset, location[2] + 0.01)
-            )
-            dash = bpy.context.active_object
-            dash.name = f"Road_Dash_{i}_{y_offset}"
-            dash.scale = (dash_length, 0.1, 0.02)
-            dash.data.materials.append(line_mat)
-            road_objects.append(dash)
+    mesh = bpy.data.meshes.new(name)
+    count('vertices', len(vertices))
+    mesh.from_pydata(vertices, [], faces)
+    mesh.update()
+    mesh.materials.append(material)
+    return mesh
+
+
+def create_tree_prototype(height, name="TreeProto", variant=None):
+    """높이 하나에 대한 나무 프로토타입 메시 생성
 
-    # 인도
-    sidewalk_mat = create_material("Sidewalk", (0.6, 0.6, 0.6, 1.0), roughness=0.85)
-    for y_offset in [-width/2 - 1, width/2 + 1]:
-        bpy.ops.mesh.primitive_cube_add(
-            size=1,
-            location=(location[0], location[1] + y_offset, location[2] + 0.05)
-        )
-        sidewalk = bpy.context.active_object
-        sidewalk.name = f"Sidewalk_{y_offset}"
-        sidewalk.scale = (length, 2, 0.2)
-        sidewalk.data.materials.append(sidewalk_mat)
-        road_objects.append(sidewalk)
+    나무 밑동이 원점에 오도록 구운 메시만 남기고 오브젝트는 지운다.
+
+    Returns:
+        {'trunk': 줄기 메시, 'leaves': 잎 메시 (구 5개를 합친 것)}
+    """
+    trunk, leaves = _create_tree_parts(height, name, variant)
+    return {
+        'trunk': _bake_mesh(f"{name}_Trunk", [trunk]),
+        'leaves': _bake_mesh(f"{name}_Leaves", leaves),
+    }
+
+
+def create_tree_instances(trees, bucket=0.25, name="Trees"):
+    """나무들을 (높이 구간, 모양) 별 프로토타입 메시의 링크 복제로 생성
+
+    같은 구간 / 모양의 나무는 메시 데이터를 공유하고, 실제 높이와의 차이는
+    균일 스케일로 맞춘다. 모든 나무가 한 엠프티의 자식이므로
+    export_to_gltf(gpu_instances=True)로 EXT_mesh_gpu_instancing을 쓸 수 있다.
+
+    Args:
+        trees: [((x, y, z), height, variation.TreeVariant 또는 None), ...]
+        bucket: 높이 구간 크기 (m, 0이면 높이마다 프로토타입)
+
+    Returns:
+        부모 엠프티
+    """
+    import bpy
+    prototypes = {}
+    tree_objects = []
+
+    for i, (location, height, variant) in enumerate(trees):
+        proto_height = round(height / bucket) * bucket if bucket > 0 else height
+        if proto_height <= 0:
+            proto_height = height
+
+        key = (proto_height, variant.shape if variant else None)
+        proto = prototypes.get(key)
+        if proto is None:
+            suffix = f"_{variant.shape}" if variant else ""
+            proto = create_tree_prototype(proto_height, name=f"TreeProto_{proto_height:g}{suffix}", variant=variant)
+            prototypes[key] = proto
+
+        scale = height / proto_height
+        for part in ('trunk', 'leaves'):
+            obj = bpy.data.objects.new(f"Tree_{i}_{part.capitalize()}", proto[part])
+            count('objects')
+            obj.location = location
+            obj.scale = (scale, scale, scale)
+            tree_objects.append(obj)
+
+    parent = new_empty_object(name)
+    for obj in tree_objects:
+        obj.parent = parent
+    link_objects(tree_objects + [parent])
+
+    return parent
+
+
+def create_road(length=30, width=6, location=(0, -15, 0), instanced=False, name="Road", rotation=0.0):
+    """도로 생성
+
+    Args:
+        instanced: True면 차선 점선들이 메시 데이터 하나를 공유
+        name: 부모 엠프티 이름
+        rotation: Z축 회전 (라디안, 0이면 X축 방향 도로)
+    """
+    import bpy
+    materials = {slot: create_material(*spec) for slot, spec in road_materials().items()}
+    dash_mesh = new_box_mesh("Road_Dash", materials['line']) if instanced else None
+
+    road_objects = []
+    for part in road_parts(length, width):
+        if dash_mesh is not None and part.name.startswith("Road_Dash_"):
+            dash = bpy.data.objects.new(part.name, dash_mesh)
+            count('objects')
+            dash.location = part.location
+            dash.scale = part.size
+            link_objects([dash])
+            road_objects.append(dash)
+        else:
+            road_objects.append(add_part(part, materials[part.material]))
 
     bpy.ops.object.empty_add(type='PLAIN_AXES', location=location)
+    count('ops')
+    count('objects')
     parent = bpy.context.active_object
-    parent.name = "Road"
+    parent.name = name
+    parent.rotation_euler = (0, 0, rotation)
 
     for obj in road_objects:
         obj.parent = parent
 
     return parent
+
+
+def create_network_road(entity):
+    """도로망 엔티티 (layout.network_entities) 를 머티리얼별 오브젝트 "{도로}_{슬롯}" 로 생성
+
+    점선이 아무리 많아도 도로 하나에 오브젝트는 머티리얼 수만큼이다.
+    """
+    parent = new_empty_object(entity['name'], entity['location'])
+    link_objects([parent])
+    materials = entity['materials']
+    for slot, batch in entity['meshes'].items():
+        new_batch_object(f"{entity['name']}_{slot}", batch, create_material(*materials[slot]), parent=parent)
+    return parent
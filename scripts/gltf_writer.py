@@ -0,0 +1,544 @@
+"""Blender 익스포터 없이 layout 결과를 바로 glTF/GLB로 쓰는 모듈
+
+생성기가 만드는 도형은 박스, 원기둥, 구, 텍스트뿐이고 머티리얼은 단색 PBR
+이므로, layout.scene_layout() 결과에서 직접 버퍼를 만든다.
+
+- 정점/인덱스는 little-endian으로 하나의 버퍼에 패킹
+- 같은 도형 (종류 + 분할 수, tessellation 참고) 은 접근자(accessor)를 공유하고
+  크기는 노드 스케일로 맞춤
+- 내용이 같은 인덱스 버퍼는 도형이 달라도 접근자 하나를 공유
+- quantize=True면 KHR_mesh_quantization (위치 int16, 법선 int8) 으로 저장하고
+  역양자화 (오프셋 + 스케일) 는 메시 노드의 TRS에 합쳐 넣음
+- 미리 구운 메시 (엔티티 'meshes', 가려진 면을 지운 건물 / 도로망) 는 배열 내용의
+  다이제스트로 공유
+- 머티리얼은 create_material 파라미터 (MaterialSpec) 에서 변환
+- 좌표는 Blender 익스포터와 같이 Z-up → Y-up 으로 변환
+
+텍스트는 글꼴 테셀레이션이 필요하므로 text_mesher (예: building.text_mesh_faces)
+가 주어질 때만 포함한다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import struct
+import sys
+
+from .layout import LOD_DISTANCES, material_key
+from .primitives import batch_faces, primitive_faces, transformed_faces
+from .tessellation import segments
+
+GLB_MAGIC = 0x46546C67
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+BYTE = 5120
+SHORT = 5122
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+
+KHR_MESH_QUANTIZATION = 'KHR_mesh_quantization'
+
+# int16 위치의 양자화 범위 (-32767..32767)
+POSITION_STEPS = 65534
+
+
+def to_gltf_vector(v):
+    """Blender (Z-up) 좌표를 glTF (Y-up) 좌표로"""
+    return (v[0], v[2], -v[1])
+
+
+def to_gltf_scale(s):
+    return (s[0], s[2], s[1])
+
+
+def euler_to_gltf_quaternion(rotation):
+    """Blender XYZ 오일러 각을 glTF (Y-up) 쿼터니언 (x, y, z, w) 으로"""
+    cx, sx = math.cos(rotation[0] / 2), math.sin(rotation[0] / 2)
+    cy, sy = math.cos(rotation[1] / 2), math.sin(rotation[1] / 2)
+    cz, sz = math.cos(rotation[2] / 2), math.sin(rotation[2] / 2)
+    w = cx*cy*cz + sx*sy*sz
+    x = sx*cy*cz - cx*sy*sz
+    y = cx*sy*cz + sx*cy*sz
+    z = cx*cy*sz - sx*sy*cz
+    return (x, z, -y, w)
+
+
+def _face_normal(face):
+    """다각형 법선 (Newell 방식)"""
+    nx = ny = nz = 0.0
+    for i, (x0, y0, z0) in enumerate(face):
+        x1, y1, z1 = face[(i + 1) % len(face)]
+        nx += (y0 - y1) * (z0 + z1)
+        ny += (z0 - z1) * (x0 + x1)
+        nz += (x0 - x1) * (y0 + y1)
+    length = math.sqrt(nx*nx + ny*ny + nz*nz) or 1.0
+    return (nx / length, ny / length, nz / length)
+
+
+def _quaternion_rotate(q, v):
+    """단위 쿼터니언 (x, y, z, w) 으로 벡터 회전"""
+    x, y, z, w = q
+    # t = 2 * cross(q.xyz, v), v' = v + w * t + cross(q.xyz, t)
+    tx = 2 * (y * v[2] - z * v[1])
+    ty = 2 * (z * v[0] - x * v[2])
+    tz = 2 * (x * v[1] - y * v[0])
+    return (v[0] + w * tx + (y * tz - z * ty),
+            v[1] + w * ty + (z * tx - x * tz),
+            v[2] + w * tz + (x * ty - y * tx))
+
+
+def quantize_positions(positions):
+    """위치를 int16 격자로 양자화
+
+    Returns:
+        (정수 좌표 리스트, 오프셋, 스텝) - 원래 좌표 = 오프셋 + 정수 좌표 * 스텝
+    """
+    lo = [min(p[i] for p in positions) for i in range(3)]
+    hi = [max(p[i] for p in positions) for i in range(3)]
+    offset = tuple((lo[i] + hi[i]) / 2 for i in range(3))
+    step = max(hi[i] - lo[i] for i in range(3)) / POSITION_STEPS or 1.0
+    quantized = [tuple(round((p[i] - offset[i]) / step) for i in range(3)) for p in positions]
+    return quantized, offset, step
+
+
+def flat_mesh_buffers(faces):
+    """볼록 다각형 면 목록을 flat 셰이딩 정점/법선/인덱스 리스트로 (glTF 좌표계)"""
+    positions = []
+    normals = []
+    indices = []
+    for face in faces:
+        base = len(positions)
+        normal = to_gltf_vector(_face_normal(face))
+        for point in face:
+            positions.append(to_gltf_vector(point))
+            normals.append(normal)
+        for i in range(1, len(face) - 1):
+            indices.extend((base, base + i, base + i + 1))
+    return positions, normals, indices
+
+
+class GltfBuilder:
+    """glTF 문서와 바이너리 버퍼를 함께 쌓는 빌더"""
+
+    def __init__(self, quantize=False):
+        self.quantize = quantize
+        self.buffer = bytearray()
+        self.doc = {
+            'asset': {'generator': 'blender-building gltf_writer', 'version': '2.0'},
+            'scene': 0,
+            'scenes': [{'name': 'Scene', 'nodes': []}],
+            'nodes': [],
+            'meshes': [],
+            'materials': [],
+            'accessors': [],
+            'bufferViews': [],
+            'buffers': [],
+        }
+        self._materials = {}
+        self._geometry = {}
+        self._meshes = {}
+        self._indices = {}
+        self._dequantize = {}
+        self._node_names = set()
+        if quantize:
+            self.doc['extensionsUsed'] = [KHR_MESH_QUANTIZATION]
+            self.doc['extensionsRequired'] = [KHR_MESH_QUANTIZATION]
+
+    def _add_view(self, data, target, stride=None):
+        while len(self.buffer) % 4:
+            self.buffer.append(0)
+        view = {'buffer': 0, 'byteOffset': len(self.buffer), 'byteLength': len(data), 'target': target}
+        if stride:
+            view['byteStride'] = stride
+        self.doc['bufferViews'].append(view)
+        self.buffer.extend(data)
+        return len(self.doc['bufferViews']) - 1
+
+    def _add_accessor(self, accessor):
+        self.doc['accessors'].append(accessor)
+        return len(self.doc['accessors']) - 1
+
+    def add_geometry(self, key, faces):
+        """면 목록을 버퍼에 넣고 접근자 dict 반환 (key가 같으면 재사용)"""
+        if key in self._geometry:
+            return self._geometry[key]
+
+        positions, normals, indices = flat_mesh_buffers(faces)
+        if self.quantize:
+            geometry = self._add_quantized_attributes(positions, normals)
+        else:
+            geometry = self._add_float_attributes(positions, normals)
+        geometry['indices'] = self._add_indices(indices, len(positions))
+        self._geometry[key] = geometry
+        return geometry
+
+    def _add_float_attributes(self, positions, normals):
+        flat_positions = [c for p in positions for c in p]
+        flat_normals = [c for n in normals for c in n]
+        position_view = self._add_view(struct.pack(f'<{len(flat_positions)}f', *flat_positions), ARRAY_BUFFER)
+        normal_view = self._add_view(struct.pack(f'<{len(flat_normals)}f', *flat_normals), ARRAY_BUFFER)
+        return {
+            'POSITION': self._add_accessor({
+                'bufferView': position_view, 'componentType': FLOAT, 'count': len(positions), 'type': 'VEC3',
+                'min': [min(p[i] for p in positions) for i in range(3)],
+                'max': [max(p[i] for p in positions) for i in range(3)],
+            }),
+            'NORMAL': self._add_accessor({
+                'bufferView': normal_view, 'componentType': FLOAT, 'count': len(normals), 'type': 'VEC3',
+            }),
+        }
+
+    def _add_quantized_attributes(self, positions, normals):
+        """KHR_mesh_quantization: 위치 SHORT (정점당 8바이트), 법선 정규화 BYTE (4바이트)"""
+        quantized, offset, step = quantize_positions(positions)
+        # 정점 속성은 4바이트 정렬이어야 하므로 네 번째 성분을 0으로 채움
+        flat_positions = [c for p in quantized for c in (*p, 0)]
+        flat_normals = [c for n in normals for c in (round(n[0] * 127), round(n[1] * 127), round(n[2] * 127), 0)]
+        position_view = self._add_view(struct.pack(f'<{len(flat_positions)}h', *flat_positions), ARRAY_BUFFER, 8)
+        normal_view = self._add_view(struct.pack(f'<{len(flat_normals)}b', *flat_normals), ARRAY_BUFFER, 4)
+        return {
+            'POSITION': self._add_accessor({
+                'bufferView': position_view, 'componentType': SHORT, 'count': len(positions), 'type': 'VEC3',
+                'min': [min(p[i] for p in quantized) for i in range(3)],
+                'max': [max(p[i] for p in quantized) for i in range(3)],
+            }),
+            'NORMAL': self._add_accessor({
+                'bufferView': normal_view, 'componentType': BYTE, 'normalized': True,
+                'count': len(normals), 'type': 'VEC3',
+            }),
+            'dequantize': (offset, step),
+        }
+
+    def _add_indices(self, indices, vertex_count):
+        """인덱스 접근자 (내용이 같은 인덱스 버퍼는 재사용)"""
+        if vertex_count < 65536:
+            index_data, component = struct.pack(f'<{len(indices)}H', *indices), UNSIGNED_SHORT
+        else:
+            index_data, component = struct.pack(f'<{len(indices)}I', *indices), UNSIGNED_INT
+        if index_data not in self._indices:
+            self._indices[index_data] = self._add_accessor({
+                'bufferView': self._add_view(index_data, ELEMENT_ARRAY_BUFFER),
+                'componentType': component, 'count': len(indices), 'type': 'SCALAR',
+            })
+        return self._indices[index_data]
+
+    def add_material(self, spec):
+        """MaterialSpec을 glTF 머티리얼로 (같은 파라미터면 재사용, 이름은 처음 것)"""
+        key = material_key(spec.color, spec.metallic, spec.roughness, spec.alpha)
+        if key in self._materials:
+            return self._materials[key]
+
+        material = {
+            'name': spec.name,
+            'doubleSided': True,
+            'pbrMetallicRoughness': {
+                'baseColorFactor': [*spec.color[:3], spec.alpha],
+                'metallicFactor': spec.metallic,
+                'roughnessFactor': spec.roughness,
+            },
+        }
+        if spec.alpha < 1.0:
+            material['alphaMode'] = 'BLEND'
+        self.doc['materials'].append(material)
+        self._materials[key] = len(self.doc['materials']) - 1
+        return self._materials[key]
+
+    def add_mesh(self, name, geometry_key, material_index):
+        """접근자 세트 + 머티리얼 조합의 메시 (조합이 같으면 재사용)"""
+        key = (geometry_key, material_index)
+        if key in self._meshes:
+            return self._meshes[key]
+
+        geometry = self._geometry[geometry_key]
+        self.doc['meshes'].append({
+            'name': name,
+            'primitives': [{
+                'attributes': {'POSITION': geometry['POSITION'], 'NORMAL': geometry['NORMAL']},
+                'indices': geometry['indices'],
+                'material': material_index,
+            }],
+        })
+        self._meshes[key] = len(self.doc['meshes']) - 1
+        if 'dequantize' in geometry:
+            self._dequantize[self._meshes[key]] = geometry['dequantize']
+        return self._meshes[key]
+
+    def _unique_name(self, name):
+        """Blender처럼 이름이 겹치면 .001, .002 ... 를 붙임"""
+        unique = name
+        n = 0
+        while unique in self._node_names:
+            n += 1
+            unique = f"{name}.{n:03d}"
+        self._node_names.add(unique)
+        return unique
+
+    def add_node(self, name, location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), mesh=None,
+                 children=None, extras=None):
+        node = {'name': self._unique_name(name)}
+        translation = to_gltf_vector(location)
+        quaternion = euler_to_gltf_quaternion(rotation) if any(rotation) else None
+        scale = to_gltf_scale(scale)
+        if mesh is not None:
+            node['mesh'] = mesh
+            if mesh in self._dequantize:
+                # T * R * S * (T(offset) * S(step)) = T(T + R(S * offset)) * R * S(S * step)
+                offset, step = self._dequantize[mesh]
+                moved = tuple(s * o for s, o in zip(scale, offset))
+                if quaternion:
+                    moved = _quaternion_rotate(quaternion, moved)
+                translation = tuple(t + m for t, m in zip(translation, moved))
+                scale = tuple(s * step for s in scale)
+        if quaternion:
+            node['rotation'] = list(quaternion)
+        if scale != (1, 1, 1):
+            node['scale'] = list(scale)
+        if any(translation):
+            node['translation'] = list(translation)
+        if children:
+            node['children'] = children
+        if extras:
+            node['extras'] = extras
+        self.doc['nodes'].append(node)
+        return len(self.doc['nodes']) - 1
+
+    def add_root(self, node_index):
+        self.doc['scenes'][0]['nodes'].append(node_index)
+
+    def write(self, filepath):
+        """확장자가 .glb면 GLB, 아니면 .gltf + .bin 으로 저장"""
+        while len(self.buffer) % 4:
+            self.buffer.append(0)
+        doc = dict(self.doc)
+        for key in ('meshes', 'materials', 'accessors', 'bufferViews'):
+            if not doc[key]:
+                del doc[key]
+
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        if filepath.lower().endswith('.glb'):
+            doc['buffers'] = [{'byteLength': len(self.buffer)}] if self.buffer else []
+            json_data = json.dumps(doc, separators=(',', ':')).encode('utf-8')
+            json_data += b' ' * (-len(json_data) % 4)
+            chunks = struct.pack('<II', len(json_data), GLB_CHUNK_JSON) + json_data
+            if self.buffer:
+                chunks += struct.pack('<II', len(self.buffer), GLB_CHUNK_BIN) + bytes(self.buffer)
+            with open(filepath, 'wb') as f:
+                f.write(struct.pack('<III', GLB_MAGIC, 2, 12 + len(chunks)))
+                f.write(chunks)
+        else:
+            bin_name = os.path.splitext(os.path.basename(filepath))[0] + '.bin'
+            doc['buffers'] = [{'byteLength': len(self.buffer), 'uri': bin_name}]
+            with open(os.path.join(os.path.dirname(os.path.abspath(filepath)), bin_name), 'wb') as f:
+                f.write(self.buffer)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(doc, f, indent=2)
+
+
+def add_merged_parts(builder, name, parts, materials):
+    """파트들을 머티리얼별 메시 하나로 구워 노드 인덱스 리스트 반환 (간략화 단계용)"""
+    groups = {}
+    for part in parts:
+        groups.setdefault(part.material, []).append(part)
+
+    nodes = []
+    for slot, group in groups.items():
+        # 같은 배치의 간략화 메시는 건물이 달라도 접근자를 공유
+        key = ('merged', tuple((p.kind, p.location, p.size, p.rotation, segments(p.kind, p.size))
+                               for p in group))
+        faces = []
+        if key not in builder._geometry:
+            for part in group:
+                faces.extend(transformed_faces(primitive_faces(part.kind, segments(part.kind, part.size)),
+                                               part.location, part.size, part.rotation))
+        builder.add_geometry(key, faces)
+        mesh = builder.add_mesh(f"{name}_{slot}", key, builder.add_material(materials[slot]))
+        nodes.append(builder.add_node(f"{name}_{slot}", mesh=mesh))
+    return nodes
+
+
+def add_entity(builder, entity, text_mesher=None):
+    """scene_layout 엔티티 하나를 노드 트리로 추가하고 루트 노드 인덱스 반환
+
+    'lods'가 있으면 원본은 "{이름}_LOD0", 간략화 단계는 "{이름}_LOD{n}" 노드 아래에
+    두고 각 노드 extras에 'lod' 단계를 적는다. 'meshes' ({슬롯: primitives.MeshBatch})
+    가 있으면 머티리얼마다 구운 메시 노드 "{이름}_{슬롯}" 하나씩을 만든다.
+    """
+    materials = entity['materials']
+    children = []
+
+    for slot, batch in entity.get('meshes', {}).items():
+        # 같은 치수 / 변형의 건물끼리는 배열이 같으므로 접근자를 공유
+        # (배열 자체를 키로 두면 엔티티마다 전체 메시가 빌더에 남으므로 다이제스트로)
+        digest = hashlib.blake2b(digest_size=16)
+        for values in batch:
+            digest.update(values.tobytes())
+        key = ('baked', digest.digest())
+        if key not in builder._geometry:
+            builder.add_geometry(key, batch_faces(batch))
+        name = f"{entity['name']}_{slot}"
+        mesh = builder.add_mesh(name, key, builder.add_material(materials[slot]))
+        children.append(builder.add_node(name, mesh=mesh))
+
+    for part in entity['parts']:
+        material_index = builder.add_material(materials[part.material])
+
+        if part.kind == 'text':
+            if text_mesher is None:
+                continue
+            key = ('text', part.extra['body'], part.size, part.extra['align_x'], part.extra['align_y'])
+            builder.add_geometry(key, text_mesher(part))
+            mesh = builder.add_mesh(part.name, key, material_index)
+            children.append(builder.add_node(part.name, part.location, part.rotation, mesh=mesh))
+            continue
+
+        divisions = segments(part.kind, part.size)
+        key = (part.kind, divisions)
+        builder.add_geometry(key, primitive_faces(part.kind, divisions))
+        mesh = builder.add_mesh(part.kind.capitalize(), key, material_index)
+        children.append(builder.add_node(part.name, part.location, part.rotation, part.size, mesh=mesh))
+
+    lods = entity.get('lods')
+    if not lods:
+        return builder.add_node(entity['name'], entity['location'], entity.get('rotation', (0, 0, 0)),
+                                children=children)
+
+    levels = [builder.add_node(f"{entity['name']}_LOD0", children=children, extras={'lod': 0})]
+    for level, parts in sorted(lods.items()):
+        name = f"{entity['name']}_LOD{level}"
+        levels.append(builder.add_node(name, children=add_merged_parts(builder, name, parts, materials),
+                                       extras={'lod': level}))
+    return builder.add_node(entity['name'], entity['location'], children=levels,
+                            extras={'lod_distances': list(LOD_DISTANCES)})
+
+
+def build_scene(entities, text_mesher=None, quantize=False):
+    """엔티티들 (리스트 또는 제너레이터) 을 담은 GltfBuilder 반환"""
+    builder = GltfBuilder(quantize=quantize)
+    for entity in entities:
+        builder.add_root(add_entity(builder, entity, text_mesher))
+    return builder
+
+
+def builder_stats(builder):
+    return {
+        'nodes': len(builder.doc['nodes']),
+        'meshes': len(builder.doc['meshes']),
+        'materials': len(builder.doc['materials']),
+        'accessors': len(builder.doc['accessors']),
+        'bytes': len(builder.buffer),
+    }
+
+
+def write_scene(entities, filepath, text_mesher=None, quantize=False):
+    """scene_layout 결과를 glTF/GLB 파일로 저장
+
+    Args:
+        text_mesher: 텍스트 Part -> 삼각형 면 목록 함수 (None이면 텍스트 생략)
+        quantize: True면 KHR_mesh_quantization으로 저장
+
+    Returns:
+        {'nodes', 'meshes', 'materials', 'accessors', 'bytes'} 통계
+    """
+    builder = build_scene(entities, text_mesher, quantize=quantize)
+    builder.write(filepath)
+    return builder_stats(builder)
+
+
+def read_gltf(filepath):
+    """.gltf 또는 .glb 파일의 JSON 부분 읽기"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    if data[:4] == struct.pack('<I', GLB_MAGIC):
+        json_length, _ = struct.unpack_from('<II', data, 12)
+        return json.loads(data[20:20 + json_length])
+    return json.loads(data)
+
+
+def _base_name(name):
+    """Blender 중복 접미사 (.001) 제거"""
+    return re.sub(r'\.\d{3}$', '', name)
+
+
+def node_layout(doc):
+    """노드/머티리얼 배치 요약: {(부모 경로, 노드 이름): 머티리얼 이름}, {머티리얼 이름: 파라미터}"""
+    materials = {}
+    for material in doc.get('materials', []):
+        pbr = material.get('pbrMetallicRoughness', {})
+        materials[material['name']] = (
+            tuple(round(c, 4) for c in pbr.get('baseColorFactor', [1, 1, 1, 1])[:3]),
+            round(pbr.get('metallicFactor', 1.0), 4),
+            round(pbr.get('roughnessFactor', 1.0), 4),
+        )
+
+    material_names = [m['name'] for m in doc.get('materials', [])]
+    meshes = doc.get('meshes', [])
+    nodes = doc.get('nodes', [])
+    layout = {}
+
+    def visit(index, path):
+        node = nodes[index]
+        name = _base_name(node.get('name', ''))
+        material = None
+        if 'mesh' in node:
+            primitive = meshes[node['mesh']]['primitives'][0]
+            if 'material' in primitive:
+                material = material_names[primitive['material']]
+        key = (path, name)
+        # 이름이 겹치는 형제 노드는 순번으로 구분
+        n = 0
+        while key in layout:
+            n += 1
+            key = (path, f"{name}#{n}")
+        layout[key] = material
+        for child in node.get('children', []):
+            visit(child, f"{path}/{name}")
+
+    for root in doc.get('scenes', [{}])[doc.get('scene', 0)].get('nodes', []):
+        visit(root, '')
+    return layout, materials
+
+
+def compare_layouts(path_a, path_b):
+    """두 glTF 파일의 노드 트리, 노드별 머티리얼, 머티리얼 파라미터를 비교
+
+    Returns:
+        차이점 문자열 리스트 (같으면 빈 리스트)
+    """
+    nodes_a, materials_a = node_layout(read_gltf(path_a))
+    nodes_b, materials_b = node_layout(read_gltf(path_b))
+    params_a = {k: materials_a.get(v) for k, v in nodes_a.items()}
+    params_b = {k: materials_b.get(v) for k, v in nodes_b.items()}
+
+    differences = []
+    for key in sorted(nodes_a.keys() - nodes_b.keys()):
+        differences.append(f"only in {path_a}: {'/'.join(key)}")
+    for key in sorted(nodes_b.keys() - nodes_a.keys()):
+        differences.append(f"only in {path_b}: {'/'.join(key)}")
+    for key in sorted(nodes_a.keys() & nodes_b.keys()):
+        if params_a[key] != params_b[key]:
+            differences.append(f"material differs at {'/'.join(key)}: {params_a[key]} != {params_b[key]}")
+    return differences
+
+
+def main(argv=None):
+    """python -m scripts.gltf_writer compare a.gltf b.glb"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] != 'compare':
+        print("usage: python -m scripts.gltf_writer compare A.gltf B.gltf")
+        return 2
+
+    differences = compare_layouts(argv[1], argv[2])
+    for line in differences:
+        print(line)
+    print(f"{len(differences)} differences")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
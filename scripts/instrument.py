@@ -0,0 +1,137 @@
+"""생성 파이프라인 계측 (구간 시간 + 카운터)
+
+모드:
+    off      - 아무것도 기록하지 않음 (기본, span/count 호출 비용만 남음)
+    summary  - 구간 이름별 호출 횟수/누적 시간과 카운터 합계
+    trace    - summary + Chrome trace JSON (chrome://tracing, Perfetto 에서 열기)
+
+사용 예:
+    from .instrument import span, count
+    with span('create_building', name=name):
+        ...
+    count('objects', len(objects))
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+MODE_OFF = 'off'
+MODE_SUMMARY = 'summary'
+MODE_TRACE = 'trace'
+MODES = (MODE_OFF, MODE_SUMMARY, MODE_TRACE)
+
+# off일 때 span()이 돌려주는 공용 컨텍스트 (할당 없음)
+_NULL = nullcontext()
+
+_mode = MODE_OFF
+_enabled = False
+_spans = {}
+_counters = {}
+_events = []
+_origin = 0.0
+
+
+def configure(mode=MODE_OFF):
+    """계측 모드 설정 (기록도 초기화)"""
+    global _mode, _enabled
+    if mode not in MODES:
+        raise ValueError(f"Unknown instrument mode: {mode!r} (expected one of {MODES})")
+    _mode = mode
+    _enabled = mode != MODE_OFF
+    reset()
+
+
+def mode():
+    return _mode
+
+
+def reset():
+    """기록된 구간/카운터/trace 이벤트 비우기"""
+    global _origin
+    _spans.clear()
+    _counters.clear()
+    _events.clear()
+    _origin = time.perf_counter()
+
+
+@contextmanager
+def _span(name, args):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        entry = _spans.get(name)
+        if entry is None:
+            _spans[name] = [1, end - start]
+        else:
+            entry[0] += 1
+            entry[1] += end - start
+        if _mode == MODE_TRACE:
+            event = {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                     'ts': (start - _origin) * 1e6, 'dur': (end - start) * 1e6}
+            if args:
+                event['args'] = args
+            _events.append(event)
+
+
+def span(name, /, **args):
+    """구간 시간 측정 컨텍스트 (args는 trace 이벤트에만 붙음)"""
+    if not _enabled:
+        return _NULL
+    return _span(name, args)
+
+
+def count(name, n=1):
+    """카운터 증가"""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def summary():
+    """{'spans': {이름: {'count', 'seconds'}}, 'counters': {이름: 값}}"""
+    return {
+        'spans': {name: {'count': n, 'seconds': round(total, 6)}
+                  for name, (n, total) in sorted(_spans.items())},
+        'counters': dict(sorted(_counters.items())),
+    }
+
+
+def format_summary():
+    """summary()를 사람이 읽는 표로"""
+    data = summary()
+    lines = [f"{'span':<28}{'count':>8}{'seconds':>12}"]
+    for name, entry in sorted(data['spans'].items(), key=lambda item: -item[1]['seconds']):
+        lines.append(f"{name:<28}{entry['count']:>8}{entry['seconds']:>12.4f}")
+    if data['counters']:
+        lines.append("")
+        lines.append(f"{'counter':<28}{'value':>8}")
+        lines.extend(f"{name:<28}{value:>8}" for name, value in data['counters'].items())
+    return "\n".join(lines)
+
+
+def write_trace(filepath):
+    """Chrome trace JSON 저장 (카운터는 마지막 시점의 'C' 이벤트로 추가)"""
+    events = list(_events)
+    if _counters:
+        events.append({'name': 'counters', 'ph': 'C', 'pid': os.getpid(),
+                       'ts': (time.perf_counter() - _origin) * 1e6, 'args': dict(_counters)})
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+@contextmanager
+def instrumented(mode=MODE_SUMMARY):
+    """블록 동안만 계측을 켜고 summary dict를 채워 줌 (끝나면 이전 모드로 복구)"""
+    previous = _mode
+    configure(mode)
+    result = {}
+    try:
+        yield result
+    finally:
+        result.update(summary())
+        configure(previous)
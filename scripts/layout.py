@@ -0,0 +1,636 @@
+"""bpy 없이 건물/도로/나무 파트 배치를 계산하는 함수들
+
+모든 파트의 이름, 종류, 위치, 크기, 회전, 머티리얼 슬롯을 struct-of-arrays
+(Parts) 로 돌려준다. building.py / environment.py 의 함수들은 이 결과를
+그대로 Blender 오브젝트로 옮기는 어댑터다.
+
+크기(size)는 종류별로:
+    box: 스케일 (size=1 큐브 기준 = 치수)
+    cylinder: (지름, 지름, 높이)
+    sphere: (지름, 지름, 지름)
+    text: (글자 크기, 글자 크기, 두께)
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+from .culling import cull_parts
+from .road_network import (INTERSECTION_NAME, find_intersections, intersection_meshes, network_polylines,
+                           network_road_meshes)
+from .schema import normalize_config
+from .variation import building_variant, tree_variant
+
+Part = namedtuple('Part', ['name', 'kind', 'location', 'size', 'rotation', 'material', 'extra'])
+
+# create_material(*spec)에 그대로 넘길 수 있는 머티리얼 파라미터
+MaterialSpec = namedtuple('MaterialSpec', ['name', 'color', 'metallic', 'roughness', 'alpha'],
+                          defaults=(0.0, 0.5, 1.0))
+
+SLAB_THICKNESS = 0.2
+WALL_THICKNESS = 0.15
+WINDOW_WIDTH = 1.2
+WINDOW_HEIGHT = 1.5
+ROOF_OVERHANG = 0.3         # 지붕이 벽보다 넓은 폭 (양쪽 합)
+TRUNK_RADIUS = 0.15
+SIDEWALK_WIDTH = 2
+
+# 간략화 단계 (0 = 원본) 와 웹 뷰어의 단계별 전환 거리 (미터)
+LOD_LEVELS = (0, 1, 2)
+LOD_DISTANCES = (0, 60, 150)
+
+LEAF_COLOR = (0.2, 0.5, 0.15, 1.0)
+
+
+class Parts:
+    """파트 목록 (struct-of-arrays)
+
+    위치/크기/회전은 array('d')에 xyz 순서로 평탄하게 저장한다.
+    """
+
+    __slots__ = ('names', 'kinds', 'locations', 'sizes', 'rotations', 'materials', 'extras')
+
+    def __init__(self):
+        self.names = []
+        self.kinds = []
+        self.locations = array('d')
+        self.sizes = array('d')
+        self.rotations = array('d')
+        self.materials = []
+        self.extras = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.names)
+        return Part(
+            self.names[i], self.kinds[i],
+            tuple(self.locations[i*3:i*3 + 3]),
+            tuple(self.sizes[i*3:i*3 + 3]),
+            tuple(self.rotations[i*3:i*3 + 3]),
+            self.materials[i], self.extras[i]
+        )
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield self[i]
+
+    def add(self, name, kind, location, size, material, rotation=(0.0, 0.0, 0.0), extra=None):
+        self.names.append(name)
+        self.kinds.append(kind)
+        self.locations.extend(location)
+        self.sizes.extend(size)
+        self.rotations.extend(rotation)
+        self.materials.append(material)
+        self.extras.append(extra)
+
+    def append(self, part):
+        self.add(part.name, part.kind, part.location, part.size, part.material,
+                 rotation=part.rotation, extra=part.extra)
+
+    def extend(self, other):
+        self.names.extend(other.names)
+        self.kinds.extend(other.kinds)
+        self.locations.extend(other.locations)
+        self.sizes.extend(other.sizes)
+        self.rotations.extend(other.rotations)
+        self.materials.extend(other.materials)
+        self.extras.extend(other.extras)
+        return self
+
+    def translated(self, offset):
+        """모든 위치를 offset만큼 옮긴 복사본"""
+        moved = Parts().extend(self)
+        for i in range(len(moved.names)):
+            for axis in range(3):
+                moved.locations[i*3 + axis] += offset[axis]
+        return moved
+
+    def to_numpy(self):
+        """numpy 배열 dict로 변환 (locations/sizes/rotations는 (n, 3))"""
+        import numpy as np
+
+        return {
+            'names': np.array(self.names, dtype=object),
+            'kinds': np.array(self.kinds),
+            'locations': np.frombuffer(self.locations, dtype=np.float64).reshape(-1, 3),
+            'sizes': np.frombuffer(self.sizes, dtype=np.float64).reshape(-1, 3),
+            'rotations': np.frombuffer(self.rotations, dtype=np.float64).reshape(-1, 3),
+            'materials': np.array(self.materials),
+        }
+
+
+def material_key(color, metallic=0.0, roughness=0.5, alpha=1.0):
+    """머티리얼 캐시 키 - (color..., metallic, roughness, alpha) 평탄 튜플"""
+    return tuple(round(v, 6) for v in (*color, metallic, roughness, alpha))
+
+
+def building_materials(name, wall_color=(0.85, 0.82, 0.78, 1.0)):
+    """건물 본체 머티리얼 슬롯별 파라미터"""
+    return {
+        'concrete': MaterialSpec(f"{name}_Concrete", (0.5, 0.5, 0.5, 1.0), roughness=0.9),
+        'wall': MaterialSpec(f"{name}_Wall", wall_color, roughness=0.7),
+        'glass': MaterialSpec(f"{name}_Glass", (0.6, 0.8, 0.9, 0.5), metallic=0.9, roughness=0.1),
+        'roof': MaterialSpec(f"{name}_Roof", (0.3, 0.3, 0.35, 1.0), roughness=0.8),
+    }
+
+
+def entrance_materials(name):
+    """건물 입구 머티리얼 슬롯별 파라미터"""
+    return {
+        'frame': MaterialSpec(f"{name}_EntranceFrame", (0.15, 0.15, 0.18, 1.0), metallic=0.9, roughness=0.2),
+        'door_glass': MaterialSpec(f"{name}_DoorGlass", (0.7, 0.85, 0.9, 1.0),
+                                   metallic=0.1, roughness=0.05, alpha=0.3),
+        'handle': MaterialSpec(f"{name}_DoorHandle", (0.8, 0.8, 0.8, 1.0), metallic=1.0, roughness=0.1),
+        'canopy': MaterialSpec(f"{name}_Canopy", (0.2, 0.2, 0.22, 1.0), metallic=0.9, roughness=0.2),
+        'canopy_glass': MaterialSpec(f"{name}_CanopyGlass", (0.8, 0.9, 0.95, 0.2), metallic=0.1, roughness=0.05),
+    }
+
+
+def text_material(name, color=(0.1, 0.1, 0.1, 1.0)):
+    """텍스트 머티리얼 파라미터"""
+    return MaterialSpec(name, color, roughness=0.3)
+
+
+def tree_materials(name, leaf_color=LEAF_COLOR):
+    """나무 머티리얼 슬롯별 파라미터"""
+    return {
+        'trunk': MaterialSpec(f"{name}_Trunk", (0.35, 0.2, 0.1, 1.0), roughness=0.9),
+        'leaves': MaterialSpec(f"{name}_Leaves", leaf_color, roughness=0.8),
+    }
+
+
+def road_materials():
+    """도로 머티리얼 슬롯별 파라미터"""
+    return {
+        'asphalt': MaterialSpec("Asphalt", (0.15, 0.15, 0.15, 1.0), roughness=0.95),
+        'line': MaterialSpec("RoadLine", (0.95, 0.95, 0.9, 1.0), roughness=0.5),
+        'sidewalk': MaterialSpec("Sidewalk", (0.6, 0.6, 0.6, 1.0), roughness=0.85),
+    }
+
+
+def windows_per_floor(width):
+    """층의 한 면 (앞 또는 뒤) 창문 수"""
+    return max(1, int(width / 3))
+
+
+def floor_parts(width, depth, height, floor_num, entrance_width=0, entrance_height=2.5,
+                window_size=None, window_mask=None):
+    """단일 층 파트 (슬래브, 벽, 창문) - 건물 원점 기준
+
+    Args:
+        window_size: 창문 (폭, 높이) (None이면 WINDOW_WIDTH × WINDOW_HEIGHT)
+        window_mask: [앞 창 0..n-1, 뒤 창 0..n-1] 의 0/1 (None이면 모든 창, variation 참고)
+    """
+    parts = Parts()
+    floor_base_z = (floor_num - 1) * height
+
+    # 바닥 슬래브
+    parts.add(f"Floor_{floor_num}_Slab", 'box',
+              (0, 0, floor_base_z + SLAB_THICKNESS/2),
+              (width, depth, SLAB_THICKNESS), 'concrete')
+
+    # 벽 생성
+    wall_height = height - SLAB_THICKNESS
+    wall_z = floor_base_z + SLAB_THICKNESS + wall_height/2
+
+    # 뒷벽
+    parts.add(f"Floor_{floor_num}_Wall_Back", 'box',
+              (0, depth/2 - WALL_THICKNESS/2, wall_z),
+              (width, WALL_THICKNESS, wall_height), 'wall')
+
+    # 앞벽 - 1층이고 입구가 있으면 좌/우로 분리
+    if floor_num == 1 and entrance_width > 0:
+        # 입구 좌측 벽
+        left_wall_width = (width - entrance_width) / 2
+        if left_wall_width > 0:
+            parts.add(f"Floor_{floor_num}_Wall_Front_Left", 'box',
+                      (-width/2 + left_wall_width/2, -depth/2 + WALL_THICKNESS/2, wall_z),
+                      (left_wall_width, WALL_THICKNESS, wall_height), 'wall')
+
+        # 입구 우측 벽
+        right_wall_width = (width - entrance_width) / 2
+        if right_wall_width > 0:
+            parts.add(f"Floor_{floor_num}_Wall_Front_Right", 'box',
+                      (width/2 - right_wall_width/2, -depth/2 + WALL_THICKNESS/2, wall_z),
+                      (right_wall_width, WALL_THICKNESS, wall_height), 'wall')
+
+        # 입구 위쪽 벽 (문 위 공간 채우기)
+        above_entrance_height = wall_height - entrance_height
+        if above_entrance_height > 0:
+            parts.add(f"Floor_{floor_num}_Wall_Front_Above", 'box',
+                      (0, -depth/2 + WALL_THICKNESS/2,
+                       floor_base_z + SLAB_THICKNESS + entrance_height + above_entrance_height/2),
+                      (entrance_width, WALL_THICKNESS, above_entrance_height), 'wall')
+    else:
+        # 일반 앞벽
+        parts.add(f"Floor_{floor_num}_Wall_Front", 'box',
+                  (0, -depth/2 + WALL_THICKNESS/2, wall_z),
+                  (width, WALL_THICKNESS, wall_height), 'wall')
+
+    # 우측벽
+    parts.add(f"Floor_{floor_num}_Wall_Right", 'box',
+              (width/2 - WALL_THICKNESS/2, 0, wall_z),
+              (WALL_THICKNESS, depth - WALL_THICKNESS*2, wall_height), 'wall')
+
+    # 좌측벽
+    parts.add(f"Floor_{floor_num}_Wall_Left", 'box',
+              (-width/2 + WALL_THICKNESS/2, 0, wall_z),
+              (WALL_THICKNESS, depth - WALL_THICKNESS*2, wall_height), 'wall')
+
+    # 창문 생성
+    window_depth = WALL_THICKNESS + 0.02
+    num_windows = windows_per_floor(width)
+    if window_size is None:
+        window_width, window_height = WINDOW_WIDTH, WINDOW_HEIGHT
+    else:
+        # variation 창문 크기만 벽 높이를 넘지 않게 (기본 창문은 원래 크기 그대로)
+        window_width, window_height = window_size
+        window_height = min(window_height, wall_height * 0.8)
+    window_size = (window_width, window_depth, window_height)
+
+    for i in range(num_windows):
+        window_x = -width/2 + width/(num_windows+1) * (i+1)
+        window_z = floor_base_z + SLAB_THICKNESS + wall_height/2
+
+        # 앞면 창문 - 1층 입구가 있으면 입구 영역 (-entrance_width/2 ~ entrance_width/2) 피하기
+        if ((window_mask is None or window_mask[i]) and
+                (not (floor_num == 1 and entrance_width > 0) or abs(window_x) > entrance_width/2 + window_width/2)):
+            parts.add(f"Floor_{floor_num}_Window_Front_{i}", 'box',
+                      (window_x, -depth/2 + WALL_THICKNESS/2, window_z), window_size, 'glass')
+
+        # 뒷면 창문
+        if window_mask is None or window_mask[num_windows + i]:
+            parts.add(f"Floor_{floor_num}_Window_Back_{i}", 'box',
+                      (window_x, depth/2 - WALL_THICKNESS/2, window_z), window_size, 'glass')
+
+    return parts
+
+
+def building_parts(name, width=8, depth=6, floor_height=3.5, num_floors=2,
+                   entrance_width=0, entrance_height=2.5, window_size=None, window_mask=None):
+    """건물 본체 파트 (모든 층 + 지붕) - 건물 원점 기준
+
+    window_mask는 층마다 floor_parts의 window_mask를 이어 붙인 것 (variation.BuildingVariant)
+    """
+    parts = Parts()
+    per_floor = 2 * windows_per_floor(width)
+
+    for floor_num in range(1, num_floors + 1):
+        parts.extend(floor_parts(width, depth, floor_height, floor_num,
+                                 entrance_width=entrance_width if floor_num == 1 else 0,
+                                 entrance_height=entrance_height if floor_num == 1 else 0,
+                                 window_size=window_size,
+                                 window_mask=None if window_mask is None else
+                                 window_mask[(floor_num - 1) * per_floor:floor_num * per_floor]))
+
+    # 지붕 생성
+    roof_z = num_floors * floor_height + 0.15
+    parts.add(f"{name}_Roof", 'box', (0, 0, roof_z), (width + ROOF_OVERHANG, depth + ROOF_OVERHANG, 0.3), 'roof')
+
+    return parts
+
+
+def building_lod_parts(name, width=8, depth=6, floor_height=3.5, num_floors=2, level=1,
+                       entrance_width=0):
+    """간략화된 건물 본체 파트 - 건물 원점 기준
+
+    level 1: 층별 벽을 통짜 상자 하나로 합치고, 창문은 층마다 앞/뒤 유리 띠 하나로
+             (입구 문/손잡이, 텍스트 없음)
+    level 2: 벽 상자 하나 + 지붕
+    """
+    if level not in LOD_LEVELS[1:]:
+        raise ValueError(f"Unsupported LOD level: {level!r} (expected one of {LOD_LEVELS[1:]})")
+
+    parts = Parts()
+    total_height = num_floors * floor_height
+
+    parts.add(f"{name}_LOD{level}_Shell", 'box', (0, 0, total_height/2),
+              (width, depth, total_height), 'wall')
+
+    if level == 1:
+        # 창문들이 걸친 폭만큼의 유리 띠 (벽면에서 살짝 튀어나오게)
+        num_windows = windows_per_floor(width)
+        span = width/(num_windows+1) * (num_windows-1) + WINDOW_WIDTH
+        band_size = (span, 0.04, WINDOW_HEIGHT)
+
+        for floor_num in range(1, num_floors + 1):
+            band_z = (floor_num - 1) * floor_height + SLAB_THICKNESS + (floor_height - SLAB_THICKNESS)/2
+            if not (floor_num == 1 and entrance_width > 0):
+                parts.add(f"{name}_LOD1_Floor_{floor_num}_Glass_Front", 'box',
+                          (0, -depth/2, band_z), band_size, 'glass')
+            parts.add(f"{name}_LOD1_Floor_{floor_num}_Glass_Back", 'box',
+                      (0, depth/2, band_z), band_size, 'glass')
+
+    roof_z = total_height + 0.15
+    parts.add(f"{name}_LOD{level}_Roof", 'box', (0, 0, roof_z), (width + ROOF_OVERHANG, depth + ROOF_OVERHANG, 0.3), 'roof')
+
+    return parts
+
+
+def entrance_parts(name, width=2, height=2.5, depth=6):
+    """건물 입구 (유리 도어, 캐노피) 파트 - 건물 원점 기준"""
+    parts = Parts()
+    frame_thickness = 0.05
+    frame_depth = 0.08
+    front_y = -depth/2 + frame_depth/2
+
+    # 외부 프레임 - 상단 / 좌측 / 우측
+    parts.add(f"{name}_Entrance_TopFrame", 'box', (0, front_y, height),
+              (width + frame_thickness*2, frame_depth, frame_thickness*2), 'frame')
+    parts.add(f"{name}_Entrance_LeftFrame", 'box', (-width/2 - frame_thickness/2, front_y, height/2),
+              (frame_thickness, frame_depth, height), 'frame')
+    parts.add(f"{name}_Entrance_RightFrame", 'box', (width/2 + frame_thickness/2, front_y, height/2),
+              (frame_thickness, frame_depth, height), 'frame')
+
+    # 유리 도어 (양쪽 여닫이)
+    door_width = (width - 0.06) / 2
+    door_height = height - 0.1
+
+    for i, x_offset in enumerate([-door_width/2 - 0.015, door_width/2 + 0.015]):
+        # 문 프레임 (상단, 하단, 좌측, 우측)
+        door_frame_positions = [
+            ((x_offset, front_y, door_height), (door_width, 0.04, 0.06)),
+            ((x_offset, front_y, 0.03), (door_width, 0.04, 0.06)),
+            ((x_offset - door_width/2 + 0.02, front_y, door_height/2), (0.04, 0.04, door_height)),
+            ((x_offset + door_width/2 - 0.02, front_y, door_height/2), (0.04, 0.04, door_height)),
+        ]
+        for j, (pos, scale) in enumerate(door_frame_positions):
+            parts.add(f"{name}_DoorFrame_{i}_{j}", 'box', pos, scale, 'frame')
+
+        # 유리 패널
+        parts.add(f"{name}_DoorGlass_{i}", 'box', (x_offset, front_y, door_height/2),
+                  (door_width - 0.08, 0.02, door_height - 0.12), 'door_glass')
+
+        # 문 손잡이 (반지름 0.02, 길이 0.15 원기둥을 Y축 방향으로 눕힘)
+        handle_x = x_offset + (door_width/2 - 0.15) * (-1 if i == 0 else 1)
+        parts.add(f"{name}_DoorHandle_{i}", 'cylinder', (handle_x, -depth/2 - 0.02, height * 0.45),
+                  (0.04, 0.04, 0.15), 'handle', rotation=(math.pi/2, 0, 0))
+
+    # 중앙 세로 프레임
+    parts.add(f"{name}_Entrance_CenterFrame", 'box', (0, front_y, door_height/2),
+              (0.04, frame_depth, door_height), 'frame')
+
+    # 캐노피 프레임 / 유리
+    parts.add(f"{name}_CanopyFrame", 'box', (0, -depth/2 - 0.6, height + 0.15),
+              (width + 0.8, 1.0, 0.05), 'canopy')
+    parts.add(f"{name}_CanopyGlass", 'box', (0, -depth/2 - 0.6, height + 0.12),
+              (width + 0.6, 0.8, 0.02), 'canopy_glass')
+
+    return parts
+
+
+def roof_text_part(text, name, depth, num_floors, floor_height, text_size=1.0):
+    """지붕 가장자리 텍스트 배치 - 건물 원점 기준"""
+    parts = Parts()
+    roof_z = num_floors * floor_height + 0.3
+    parts.add(f"{name}_RoofText_{text}", 'text', (0, -depth/2 - 0.15, roof_z),
+              (text_size, text_size, 0.08), 'text', rotation=(math.pi/2, 0, 0),
+              extra={'body': text, 'align_x': 'CENTER', 'align_y': 'BOTTOM'})
+    return parts[0]
+
+
+def wall_text_part(text, name, floor_num=1, wall_side="front"):
+    """벽면 텍스트 배치 - 건물 원점 기준
+
+    기존 동작대로 층 높이 3.5, 깊이 6 기준으로 배치한다.
+    """
+    floor_height = 3.5
+    depth = 6
+    text_z = (floor_num - 1) * floor_height + floor_height * 0.6
+
+    placements = {
+        "front": ((0, -depth/2 - 0.01, text_z), (math.pi/2, 0, 0)),
+        "back": ((0, depth/2 + 0.01, text_z), (math.pi/2, 0, math.pi)),
+        "left": ((-depth/2 - 0.01, 0, text_z), (math.pi/2, 0, -math.pi/2)),
+        "right": ((depth/2 + 0.01, 0, text_z), (math.pi/2, 0, math.pi/2)),
+    }
+    location, rotation = placements.get(wall_side, ((0, 0, 0), (0, 0, 0)))
+
+    parts = Parts()
+    parts.add(f"{name}_Text_{text}", 'text', location, (0.8, 0.8, 0.05), 'text',
+              rotation=rotation, extra={'body': text, 'align_x': 'CENTER', 'align_y': 'CENTER'})
+    return parts[0]
+
+
+def tree_parts(height=4, name="Tree", variant=None):
+    """나무 파트 (줄기 원기둥 + 잎 구 5개) - 나무 밑동 기준
+
+    variant (variation.TreeVariant) 가 있으면 잎마다 위치를 높이 비율만큼 옮기고 지름을 배율만큼 키움
+    """
+    parts = Parts()
+    trunk_radius = TRUNK_RADIUS
+    trunk_height = height * 0.4
+
+    parts.add(f"{name}_Trunk", 'cylinder', (0, 0, trunk_height/2),
+              (trunk_radius*2, trunk_radius*2, trunk_height), 'trunk')
+
+    leaf_diameter = height * 0.5
+    leaf_positions = [
+        (0, 0, trunk_height + height * 0.3),
+        (0.3, 0.3, trunk_height + height * 0.15),
+        (-0.3, 0.3, trunk_height + height * 0.15),
+        (0.3, -0.3, trunk_height + height * 0.15),
+        (-0.3, -0.3, trunk_height + height * 0.15),
+    ]
+    for i, pos in enumerate(leaf_positions):
+        diameter = leaf_diameter
+        if variant is not None:
+            offset = variant.leaf_offsets[i*3:i*3 + 3]
+            pos = tuple(p + o * height for p, o in zip(pos, offset))
+            diameter *= variant.leaf_scales[i]
+        parts.add(f"{name}_Leaves_{i}", 'sphere', pos, (diameter, diameter, diameter), 'leaves')
+
+    return parts
+
+
+def road_parts(length=30, width=6):
+    """도로 파트 (표면, 중앙선, 점선, 인도) - 도로 중심 기준"""
+    parts = Parts()
+
+    parts.add("Road_Surface", 'box', (0, 0, -0.05), (length, width, 0.1), 'asphalt')
+    parts.add("Road_CenterLine", 'box', (0, 0, 0.01), (length, 0.15, 0.02), 'line')
+
+    # 차선 (점선)
+    dash_length = 2
+    gap_length = 1
+    num_dashes = int(length / (dash_length + gap_length))
+
+    for i in range(num_dashes):
+        x_pos = -length/2 + (dash_length + gap_length) * i + dash_length/2 + 1
+        for y_offset in [-width/4, width/4]:
+            parts.add(f"Road_Dash_{i}_{y_offset}", 'box', (x_pos, y_offset, 0.01),
+                      (dash_length, 0.1, 0.02), 'line')
+
+    # 인도
+    for y_offset in [-width/2 - SIDEWALK_WIDTH/2, width/2 + SIDEWALK_WIDTH/2]:
+        parts.add(f"Sidewalk_{y_offset}", 'box', (0, y_offset, 0.05), (length, SIDEWALK_WIDTH, 0.2), 'sidewalk')
+
+    return parts
+
+
+def building_entity(building, lods=False, seed=None, cull=False):
+    """건물 레코드 (schema.Building) 하나의 엔티티 배치 (scene_layout 참고)
+
+    seed가 있으면 variation.building_variant로 벽 색 / 창문을 바꿈.
+    cull이면 텍스트를 뺀 파트 중 가려진 면이 있는 것을 culling.cull_parts로 머티리얼별 메시로
+    구워 'meshes' ({슬롯: MeshBatch}) 와 'cull' (통계) 에 담고, 'parts'에는 텍스트와 굽지 않은 파트를 남긴다.
+    """
+    name = building.name
+    width, depth = building.width, building.depth
+    floor_height, num_floors = building.floor_height, building.floors
+    entrance = building.entrance
+    variant = building_variant(building, windows_per_floor(width), seed)
+
+    materials = building_materials(name, variant.wall_color)
+    parts = building_parts(
+        name, width=width, depth=depth, floor_height=floor_height, num_floors=num_floors,
+        entrance_width=building.entrance_width,
+        entrance_height=entrance.height if entrance else 2.5,
+        window_size=variant.window_size, window_mask=variant.window_mask
+    )
+
+    if building.text:
+        if building.text_position == "roof":
+            part = roof_text_part(building.text, name, depth, num_floors, floor_height,
+                                  text_size=building.text_size)
+        else:
+            part = wall_text_part(building.text, name, floor_num=building.text_floor)
+        parts.append(part)
+        materials['text'] = text_material(part.name, building.text_color)
+
+    if entrance:
+        parts.extend(entrance_parts(name, width=entrance.width, height=entrance.height, depth=depth))
+        materials.update(entrance_materials(name))
+
+    x, y = building.position
+    entity = {'kind': 'building', 'name': name, 'location': (x, y, 0),
+              'parts': parts, 'materials': materials}
+    if cull:
+        kept_parts = Parts()
+        solid_parts = Parts()
+        for part in parts:
+            (kept_parts if part.kind == 'text' else solid_parts).append(part)
+        kept, entity['meshes'], entity['cull'] = cull_parts(solid_parts, materials)
+        for part in kept:
+            kept_parts.append(part)
+        entity['parts'] = kept_parts
+    if lods:
+        entity['lods'] = {
+            level: building_lod_parts(name, width, depth, floor_height, num_floors, level,
+                                      entrance_width=building.entrance_width)
+            for level in LOD_LEVELS[1:]
+        }
+    return entity
+
+
+def road_entity(road):
+    """도로 레코드 (schema.Road) 하나의 엔티티 배치"""
+    return {
+        'kind': 'road', 'name': road.name,
+        'location': road.position,
+        'rotation': (0, 0, math.radians(road.rotation)),
+        'parts': road_parts(road.length, road.width),
+        'materials': road_materials(),
+    }
+
+
+def network_entities(network):
+    """도로망 (schema.RoadNetwork) 의 엔티티를 도로마다 하나 + 교차로 하나로 내보내는 제너레이터
+
+    엔티티 원점은 월드 원점이고 'parts'는 비어 있으며, 노면 / 차선 / 인도는
+    'meshes' ({슬롯: MeshBatch}, road_network 참고) 에 있다.
+    """
+    materials = road_materials()
+    polylines = network_polylines(network)
+    intersections = find_intersections(network, polylines)
+    for road, points in zip(network.roads, polylines):
+        yield {'kind': 'road', 'name': road.name, 'location': (0, 0, 0), 'parts': Parts(),
+               'meshes': network_road_meshes(road, points, intersections), 'materials': materials}
+    meshes = intersection_meshes(intersections)
+    if meshes:
+        yield {'kind': 'road', 'name': INTERSECTION_NAME, 'location': (0, 0, 0), 'parts': Parts(),
+               'meshes': meshes, 'materials': materials}
+
+
+def tree_entity(tree, seed=None):
+    """나무 레코드 (schema.Tree) 하나의 엔티티 배치 (seed가 있으면 variation.tree_variant 모양)"""
+    x, y = tree.position
+    variant = tree_variant(tree, seed)
+    return {
+        'kind': 'tree', 'name': tree.name, 'location': (x, y, 0),
+        'parts': tree_parts(tree.height, name=tree.name, variant=variant),
+        'materials': tree_materials(tree.name, variant.leaf_color if variant else LEAF_COLOR),
+    }
+
+
+def iter_layout(config, lods=False, cull=False):
+    """검증된 설정 (schema.SceneConfig) 의 엔티티 배치를 하나씩 내보내는 제너레이터
+
+    cull이면 건물의 가려진 면을 지움 (building_entity 참고)
+    """
+    seed = config.scene.seed
+    for building in config.buildings:
+        yield building_entity(building, lods, seed, cull)
+    for road in config.roads:
+        yield road_entity(road)
+    if config.road_network is not None:
+        yield from network_entities(config.road_network)
+    for tree in config.trees:
+        yield tree_entity(tree, seed)
+
+
+def scene_layout(config, lods=False):
+    """설정 dict (또는 SceneConfig) 전체의 엔티티 배치
+
+    Args:
+        lods: True면 건물 엔티티에 'lods' ({단계: 간략화 파트}) 추가
+
+    Returns:
+        [{'kind', 'name', 'location', 'parts', 'materials'}, ...]
+        parts는 엔티티 원점 기준, materials는 {슬롯: MaterialSpec},
+        도로처럼 회전된 엔티티는 'rotation' (XYZ 오일러, 라디안) 도 가짐
+    """
+    return list(iter_layout(normalize_config(config), lods))
+
+
+def entity_bounds(entity):
+    """scene_layout 엔티티의 월드 좌표 AABB ((min x, y, z), (max x, y, z))
+
+    회전된 파트는 크기의 대각선 절반을 반지름으로 보는 보수적 경계를 쓴다.
+    """
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+
+    for batch in entity.get('meshes', {}).values():
+        for axis in range(3):
+            coordinates = batch.vertices[axis::3]
+            if coordinates:
+                lo[axis] = min(lo[axis], min(coordinates))
+                hi[axis] = max(hi[axis], max(coordinates))
+
+    for part in entity['parts']:
+        if part.kind == 'text':
+            # 텍스트 폭은 글꼴에 따라 달라지므로 글자당 글자 크기로 어림
+            half = (part.size[0] * max(1, len(part.extra['body'])) / 2,) * 3
+        elif any(part.rotation):
+            half = (math.sqrt(sum(s * s for s in part.size)) / 2,) * 3
+        else:
+            half = tuple(s / 2 for s in part.size)
+        for axis in range(3):
+            lo[axis] = min(lo[axis], part.location[axis] - half[axis])
+            hi[axis] = max(hi[axis], part.location[axis] + half[axis])
+
+    ox, oy, oz = entity['location']
+    if lo[0] > hi[0]:
+        return (ox, oy, oz), (ox, oy, oz)
+
+    # 엔티티 Z축 회전은 로컬 경계 상자의 네 모서리를 돌려 다시 감쌈
+    yaw = entity.get('rotation', (0, 0, 0))[2]
+    cos_yaw, sin_yaw = math.cos(yaw), math.sin(yaw)
+    corners = [(x * cos_yaw - y * sin_yaw, x * sin_yaw + y * cos_yaw)
+               for x in (lo[0], hi[0]) for y in (lo[1], hi[1])]
+    return ((ox + min(c[0] for c in corners), oy + min(c[1] for c in corners), oz + lo[2]),
+            (ox + max(c[0] for c in corners), oy + max(c[1] for c in corners), oz + hi[2]))
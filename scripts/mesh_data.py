@@ -0,0 +1,237 @@
+"""bpy.ops 없이 메시 데이터를 직접 생성하는 함수들"""
+
+from array import array
+
+from .primitives import BOX_VERTICES, BOX_FACES
+from .instrument import count
+from .tessellation import segments
+
+MESH_MODE_OPS = 'ops'
+MESH_MODE_DATA = 'data'
+MESH_MODES = (MESH_MODE_OPS, MESH_MODE_DATA)
+
+# 기본 큐브의 십자형 UV 전개 (면 루프 순서, 평탄화)
+BOX_UVS = (
+    0.375, 0.0, 0.625, 0.0, 0.625, 0.25, 0.375, 0.25,
+    0.375, 0.25, 0.625, 0.25, 0.625, 0.5, 0.375, 0.5,
+    0.375, 0.5, 0.625, 0.5, 0.625, 0.75, 0.375, 0.75,
+    0.375, 0.75, 0.625, 0.75, 0.625, 1.0, 0.375, 1.0,
+    0.125, 0.5, 0.375, 0.5, 0.375, 0.75, 0.125, 0.75,
+    0.625, 0.5, 0.875, 0.5, 0.875, 0.75, 0.625, 0.75,
+)
+
+
+def check_mesh_mode(mesh_mode):
+    """지원하지 않는 생성 모드면 ValueError"""
+    if mesh_mode not in MESH_MODES:
+        raise ValueError(f"Unknown mesh_mode: {mesh_mode!r} (expected one of {MESH_MODES})")
+
+
+def new_box_mesh(name, material=None):
+    """size=1 큐브 메시 데이터 생성"""
+    import bpy
+    mesh = bpy.data.meshes.new(name)
+    count('vertices', len(BOX_VERTICES))
+    mesh.from_pydata(BOX_VERTICES, [], BOX_FACES)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set('uv', BOX_UVS)
+    mesh.update()
+    if material is not None:
+        mesh.materials.append(material)
+    return mesh
+
+
+def new_box_object(name, location, scale, material):
+    """씬에 링크하지 않은 박스 오브젝트 생성 (link_objects로 일괄 링크)"""
+    import bpy
+    obj = bpy.data.objects.new(name, new_box_mesh(name, material))
+    count('objects')
+    obj.location = location
+    obj.scale = scale
+    return obj
+
+
+def new_empty_object(name, location=(0, 0, 0)):
+    """씬에 링크하지 않은 PLAIN_AXES 엠프티 생성"""
+    import bpy
+    obj = bpy.data.objects.new(name, None)
+    count('objects')
+    obj.empty_display_type = 'PLAIN_AXES'
+    obj.location = location
+    return obj
+
+
+def link_objects(objects, collection=None):
+    """오브젝트들을 한 번에 컬렉션에 링크
+
+    Args:
+        collection: 대상 컬렉션 (None이면 현재 활성 컬렉션)
+    """
+    import bpy
+    if collection is None:
+        collection = bpy.context.collection
+    for obj in objects:
+        collection.objects.link(obj)
+
+
+def add_box(name, location, scale, material, mesh_mode=MESH_MODE_OPS):
+    """size=1 큐브를 location에 만들고 scale 적용
+
+    Args:
+        mesh_mode: 'ops'면 primitive_cube_add, 'data'면 링크되지 않은 오브젝트 반환
+    """
+    import bpy
+    if mesh_mode == MESH_MODE_DATA:
+        return new_box_object(name, location, scale, material)
+
+    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
+    count('ops')
+    count('objects')
+    count('vertices', len(BOX_VERTICES))
+    obj = bpy.context.active_object
+    obj.name = name
+    obj.scale = scale
+    obj.data.materials.append(material)
+    return obj
+
+
+def add_empty(name, location=(0, 0, 0), mesh_mode=MESH_MODE_OPS):
+    """부모용 엠프티 생성"""
+    import bpy
+    if mesh_mode == MESH_MODE_DATA:
+        return new_empty_object(name, location)
+
+    bpy.ops.object.empty_add(type='PLAIN_AXES', location=location)
+    count('ops')
+    count('objects')
+    obj = bpy.context.active_object
+    obj.name = name
+    return obj
+
+
+def collect_mesh_data(objects):
+    """오브젝트들의 메시를 부모 기준 좌표로 모아 정점/면 리스트로 반환
+
+    Returns:
+        (vertices, faces, parts) - parts는 {오브젝트 이름: [첫 면 인덱스, 면 개수]}
+    """
+    import bpy
+    vertices = []
+    faces = []
+    parts = {}
+
+    for obj in objects:
+        mesh = obj.data.copy()
+        mesh.transform(obj.matrix_parent_inverse @ obj.matrix_basis)
+
+        offset = len(vertices)
+        vertices.extend(v.co[:] for v in mesh.vertices)
+        parts[obj.name] = [len(faces), len(mesh.polygons)]
+        faces.extend([offset + i for i in poly.vertices] for poly in mesh.polygons)
+
+        bpy.data.meshes.remove(mesh)
+
+    return vertices, faces, parts
+
+
+def remove_objects(objects):
+    """오브젝트와 더 이상 쓰이지 않는 메시 데이터 삭제"""
+    import bpy
+    meshes = {obj.data for obj in objects if obj.type == 'MESH'}
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+    for mesh in meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def merge_objects(name, objects, material, parent=None):
+    """메시 오브젝트들을 머티리얼 하나짜리 오브젝트로 합침 (bpy.ops.object.join 없이)
+
+    원래 파트 이름은 커스텀 속성 "parts"에 {이름: [첫 면, 면 개수]}로 남김
+    (export_to_gltf(extras=True)로 내보내면 glTF extras에 포함됨)
+    """
+    import bpy
+    vertices, faces, parts = collect_mesh_data(objects)
+    remove_objects(objects)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], faces)
+    mesh.update()
+    mesh.materials.append(material)
+
+    merged = bpy.data.objects.new(name, mesh)
+    count('objects')
+    count('vertices', len(vertices))
+    merged["parts"] = parts
+    link_objects([merged])
+    merged.parent = parent
+    return merged
+
+
+def new_batch_object(name, batch, material, parent=None):
+    """구운 메시 (primitives.MeshBatch) 로 메시 오브젝트를 만들어 씬에 링크
+
+    from_pydata 대신 foreach_set으로 평탄 배열을 한 번에 넘긴다 (버퍼 형식을 Blender 속성
+    형식 float32 / int32에 맞춰 변환).
+    """
+    import bpy
+    num_vertices = len(batch.vertices) // 3
+    loop_starts = array('i')
+    start = 0
+    for total in batch.totals:
+        loop_starts.append(start)
+        start += total
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(num_vertices)
+    mesh.vertices.foreach_set('co', array('f', batch.vertices))
+    mesh.loops.add(len(batch.loops))
+    mesh.loops.foreach_set('vertex_index', array('i', batch.loops))
+    mesh.polygons.add(len(batch.totals))
+    mesh.polygons.foreach_set('loop_start', loop_starts)
+    mesh.polygons.foreach_set('loop_total', array('i', batch.totals))
+    mesh.update(calc_edges=True)
+    mesh.validate()
+    mesh.materials.append(material)
+
+    obj = bpy.data.objects.new(name, mesh)
+    count('objects')
+    count('vertices', num_vertices)
+    link_objects([obj])
+    obj.parent = parent
+    return obj
+
+
+def add_part(part, material, mesh_mode=MESH_MODE_OPS):
+    """layout.Part 하나를 Blender 오브젝트로 생성
+
+    mesh_mode는 box에만 적용되고, cylinder/sphere는 항상 bpy.ops로 만든다
+    (분할 수는 tessellation_policy를 따름).
+    """
+    import bpy
+    if part.kind == 'box':
+        obj = add_box(part.name, part.location, part.size, material, mesh_mode)
+        if any(part.rotation):
+            obj.rotation_euler = part.rotation
+        return obj
+
+    if part.kind == 'cylinder':
+        bpy.ops.mesh.primitive_cylinder_add(vertices=segments(part.kind, part.size), radius=part.size[0]/2,
+                                            depth=part.size[2], location=part.location)
+    elif part.kind == 'sphere':
+        n, rings = segments(part.kind, part.size)
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=n, ring_count=rings, radius=part.size[0]/2,
+                                             location=part.location)
+    else:
+        raise ValueError(f"Unsupported part kind: {part.kind!r}")
+
+    obj = bpy.context.active_object
+    count('ops')
+    count('objects')
+    count('vertices', len(obj.data.vertices))
+    obj.name = part.name
+    if any(part.rotation):
+        obj.rotation_euler = part.rotation
+    obj.data.materials.append(material)
+    return obj
@@ -0,0 +1,398 @@
+"""건물 / 나무 / 도로 바닥 영역 공간 인덱스와 배치 충돌 검사
+
+설정 레코드 (schema.SceneConfig) 만으로 엔티티마다 바닥 영역 (footprint) 을 만들고
+spatial.GridIndex에 넣어, 겹치는 쌍은 격자 칸 안에서만 비교한다 (전체 쌍 비교 없음).
+
+바닥 영역은 볼록 다각형 points를 radius만큼 부풀린 모양이다.
+
+- 건물: 지붕 (처마 포함) 사각형, radius 0
+- 직선 도로: 회전 사각형 두 개 - 'road' (노면) 와 'sidewalk' (노면 + 양쪽 인도)
+- 도로망: 구간마다 양 끝점 + radius (반폭 / 반폭 + 인도), 교차로는 중심점 + 노면 / 교차로 반경
+- 나무: 줄기 중심점 + 줄기 반지름
+
+건물은 인도까지, 나무는 노면만 피하면 된다 (가로수는 인도에 심음). 충돌로 보는
+쌍은 CONFLICT_KINDS (도로끼리는 교차로 때문에 보지 않음) 이고,
+맞닿기만 한 것은 충돌이 아니다. 설정의 scene.conflicts가 'report'면 충돌을 보고만 하고,
+'resolve'면 우선순위 (도로 > 건물 > 나무, 같은 종류는 설정에서 먼저 나온 쪽) 가 낮은
+건물 / 나무를 빼서 남은 엔티티끼리 겹치지 않게 한다.
+
+    python -m scripts.placement city.json             # 충돌 보고 (bpy 불필요)
+"""
+
+import argparse
+import math
+import sys
+import time
+from collections import namedtuple
+
+from .layout import ROOF_OVERHANG, SIDEWALK_WIDTH, TRUNK_RADIUS
+from .road_network import INTERSECTION_NAME, find_intersections, network_polylines
+from .schema import CONFLICTS_OFF, CONFLICTS_RESOLVE
+from .spatial import GridIndex, rect_distance
+
+# 좌표 비교 허용 오차 (m) - 이보다 얕게 겹치면 맞닿은 것으로 봄
+EPSILON = 1e-6
+
+# 격자 칸 크기 (m) - 일반적인 건물 한 채 정도
+CELL_SIZE = 24.0
+
+# 충돌로 보는 종류 쌍
+CONFLICT_KINDS = frozenset({
+    ('building', 'building'),
+    ('building', 'sidewalk'),
+    ('building', 'tree'),
+    ('road', 'tree'),
+    ('tree', 'tree'),
+})
+
+# 도로 하나가 여러 바닥 영역을 가지는 종류 (resolve에서 빼지 않음)
+ROAD_KINDS = ('road', 'sidewalk')
+
+# resolve에서 남길 우선순위 (작을수록 먼저 남김)
+KIND_PRIORITY = {'road': 0, 'sidewalk': 0, 'building': 1, 'tree': 2}
+
+# 보고에 이름을 보여 줄 최대 충돌 수
+REPORT_LIMIT = 10
+
+# points: 볼록 다각형 꼭짓점 ((x, y), ...) (점 하나 / 선분도 가능), radius: 부풀림 반지름,
+# index: 설정 목록 안 번호 (buildings / trees / roads / roadNetwork.roads, 교차로는 -1),
+# rect: 경계 사각형 (x0, y0, x1, y1)
+Footprint = namedtuple('Footprint', ['kind', 'name', 'index', 'points', 'radius', 'rect'])
+
+Conflict = namedtuple('Conflict', ['first', 'second'])
+
+
+def footprint(kind, name, index, points, radius=0.0):
+    """꼭짓점과 반지름으로 경계 사각형까지 채운 Footprint"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return Footprint(kind, name, index, points, radius,
+                     (min(xs) - radius, min(ys) - radius, max(xs) + radius, max(ys) + radius))
+
+
+def _oriented_rect(center, length, width, angle):
+    """center 중심, 길이 방향이 angle (라디안) 인 사각형의 네 꼭짓점 (반시계)"""
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    hx, hy = length / 2, width / 2
+    return tuple((center[0] + x * cos_a - y * sin_a, center[1] + x * sin_a + y * cos_a)
+                 for x, y in ((-hx, -hy), (hx, -hy), (hx, hy), (-hx, hy)))
+
+
+def building_footprint(building, index):
+    x, y = building.position
+    hx = (building.width + ROOF_OVERHANG) / 2
+    hy = (building.depth + ROOF_OVERHANG) / 2
+    return Footprint('building', building.name, index,
+                     ((x - hx, y - hy), (x + hx, y - hy), (x + hx, y + hy), (x - hx, y + hy)), 0.0,
+                     (x - hx, y - hy, x + hx, y + hy))
+
+
+def road_footprints(road, index):
+    """직선 도로 (layout.road_parts) 의 노면 / 노면 + 인도 회전 사각형"""
+    angle = math.radians(road.rotation)
+    yield footprint('road', road.name, index, _oriented_rect(road.position, road.length, road.width, angle))
+    yield footprint('sidewalk', road.name, index,
+                    _oriented_rect(road.position, road.length, road.width + 2 * SIDEWALK_WIDTH, angle))
+
+
+def tree_footprint(tree):
+    x, y = tree.position
+    r = TRUNK_RADIUS
+    return Footprint('tree', tree.name, tree.index, ((x, y),), r, (x - r, y - r, x + r, y + r))
+
+
+def network_footprints(network):
+    """도로망 구간마다, 교차로마다 노면 / 노면 + 인도 바닥 영역"""
+    for index, road in enumerate(network.roads):
+        for a, b in zip(road.points, road.points[1:]):
+            yield footprint('road', road.name, index, (a, b), road.width / 2)
+            yield footprint('sidewalk', road.name, index, (a, b), road.width / 2 + road.sidewalk)
+    for point, radius, surface in find_intersections(network, network_polylines(network)).values():
+        yield footprint('road', INTERSECTION_NAME, -1, (point,), surface)
+        yield footprint('sidewalk', INTERSECTION_NAME, -1, (point,), radius)
+
+
+def scene_footprints(config):
+    """설정 전체의 바닥 영역을 내보내는 제너레이터 (도로, 건물, 나무 순)"""
+    for index, road in enumerate(config.roads):
+        yield from road_footprints(road, index)
+    if config.road_network is not None:
+        yield from network_footprints(config.road_network)
+    for index, building in enumerate(config.buildings):
+        yield building_footprint(building, index)
+    for tree in config.trees:
+        yield tree_footprint(tree)
+
+
+def _axes(points):
+    """분리축 정리에 쓸 축 (다각형은 변 법선, 선분은 법선과 방향)"""
+    if len(points) == 1:
+        return ()
+    if len(points) == 2:
+        (x0, y0), (x1, y1) = points
+        return (y0 - y1, x1 - x0), (x1 - x0, y1 - y0)
+    return tuple((points[i - 1][1] - points[i][1], points[i][0] - points[i - 1][0])
+                 for i in range(len(points)))
+
+
+def _penetrates(a, b):
+    """부풀리기 전 두 볼록 껍질이 EPSILON보다 깊게 겹치는지 (점 / 선분이 다각형 안에 든 경우 포함)"""
+    axes = _axes(a) + _axes(b)
+    if not axes:
+        return False
+    for nx, ny in axes:
+        length = math.hypot(nx, ny)
+        if length == 0:
+            continue
+        pa = [(x * nx + y * ny) / length for x, y in a]
+        pb = [(x * nx + y * ny) / length for x, y in b]
+        # 구간 겹침 길이 대신 파고든 깊이 (폭 없는 점 / 선분도 안쪽이면 양수)
+        if min(max(pa) - min(pb), max(pb) - min(pa)) <= EPSILON:
+            return False
+    return True
+
+
+def _segment_distance(p0, p1, q0, q1):
+    """두 선분 사이 거리 (교차하면 0)"""
+    def point_segment(p, a, b):
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length2 = dx * dx + dy * dy
+        t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length2))
+        return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    d1, d2 = cross(q0, q1, p0), cross(q0, q1, p1)
+    d3, d4 = cross(p0, p1, q0), cross(p0, p1, q1)
+    if d1 * d2 < 0 and d3 * d4 < 0:
+        return 0.0
+    return min(point_segment(p0, q0, q1), point_segment(p1, q0, q1),
+               point_segment(q0, p0, p1), point_segment(q1, p0, p1))
+
+
+def _edges(points):
+    if len(points) <= 2:
+        return ((points[0], points[-1]),)
+    return tuple(zip(points, points[1:] + points[:1]))
+
+
+def hull_distance(a, b):
+    """두 볼록 껍질 (꼭짓점 튜플) 사이 거리 (겹치면 0)"""
+    if _penetrates(a, b):
+        return 0.0
+    return min(_segment_distance(p0, p1, q0, q1) for p0, p1 in _edges(a) for q0, q1 in _edges(b))
+
+
+def _boxes_overlap(a, b):
+    """축 정렬 사각형 (꼭짓점 0, 2가 최소 / 최대 모서리) 두 개가 EPSILON보다 깊게 겹치는지"""
+    (ax0, ay0), (ax1, ay1) = a.points[0], a.points[2]
+    (bx0, by0), (bx1, by1) = b.points[0], b.points[2]
+    return (min(ax1 - bx0, bx1 - ax0) > EPSILON and min(ay1 - by0, by1 - ay0) > EPSILON)
+
+
+def _disc_box_overlap(disc, box):
+    (x0, y0), (x1, y1) = box.points[0], box.points[2]
+    return rect_distance((x0, y0, x1, y1), disc.points[0]) < disc.radius - EPSILON
+
+
+def footprints_overlap(a, b):
+    """두 바닥 영역이 (맞닿기만 한 것 제외) 겹치는지
+
+    건물 (축 정렬 사각형) 과 나무 (점 + 반지름) 끼리는 바로 계산하고,
+    나머지는 분리축 검사 + 껍질 사이 거리로 본다.
+    """
+    kinds = (a.kind, b.kind)
+    if kinds == ('building', 'building'):
+        return _boxes_overlap(a, b)
+    if kinds == ('tree', 'tree'):
+        (ax, ay), (bx, by) = a.points[0], b.points[0]
+        return math.hypot(ax - bx, ay - by) < a.radius + b.radius - EPSILON
+    if kinds == ('building', 'tree'):
+        return _disc_box_overlap(b, a)
+    if kinds == ('tree', 'building'):
+        return _disc_box_overlap(a, b)
+
+    if _penetrates(a.points, b.points):
+        return True
+    reach = a.radius + b.radius
+    return reach > EPSILON and hull_distance(a.points, b.points) < reach - EPSILON
+
+
+def point_distance(item, point):
+    """점에서 바닥 영역 item까지 거리 (안쪽이면 0)"""
+    point = tuple(point)
+    if _penetrates((point,), item.points):
+        return 0.0
+    distance = min(_segment_distance(point, point, p0, p1) for p0, p1 in _edges(item.points))
+    return max(0.0, distance - item.radius)
+
+
+class PlacementIndex:
+    """바닥 영역의 GridIndex (key는 footprints 번호)"""
+
+    __slots__ = ('footprints', 'index')
+
+    def __init__(self, footprints, cell_size=CELL_SIZE):
+        self.footprints = list(footprints)
+        self.index = GridIndex(cell_size)
+        self.index.extend((key, item.rect) for key, item in enumerate(self.footprints))
+
+    def __len__(self):
+        return len(self.footprints)
+
+    def conflicts(self):
+        """겹치는 바닥 영역 쌍 리스트 (CONFLICT_KINDS만, 엔티티 쌍마다 하나)"""
+        footprints = self.footprints
+        result = []
+        seen = set()
+        for a, b in self.index.pairs():
+            first, second = footprints[a], footprints[b]
+            if first.kind > second.kind:
+                first, second = second, first
+            if (first.kind, second.kind) not in CONFLICT_KINDS:
+                continue
+            # 도로망 도로는 구간마다 바닥 영역이 있으므로 엔티티 쌍으로 한 번만
+            if first.kind in ROAD_KINDS or second.kind in ROAD_KINDS:
+                entities = (first[:3], second[:3])
+                if entities in seen or not footprints_overlap(first, second):
+                    continue
+                seen.add(entities)
+            elif not footprints_overlap(first, second):
+                continue
+            result.append(Conflict(first, second))
+        return result
+
+    def query(self, rect, kinds=None):
+        """rect (x0, y0, x1, y1) 와 겹치는 바닥 영역 리스트 (kinds가 있으면 그 종류만)"""
+        x0, y0, x1, y1 = rect
+        box = footprint('query', None, -1, ((x0, y0), (x1, y0), (x1, y1), (x0, y1)))
+        found = (self.footprints[key] for key in sorted(self.index.query(rect)))
+        return [item for item in found if (kinds is None or item.kind in kinds) and footprints_overlap(box, item)]
+
+    def within(self, point, radius, kinds=None):
+        """point에서 radius 안의 [(거리, 바닥 영역), ...] (가까운 순)"""
+        return self.nearest(point, k=len(self.footprints), kinds=kinds, max_distance=radius)
+
+    def nearest(self, point, k=1, kinds=None, max_distance=math.inf):
+        """point에서 가까운 바닥 영역 k개의 [(거리, 바닥 영역), ...] (가까운 순)"""
+        footprints = self.footprints
+
+        def distance(key, p):
+            item = footprints[key]
+            if kinds is not None and item.kind not in kinds:
+                return math.inf
+            return point_distance(item, p)
+
+        return [(d, footprints[key]) for d, key in self.index.nearest(point, k, max_distance, distance)]
+
+
+def resolve_conflicts(conflicts):
+    """남은 엔티티끼리 겹치지 않도록 뺄 {종류: {설정 목록 번호}} (도로는 빼지 않음)
+
+    우선순위 순 (KIND_PRIORITY, 같은 종류는 설정 순서) 으로 엔티티를 보며, 이미 남긴
+    엔티티와 충돌하면 뺀다.
+    """
+    neighbours = {}
+    for conflict in conflicts:
+        a = (conflict.first.kind, conflict.first.index)
+        b = (conflict.second.kind, conflict.second.index)
+        neighbours.setdefault(a, set()).add(b)
+        neighbours.setdefault(b, set()).add(a)
+
+    kept = set()
+    removed = {}
+    for entity in sorted(neighbours, key=lambda item: (KIND_PRIORITY[item[0]], item[1])):
+        if entity[0] not in ROAD_KINDS and neighbours[entity] & kept:
+            removed.setdefault(entity[0], set()).add(entity[1])
+        else:
+            kept.add(entity)
+    return removed
+
+
+def check_conflicts(config, resolve=False, cell_size=CELL_SIZE):
+    """설정 (schema.SceneConfig) 의 배치 충돌 검사
+
+    Returns:
+        (설정, 보고서) - resolve면 충돌한 건물 / 나무를 뺀 설정 (원래 설정은 그대로),
+        보고서는 {'footprints', 'conflicts': 충돌 수, 'pairs': {"종류/종류": 수},
+        'examples': 앞쪽 충돌 REPORT_LIMIT개의 [이름, 이름], 'removed': {'buildings': [이름],
+        'trees': [이름]}, 'seconds'}
+    """
+    start = time.perf_counter()
+    index = PlacementIndex(scene_footprints(config), cell_size)
+    conflicts = index.conflicts()
+    conflicts.sort(key=lambda c: (KIND_PRIORITY[c.first.kind], c.first.index,
+                                  KIND_PRIORITY[c.second.kind], c.second.index))
+
+    pairs = {}
+    for conflict in conflicts:
+        pair = f"{conflict.first.kind}/{conflict.second.kind}"
+        pairs[pair] = pairs.get(pair, 0) + 1
+    report = {
+        'footprints': len(index),
+        'conflicts': len(conflicts),
+        'pairs': pairs,
+        'examples': [[c.first.name, c.second.name] for c in conflicts[:REPORT_LIMIT]],
+        'removed': {'buildings': [], 'trees': []},
+    }
+
+    if resolve and conflicts:
+        removed = resolve_conflicts(conflicts)
+        dropped_buildings = removed.get('building', set())
+        dropped_trees = removed.get('tree', set())
+        buildings = [b for i, b in enumerate(config.buildings) if i not in dropped_buildings]
+        trees = [t for t in config.trees if t.index not in dropped_trees]
+        report['removed'] = {
+            'buildings': [b.name for i, b in enumerate(config.buildings) if i in dropped_buildings],
+            'trees': [t.name for t in config.trees if t.index in dropped_trees],
+        }
+        config = config.with_entities(config.scene.name, buildings, trees, config.roads, config.road_network)
+
+    report['seconds'] = round(time.perf_counter() - start, 6)
+    return config, report
+
+
+def format_report(report):
+    lines = [f"Conflicts: {report['conflicts']} among {report['footprints']} footprints "
+             f"({report['seconds']:.3f}s)"]
+    if report['pairs']:
+        lines.append("  " + ", ".join(f"{pair} {n}" for pair, n in sorted(report['pairs'].items())))
+    for first, second in report['examples']:
+        lines.append(f"  {first} <-> {second}")
+    if report['conflicts'] > len(report['examples']):
+        lines.append(f"  ... ({report['conflicts'] - len(report['examples'])} more)")
+    removed = report['removed']
+    if removed['buildings'] or removed['trees']:
+        lines.append(f"  removed {len(removed['buildings'])} buildings, {len(removed['trees'])} trees")
+    return "\n".join(lines)
+
+
+def apply_conflict_policy(config):
+    """설정의 scene.conflicts에 따라 충돌 검사 / 정리 (off면 (config, None))"""
+    mode = config.scene.conflicts
+    if mode == CONFLICTS_OFF:
+        return config, None
+    config, report = check_conflicts(config, resolve=mode == CONFLICTS_RESOLVE)
+    print(format_report(report))
+    return config, report
+
+
+def main(argv=None):
+    from .config_stream import iter_config
+    from .schema import validate_config
+    from .scenes import config_path
+
+    parser = argparse.ArgumentParser(description="설정의 건물 / 나무 / 도로 배치 충돌 검사")
+    parser.add_argument("config", help="설정 파일 (config/ 기준 이름 또는 경로, .json / .jsonl)")
+    parser.add_argument("--resolve", action="store_true", help="충돌을 정리했을 때 뺄 엔티티도 보고")
+    args = parser.parse_args(argv)
+
+    config = validate_config(iter_config(config_path(args.config)))
+    _, report = check_conflicts(config, resolve=args.resolve)
+    print(format_report(report))
+    return 1 if report['conflicts'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""bpy 없이 기본 도형 (박스, 원기둥, UV 구) 의 면을 만드는 함수들
+
+면(face)은 볼록 다각형의 꼭짓점 좌표 리스트다. 정점/면 순서는
+bpy.ops.mesh.primitive_*_add 와 같은 구성 (면 개수, 분할 수) 을 따른다.
+
+여러 도형을 미리 구운 메시는 평탄 배열 묶음 (MeshBatch) 으로 다룬다.
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+# bpy.ops.mesh.primitive_cube_add(size=1)과 같은 정점/면 순서
+BOX_VERTICES = (
+    (-0.5, -0.5, -0.5),
+    (-0.5, -0.5, 0.5),
+    (-0.5, 0.5, -0.5),
+    (-0.5, 0.5, 0.5),
+    (0.5, -0.5, -0.5),
+    (0.5, -0.5, 0.5),
+    (0.5, 0.5, -0.5),
+    (0.5, 0.5, 0.5),
+)
+BOX_FACES = (
+    (0, 1, 3, 2),
+    (2, 3, 7, 6),
+    (6, 7, 5, 4),
+    (4, 5, 1, 0),
+    (2, 6, 4, 0),
+    (7, 3, 1, 5),
+)
+
+# 구운 메시 - vertices: xyz 평탄 array('d'), loops: 면마다 정점 인덱스를 이어 붙인 array('I'),
+# totals: 면마다 꼭짓점 수 array('I') (Blender mesh.*.foreach_set에 그대로 넘길 수 있는 배열)
+MeshBatch = namedtuple('MeshBatch', ['vertices', 'loops', 'totals'])
+
+# Blender 기본 분할 수
+CYLINDER_VERTICES = 32
+SPHERE_SEGMENTS = 32
+SPHERE_RINGS = 16
+
+
+def box_faces():
+    """size=1 박스의 면 6개"""
+    return [[BOX_VERTICES[i] for i in face] for face in BOX_FACES]
+
+
+def cylinder_faces(vertices=CYLINDER_VERTICES, radius=0.5, depth=1.0):
+    """Z축 원기둥의 면 (옆면 사각형 + 위/아래 n각형 뚜껑)"""
+    ring = [(math.cos(2 * math.pi * i / vertices) * radius,
+             math.sin(2 * math.pi * i / vertices) * radius) for i in range(vertices)]
+    top = [(x, y, depth/2) for x, y in ring]
+    bottom = [(x, y, -depth/2) for x, y in ring]
+
+    faces = []
+    for i in range(vertices):
+        j = (i + 1) % vertices
+        faces.append([bottom[i], bottom[j], top[j], top[i]])
+    faces.append(top)
+    faces.append(bottom[::-1])
+    return faces
+
+
+def uv_sphere_faces(segments=SPHERE_SEGMENTS, rings=SPHERE_RINGS, radius=0.5):
+    """UV 구의 면 (극점 삼각형 + 사각형)"""
+    def point(ring, segment):
+        theta = math.pi * ring / rings
+        phi = 2 * math.pi * segment / segments
+        return (math.sin(theta) * math.cos(phi) * radius,
+                math.sin(theta) * math.sin(phi) * radius,
+                math.cos(theta) * radius)
+
+    top = (0.0, 0.0, radius)
+    bottom = (0.0, 0.0, -radius)
+
+    faces = []
+    for s in range(segments):
+        t = (s + 1) % segments
+        faces.append([top, point(1, s), point(1, t)])
+        for r in range(1, rings - 1):
+            faces.append([point(r, s), point(r + 1, s), point(r + 1, t), point(r, t)])
+        faces.append([point(rings - 1, s), bottom, point(rings - 1, t)])
+    return faces
+
+
+def primitive_faces(kind, divisions=None):
+    """파트 종류별 단위 도형 면 (크기 1 기준, 노드 스케일로 실제 크기를 맞춤)
+
+    Args:
+        divisions: 분할 수 (cylinder: 둘레 정점 수, sphere: (segments, rings), None이면 기본값)
+    """
+    if kind == 'box':
+        return box_faces()
+    if kind == 'cylinder':
+        return cylinder_faces(divisions or CYLINDER_VERTICES)
+    if kind == 'sphere':
+        return uv_sphere_faces(*(divisions or (SPHERE_SEGMENTS, SPHERE_RINGS)))
+    raise ValueError(f"Unsupported primitive kind: {kind!r}")
+
+
+def triangle_count(faces):
+    """면 목록의 삼각형 개수 (n각형 = n-2개)"""
+    return sum(len(face) - 2 for face in faces)
+
+
+def transformed_faces(faces, location=(0, 0, 0), size=(1, 1, 1), rotation=(0, 0, 0)):
+    """단위 도형 면을 크기 -> XYZ 오일러 회전 -> 이동 순서로 변환 (Blender 오브젝트 변환과 같음)"""
+    cx, cy, cz = (math.cos(a) for a in rotation)
+    sx, sy, sz = (math.sin(a) for a in rotation)
+    # R = Rz @ Ry @ Rx
+    matrix = (
+        (cy*cz, sx*sy*cz - cx*sz, cx*sy*cz + sx*sz),
+        (cy*sz, sx*sy*sz + cx*cz, cx*sy*sz - sx*cz),
+        (-sy, sx*cy, cx*cy),
+    )
+
+    def transform(point):
+        x, y, z = (p * s for p, s in zip(point, size))
+        return tuple(row[0]*x + row[1]*y + row[2]*z + offset for row, offset in zip(matrix, location))
+
+    return [[transform(point) for point in face] for face in faces]
+
+
+def faces_batch(faces):
+    """면 목록을 MeshBatch로 (좌표가 같은 정점은 공유)"""
+    vertices = array('d')
+    loops = array('I')
+    totals = array('I')
+    index = {}
+    for face in faces:
+        for point in face:
+            point = tuple(point)
+            i = index.get(point)
+            if i is None:
+                i = index[point] = len(index)
+                vertices.extend(point)
+            loops.append(i)
+        totals.append(len(face))
+    return MeshBatch(vertices, loops, totals)
+
+
+def batch_faces(batch):
+    """MeshBatch를 면 목록으로"""
+    vertices = batch.vertices
+    points = [tuple(vertices[i:i + 3]) for i in range(0, len(vertices), 3)]
+    faces = []
+    start = 0
+    for total in batch.totals:
+        faces.append([points[i] for i in batch.loops[start:start + total]])
+        start += total
+    return faces
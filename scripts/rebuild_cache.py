@@ -0,0 +1,108 @@
+"""엔티티 단위 증분 재생성 캐시
+
+건물/도로/나무 설정 하나와 생성기 코드 버전을 해시한 키로, 만들어진
+오브젝트들을 엔티티별 .blend 라이브러리에 저장해 둔다. 다음 실행에서
+키가 같은 엔티티는 다시 만들지 않고 .blend에서 불러온다.
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from .utils import OUTPUT_DIR, share_material
+from .mesh_data import link_objects
+
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".cache")
+
+_code_version = None
+
+
+def code_version():
+    """scripts 패키지 소스 전체의 해시 (코드가 바뀌면 모든 캐시 무효화)"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def entity_key(kind, entry, options=None):
+    """엔티티 종류 + 설정 + 생성 옵션 + 코드 버전의 해시"""
+    payload = json.dumps(
+        {'kind': kind, 'entry': entry, 'options': options or {}, 'code': code_version()},
+        sort_keys=True, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _entity_path(key, cache_dir):
+    return os.path.join(cache_dir, key[:2], f"{key}.blend")
+
+
+def store_entity(key, root, cache_dir=CACHE_DIR):
+    """root와 모든 자손 오브젝트 (메시, 머티리얼 포함)를 .blend로 저장"""
+    import bpy
+    path = _entity_path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    objects = {root, *root.children_recursive}
+    bpy.data.libraries.write(path, objects, fake_user=False, compress=False)
+
+
+def load_entity(key, cache_dir=CACHE_DIR):
+    """캐시된 엔티티를 씬에 불러와 루트 오브젝트 반환 (없으면 None)"""
+    import bpy
+    path = _entity_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        data_to.objects = data_from.objects
+
+    objects = [obj for obj in data_to.objects if obj is not None]
+    link_objects(objects)
+
+    # 불러온 머티리얼 복사본을 현재 머티리얼 캐시의 것으로 교체
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        for i, mat in enumerate(obj.data.materials):
+            if mat is None:
+                continue
+            shared = share_material(mat)
+            if shared is not mat:
+                obj.data.materials[i] = shared
+                if mat.users == 0:
+                    bpy.data.materials.remove(mat)
+
+    roots = [obj for obj in objects if obj.parent is None]
+    return roots[0] if roots else None
+
+
+def build_cached(kind, entry, build, options=None, cache_dir=CACHE_DIR, stats=None):
+    """캐시에 있으면 불러오고, 없으면 build()로 만든 뒤 저장
+
+    Args:
+        kind: 엔티티 종류 ('building', 'road', 'tree', ...)
+        entry: 키 계산에 쓸 설정 (JSON 직렬화 가능해야 함)
+        build: 루트 오브젝트를 반환하는 생성 함수
+        stats: {'hits': int, 'misses': int} 카운터 (선택)
+
+    Returns:
+        루트 오브젝트
+    """
+    key = entity_key(kind, entry, options)
+    root = load_entity(key, cache_dir)
+    hit = root is not None
+
+    if not hit:
+        root = build()
+        if root is not None:
+            store_entity(key, root, cache_dir)
+
+    if stats is not None:
+        stats['hits' if hit else 'misses'] += 1
+    return root
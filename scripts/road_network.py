@@ -0,0 +1,337 @@
+"""폴리라인 도로망을 도로마다 머티리얼별 메시 몇 개로 굽는 함수들
+
+설정의 roadNetwork (schema.RoadNetwork) 도로 하나는 폴리라인 하나이고, 여러 도로
+(또는 한 도로의 여러 구간) 가 지나는 노드가 교차로가 된다. 서로 다른 도로의 구간이
+노드 없이 엇갈리는 곳에는 교차점을 양쪽 폴리라인에 넣는다 (network_polylines).
+
+- 노면: 폴리라인 전체 (꺾이는 곳은 마이터 이음)
+- 중앙선 / 차선 점선 / 인도: 교차로 반경 (가장 넓은 도로의 반폭 + 인도 폭) 안에서 끊음
+- 교차로: 반경이 가장 넓은 도로 반폭인 다각형 노면 하나 (모든 교차로를 엔티티 하나에)
+
+도로 하나의 점선은 구간마다 점선 중심 / 방향을 한 번에 계산한 뒤 상자 정점과
+면 인덱스를 고정 템플릿으로 배열에 한꺼번에 붙이므로, 오브젝트 수는 점선 수가
+아닌 도로 수 (× 머티리얼 4개) 에 비례한다. 결과는 primitives.MeshBatch라서
+Blender에서는 foreach_set으로, 직접 쓰기에서는 그대로 버퍼로 옮긴다.
+
+치수는 layout.road_parts와 같다.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+
+from .primitives import MeshBatch
+from .spatial import GridIndex
+
+SURFACE_TOP = 0.0
+SURFACE_BOTTOM = -0.1
+LINE_TOP = 0.02
+CENTER_LINE_WIDTH = 0.15
+DASH_LENGTH = 2.0
+DASH_GAP = 1.0
+DASH_WIDTH = 0.1
+SIDEWALK_BOTTOM = -0.05
+SIDEWALK_TOP = 0.15
+
+# 교차로 다각형 변 수 (짝수)
+INTERSECTION_SIDES = 16
+
+# 마이터 이음 길이 상한 (오프셋의 배수) - 아주 뾰족한 꺾임에서 튀어나가지 않게
+MITER_LIMIT = 4.0
+
+# 끊긴 구간이 이보다 짧으면 만들지 않음 (m)
+MIN_PIECE = 0.05
+
+# 엇갈림 검사용 구간 격자 칸 크기 (m)
+CELL_SIZE = 50.0
+
+# 교차점이 구간 끝점과 이보다 가까우면 끝점으로 봄 (m)
+SNAP = 1e-6
+
+INTERSECTION_NAME = "Intersections"
+
+# 상자 하나 (정점 8개: 아래 R0 R1 L1 L0, 위 R0 R1 L1 L0) 의 면 5개 (바닥 제외)
+_BOX_LOOPS = (4, 5, 6, 7, 0, 1, 5, 4, 2, 3, 7, 6, 3, 0, 4, 7, 1, 2, 6, 5)
+
+
+class _MeshBuffer:
+    """사각형 / 다각형 면을 평탄 배열에 쌓는 버퍼"""
+
+    __slots__ = ('vertices', 'loops', 'totals')
+
+    def __init__(self):
+        self.vertices = array('d')
+        self.loops = array('I')
+        self.totals = array('I')
+
+    def __len__(self):
+        return len(self.totals)
+
+    def _base(self):
+        return len(self.vertices) // 3
+
+    def add_prism(self, right, left, z0, z1):
+        """오른쪽 / 왼쪽 가장자리 폴리라인 사이를 z0..z1로 세운 띠 (윗면, 양 옆면, 양 끝면)"""
+        n = len(right)
+        base = self._base()
+        for z in (z0, z1):
+            for x, y in right:
+                self.vertices.extend((x, y, z))
+            for x, y in left:
+                self.vertices.extend((x, y, z))
+
+        # 인덱스: 아래 R = base + i, 아래 L = base + n + i, 위는 + 2n
+        rb, lb, rt, lt = base, base + n, base + 2 * n, base + 3 * n
+        for i in range(n - 1):
+            self.loops.extend((rt + i, rt + i + 1, lt + i + 1, lt + i))
+            self.loops.extend((rb + i, rb + i + 1, rt + i + 1, rt + i))
+            self.loops.extend((lb + i + 1, lb + i, lt + i, lt + i + 1))
+        self.loops.extend((lb, rb, rt, lt))
+        self.loops.extend((rb + n - 1, lb + n - 1, lt + n - 1, rt + n - 1))
+        self.totals.extend([4] * (3 * (n - 1) + 2))
+
+    def add_boxes(self, centers, directions, length, width, z0, z1):
+        """방향 상자 여러 개를 한 번에 (centers: [(x, y)], directions: [(dx, dy)] 단위 벡터)"""
+        hl, hw = length / 2, width / 2
+        corners = []
+        for (cx, cy), (dx, dy) in zip(centers, directions):
+            ax, ay = dx * hl, dy * hl
+            nx, ny = -dy * hw, dx * hw
+            corners.append((cx - ax - nx, cy - ay - ny, cx + ax - nx, cy + ay - ny,
+                            cx + ax + nx, cy + ay + ny, cx - ax + nx, cy - ay + ny))
+
+        base = self._base()
+        self.vertices.extend(value
+                             for c in corners
+                             for z in (z0, z1)
+                             for value in (c[0], c[1], z, c[2], c[3], z, c[4], c[5], z, c[6], c[7], z))
+        self.loops.extend(base + 8 * k + i for k in range(len(corners)) for i in _BOX_LOOPS)
+        self.totals.extend([4] * (5 * len(corners)))
+
+    def add_polygon_prism(self, center, radius, sides, z0, z1):
+        """중심 / 반지름의 정다각형 기둥 (윗면은 사각형 부채, 옆면, 바닥 제외)"""
+        cx, cy = center
+        ring = [(cx + radius * math.cos(2 * math.pi * i / sides), cy + radius * math.sin(2 * math.pi * i / sides))
+                for i in range(sides)]
+        base = self._base()
+        for z in (z0, z1):
+            for x, y in ring:
+                self.vertices.extend((x, y, z))
+        top = base + sides
+        for i in range(1, sides - 1, 2):
+            self.loops.extend((top, top + i, top + i + 1, top + (i + 2) % sides))
+        for i in range(sides):
+            j = (i + 1) % sides
+            self.loops.extend((base + i, base + j, top + j, top + i))
+        self.totals.extend([4] * ((sides - 2) // 2 + sides))
+
+    def batch(self):
+        return MeshBatch(self.vertices, self.loops, self.totals)
+
+
+def arc_lengths(points):
+    """폴리라인 각 점까지의 누적 길이"""
+    lengths = [0.0]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        lengths.append(lengths[-1] + math.hypot(x1 - x0, y1 - y0))
+    return lengths
+
+
+def _direction(a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = math.hypot(dx, dy)
+    return dx / length, dy / length
+
+
+def offset_polyline(points, offset):
+    """왼쪽 (진행 방향 기준) 으로 offset만큼 평행 이동한 폴리라인 (마이터 이음)"""
+    directions = [_direction(a, b) for a, b in zip(points, points[1:])]
+    result = []
+    for i, (x, y) in enumerate(points):
+        before = directions[max(0, i - 1)]
+        after = directions[min(len(directions) - 1, i)]
+        nx, ny = -(before[1] + after[1]), before[0] + after[0]
+        length = math.hypot(nx, ny)
+        if length < 1e-9:
+            # 되돌아가는 꺾임 - 뒤 구간 법선을 씀
+            nx, ny, scale = -after[1], after[0], 1.0
+        else:
+            nx, ny = nx / length, ny / length
+            scale = 1.0 / max(nx * -after[1] + ny * after[0], 1.0 / MITER_LIMIT)
+        result.append((x + nx * offset * scale, y + ny * offset * scale))
+    return result
+
+
+def slice_polyline(points, lengths, start, end):
+    """누적 길이 start..end 구간의 폴리라인"""
+    def point_at(s):
+        i = min(max(bisect_right(lengths, s) - 1, 0), len(points) - 2)
+        segment = lengths[i + 1] - lengths[i]
+        t = (s - lengths[i]) / segment if segment else 0.0
+        (x0, y0), (x1, y1) = points[i], points[i + 1]
+        return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+
+    inner = [p for p, s in zip(points, lengths) if start < s < end]
+    return [point_at(start), *inner, point_at(end)]
+
+
+def dash_frames(points, lengths, start, end, offset):
+    """start..end 구간 차선 점선들의 (중심 리스트, 방향 리스트)
+
+    점선 배치는 layout.road_parts와 같다 (주기 DASH_LENGTH + DASH_GAP, 구간 시작에서 1m 띄움).
+    """
+    period = DASH_LENGTH + DASH_GAP
+    count = int((end - start) / period)
+    centers = []
+    directions = []
+    segment = 0
+    for k in range(count):
+        s = start + period * k + DASH_LENGTH / 2 + 1
+        while segment < len(points) - 2 and lengths[segment + 1] < s:
+            segment += 1
+        (x0, y0), (x1, y1) = points[segment], points[segment + 1]
+        dx, dy = _direction(points[segment], points[segment + 1])
+        t = s - lengths[segment]
+        centers.append((x0 + dx * t - dy * offset, y0 + dy * t + dx * offset))
+        directions.append((dx, dy))
+    return centers, directions
+
+
+def _node_key(point):
+    return round(point[0], 6), round(point[1], 6)
+
+
+def _crossing(p0, p1, q0, q1):
+    """두 구간이 만나면 (구간 p 매개변수, 구간 q 매개변수, 교차점), 아니면 None (평행 제외)"""
+    rx, ry = p1[0] - p0[0], p1[1] - p0[1]
+    sx, sy = q1[0] - q0[0], q1[1] - q0[1]
+    denominator = rx * sy - ry * sx
+    if abs(denominator) < 1e-12:
+        return None
+    qx, qy = q0[0] - p0[0], q0[1] - p0[1]
+    t = (qx * sy - qy * sx) / denominator
+    u = (qx * ry - qy * rx) / denominator
+    if not (-1e-9 <= t <= 1 + 1e-9 and -1e-9 <= u <= 1 + 1e-9):
+        return None
+    return t, u, (p0[0] + rx * t, p0[1] + ry * t)
+
+
+def network_polylines(network):
+    """도로마다 다른 도로와 엇갈리는 교차점을 넣은 폴리라인 리스트 (network.roads 순서)
+
+    구간 경계 상자를 GridIndex에 넣고 겹치는 구간 쌍만 검사한다.
+    """
+    segments = []
+    index = GridIndex(CELL_SIZE)
+    for r, road in enumerate(network.roads):
+        for i, (a, b) in enumerate(zip(road.points, road.points[1:])):
+            key = len(segments)
+            segments.append((r, i, a, b))
+            index.insert(key, (min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1])))
+
+    inserts = {}
+    for key, (r, i, a, b) in enumerate(segments):
+        bounds = index.rects[key]
+        for other in index.query(bounds, SNAP):
+            r2, i2, c, d = segments[other]
+            if r2 <= r:
+                continue
+            hit = _crossing(a, b, c, d)
+            if hit is None:
+                continue
+            t, u, point = hit
+            for (road, segment, start, end), param in (((r, i, a, b), t), ((r2, i2, c, d), u)):
+                length = math.hypot(end[0] - start[0], end[1] - start[1])
+                if SNAP < param * length < length - SNAP:
+                    inserts.setdefault((road, segment), []).append((param, point))
+
+    polylines = []
+    for r, road in enumerate(network.roads):
+        points = [road.points[0]]
+        for i, point in enumerate(road.points[1:]):
+            for _, crossing in sorted(inserts.get((r, i), ())):
+                if _node_key(crossing) != _node_key(points[-1]):
+                    points.append(crossing)
+            points.append(point)
+        polylines.append(points)
+    return polylines
+
+
+def find_intersections(network, polylines):
+    """{노드 좌표 키: (좌표, 반경, 노면 반지름)} - 도로 가지가 3개 이상 모이는 노드
+
+    반경은 모이는 도로 중 가장 넓은 (반폭 + 인도 폭), 노면 반지름은 가장 넓은 반폭.
+    polylines는 network_polylines 결과.
+    """
+    arms = {}
+    for road, points in zip(network.roads, polylines):
+        last = len(points) - 1
+        for i, point in enumerate(points):
+            entry = arms.setdefault(_node_key(point), [point, 0, 0.0, 0.0])
+            entry[1] += 1 if i in (0, last) else 2
+            entry[2] = max(entry[2], road.width / 2 + road.sidewalk)
+            entry[3] = max(entry[3], road.width / 2)
+    return {key: (point, radius, surface) for key, (point, count, radius, surface) in arms.items() if count >= 3}
+
+
+def marking_intervals(points, lengths, intersections):
+    """교차로 반경을 뺀 중앙선 / 점선 / 인도 구간 [(시작, 끝), ...] (누적 길이)"""
+    cuts = []
+    for point, s in zip(points, lengths):
+        node = intersections.get(_node_key(point))
+        if node is not None:
+            cuts.append((s - node[1], s + node[1]))
+
+    intervals = []
+    position = 0.0
+    for cut_start, cut_end in sorted(cuts):
+        if cut_start - position >= MIN_PIECE:
+            intervals.append((position, cut_start))
+        position = max(position, cut_end)
+    if lengths[-1] - position >= MIN_PIECE:
+        intervals.append((position, lengths[-1]))
+    return intervals
+
+
+def network_road_meshes(road, points, intersections):
+    """도로망 도로 하나의 {슬롯: MeshBatch} (월드 좌표, points는 network_polylines의 해당 도로)"""
+    lengths = arc_lengths(points)
+    half = road.width / 2
+
+    asphalt = _MeshBuffer()
+    asphalt.add_prism(offset_polyline(points, -half), offset_polyline(points, half), SURFACE_BOTTOM, SURFACE_TOP)
+
+    line = _MeshBuffer()
+    sidewalk = _MeshBuffer()
+    for start, end in marking_intervals(points, lengths, intersections):
+        piece = slice_polyline(points, lengths, start, end)
+        line.add_prism(offset_polyline(piece, -CENTER_LINE_WIDTH / 2), offset_polyline(piece, CENTER_LINE_WIDTH / 2),
+                       SURFACE_TOP, LINE_TOP)
+        for lane in (-road.width / 4, road.width / 4):
+            centers, directions = dash_frames(points, lengths, start, end, lane)
+            line.add_boxes(centers, directions, DASH_LENGTH, DASH_WIDTH, SURFACE_TOP, LINE_TOP)
+        for side in (-1, 1):
+            inner = offset_polyline(piece, side * half)
+            outer = offset_polyline(piece, side * (half + road.sidewalk))
+            right, left = (outer, inner) if side < 0 else (inner, outer)
+            sidewalk.add_prism(right, left, SIDEWALK_BOTTOM, SIDEWALK_TOP)
+
+    meshes = {'asphalt': asphalt.batch()}
+    if len(line):
+        meshes['line'] = line.batch()
+    if len(sidewalk):
+        meshes['sidewalk'] = sidewalk.batch()
+    return meshes
+
+
+def intersection_meshes(intersections):
+    """모든 교차로 노면을 담은 {'asphalt': MeshBatch} (교차로가 없으면 빈 dict)"""
+    if not intersections:
+        return {}
+    asphalt = _MeshBuffer()
+    for point, _, surface in intersections.values():
+        # 정다각형 변의 중점까지가 반폭이 되도록
+        asphalt.add_polygon_prism(point, surface / math.cos(math.pi / INTERSECTION_SIDES), INTERSECTION_SIDES,
+                                  SURFACE_BOTTOM, SURFACE_TOP)
+    return {'asphalt': asphalt.batch()}
+
@@ -2,107 +2,341 @@
 
 import os
 import json
+import math
+from dataclasses import asdict
 
-from .utils import OUTPUT_DIR, clear_scene, export_to_gltf
-from .building import create_building, create_text_on_wall, create_text_on_roof_edge, create_entrance
-from .environment import create_tree, create_road
+from .utils import OUTPUT_DIR, clear_scene, export_to_gltf, material_cache
+from .instrument import span
+from .building import (create_building, create_text_on_wall, create_text_on_roof_edge, create_entrance,
+                       merge_building, create_building_lods, create_culled_building, text_mesh_faces)
+from .environment import create_tree, create_tree_instances, create_road, create_network_road
+from .mesh_data import MESH_MODE_OPS, check_mesh_mode
+from .rebuild_cache import CACHE_DIR, build_cached
+from .layout import iter_layout, building_entity, network_entities, windows_per_floor
+from .culling import add_stats, collect_stats, empty_stats, format_stats
+from .variation import building_variant, tree_variant
+from .gltf_writer import write_scene
+from .config_stream import iter_config, collect_config
+from .schema import validate_config, normalize_config
+from .compression import COMPRESSION_DRACO, finish_export, scene_size
+from .tessellation import format_plan, plan_tessellation, tessellation_policy
+from .placement import apply_conflict_policy
+from .text_cache import text_cache_stats
 
 CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
 
+EXPORTER_BLENDER = 'blender'
+EXPORTER_DIRECT = 'direct'
+EXPORTERS = (EXPORTER_BLENDER, EXPORTER_DIRECT)
+
+
+def config_path(config_name="scene_config.json"):
+    """config/ 기준 파일 이름 또는 절대 경로를 실제 경로로"""
+    return os.path.join(CONFIG_DIR, config_name)
+
 
 def load_config(config_name="scene_config.json"):
-    """JSON 설정 파일 로드"""
-    config_path = os.path.join(CONFIG_DIR, config_name)
-    with open(config_path, 'r', encoding='utf-8') as f:
+    """설정 파일 (.json 또는 .jsonl) 전체를 dict로 로드"""
+    path = config_path(config_name)
+    if path.endswith(".jsonl"):
+        return collect_config(iter_config(path))
+    with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def create_scene_from_config(config_name="scene_config.json"):
-    """JSON 설정 파일 기반으로 씬 생성"""
-    config = load_config(config_name)
-    clear_scene()
-
-    scene_config = config.get("scene", {})
-    scene_name = scene_config.get("name", "scene")
-
-    # 건물 생성
-    for building_config in config.get("buildings", []):
-        # 입구 정보 가져오기
-        entrance = building_config.get("entrance", {})
-        entrance_width = entrance.get("width", 0) if entrance else 0
-        entrance_height = entrance.get("height", 2.5) if entrance else 2.5
-
-        building = create_building(
-            building_config.get("name", "Building"),
-            width=building_config.get("width", 10),
-            depth=building_config.get("depth", 8),
-            floor_height=building_config.get("floorHeight", 3.5),
-            num_floors=building_config.get("floors", 2),
-            wall_color=tuple(building_config.get("wallColor", [0.85, 0.82, 0.78])) + (1.0,),
-            entrance_width=entrance_width,
-            entrance_height=entrance_height
-        )
+def build_building(building, mesh_mode=MESH_MODE_OPS, merge=False, lods=False, seed=None, cull=False,
+                   cull_stats=None):
+    """건물 레코드 (schema.Building) 하나로 건물 + 텍스트 + 입구 (+ 간략화 단계) 생성
+
+    seed가 있으면 variation.building_variant로 벽 색 / 창문을 바꿈.
+    cull이면 layout에서 가려진 면을 지운 머티리얼별 메시로 만들고 (create_culled_building,
+    mesh_mode/merge 무시), cull_stats dict가 주어지면 culling 통계를 더한다.
+    """
+    variant = building_variant(building, windows_per_floor(building.width), seed)
+
+    if cull:
+        with span('cull_building'):
+            entity = building_entity(building, seed=seed, cull=True)
+        if cull_stats is not None:
+            add_stats(cull_stats, entity['cull'])
+        with span('create_building'):
+            obj = create_culled_building(entity)
+        obj.location = entity['location']
+    else:
+        obj = _build_building_parts(building, variant, mesh_mode, merge)
+
+    # 웹 뷰어용 간략화 단계
+    if lods:
+        with span('create_building_lods'):
+            create_building_lods(
+                obj,
+                width=building.width,
+                depth=building.depth,
+                floor_height=building.floor_height,
+                num_floors=building.floors,
+                wall_color=variant.wall_color,
+                entrance_width=building.entrance_width
+            )
+
+    return obj
+
 
-        # 위치 설정
-        pos = building_config.get("position", [0, 0])
-        building.location = (pos[0], pos[1], 0)
+def _build_building_parts(building, variant, mesh_mode, merge):
+    """파트 오브젝트별 건물 + 텍스트 + 입구 (merge면 머티리얼별로 합침)"""
+    entrance = building.entrance
 
-        # 텍스트 추가
-        text = building_config.get("text")
-        if text:
-            text_color = tuple(building_config.get("textColor", [0.1, 0.1, 0.1])) + (1.0,)
-            text_position = building_config.get("textPosition", "wall")
+    with span('create_building'):
+        obj = create_building(
+            building.name,
+            width=building.width,
+            depth=building.depth,
+            floor_height=building.floor_height,
+            num_floors=building.floors,
+            wall_color=variant.wall_color,
+            entrance_width=building.entrance_width,
+            entrance_height=entrance.height if entrance else 2.5,
+            mesh_mode=mesh_mode,
+            window_size=variant.window_size,
+            window_mask=variant.window_mask
+        )
+
+    # 위치 설정
+    x, y = building.position
+    obj.location = (x, y, 0)
 
-            if text_position == "roof":
+    # 텍스트 추가
+    if building.text:
+        with span('text'):
+            if building.text_position == "roof":
                 create_text_on_roof_edge(
-                    text, building,
-                    width=building_config.get("width", 10),
-                    depth=building_config.get("depth", 8),
-                    num_floors=building_config.get("floors", 2),
-                    floor_height=building_config.get("floorHeight", 3.5),
-                    text_color=text_color,
-                    text_size=building_config.get("textSize", 1.0)
+                    building.text, obj,
+                    width=building.width,
+                    depth=building.depth,
+                    num_floors=building.floors,
+                    floor_height=building.floor_height,
+                    text_color=building.text_color,
+                    text_size=building.text_size
                 )
             else:
                 create_text_on_wall(
-                    text, building,
-                    floor_num=building_config.get("textFloor", 1),
+                    building.text, obj,
+                    floor_num=building.text_floor,
                     wall_side="front",
-                    text_color=text_color
+                    text_color=building.text_color
                 )
 
-        # 입구 추가
-        entrance = building_config.get("entrance")
-        if entrance:
-            create_entrance(
-                building,
-                width=entrance.get("width", 2),
-                height=entrance.get("height", 2.5),
-                depth=building_config.get("depth", 8)
-            )
+    # 입구 추가
+    if entrance:
+        with span('create_entrance'):
+            create_entrance(obj, width=entrance.width, height=entrance.height, depth=building.depth)
 
-    # 도로 생성
-    road_config = config.get("road", {})
-    if road_config.get("enabled", True):
-        road_pos = road_config.get("position", [0, -18, 0])
-        create_road(
-            length=road_config.get("length", 40),
-            width=road_config.get("width", 8),
-            location=tuple(road_pos)
-        )
+    # 머티리얼별 메시 병합
+    if merge:
+        with span('merge_building'):
+            merge_building(obj)
+
+    return obj
 
-    # 나무 생성
-    for i, tree_config in enumerate(config.get("trees", [])):
-        pos = tree_config.get("position", [0, 0])
-        create_tree(
-            location=(pos[0], pos[1], 0),
-            height=tree_config.get("height", 4),
-            name=f"Tree_{i}"
+
+def build_road(road, instanced=False):
+    """도로 레코드 (schema.Road) 로 도로 생성"""
+    with span('create_road'):
+        return create_road(
+            length=road.length,
+            width=road.width,
+            location=road.position,
+            instanced=instanced,
+            name=road.name,
+            rotation=math.radians(road.rotation)
         )
 
+
+def build_network_road(entity):
+    """도로망 엔티티 (layout.network_entities) 하나로 도로 생성"""
+    with span('create_road'):
+        return create_network_road(entity)
+
+
+def build_tree(tree, seed=None):
+    """나무 레코드 (schema.Tree) 하나로 나무 생성"""
+    x, y = tree.position
+    with span('create_tree'):
+        return create_tree(location=(x, y, 0), height=tree.height, name=tree.name,
+                           variant=tree_variant(tree, seed))
+
+
+def build_tree_instances(trees, seed=None):
+    """나무 레코드 리스트로 (높이 구간, 모양) 별 프로토타입 공유 나무들 생성"""
+    with span('create_tree'):
+        return create_tree_instances([((tree.position[0], tree.position[1], 0), tree.height, tree_variant(tree, seed))
+                                      for tree in trees])
+
+
+def create_scene_from_config(config_name="scene_config.json", mesh_mode=MESH_MODE_OPS, merge=False,
+                             instancing=False, output_dir=OUTPUT_DIR, incremental=False, cache_dir=CACHE_DIR,
+                             exporter=EXPORTER_BLENDER, binary=False, config=None, lods=False):
+    """JSON 설정 파일 기반으로 씬 생성
+
+    설정은 먼저 schema.validate_config로 검증하므로, 잘못된 값은 Blender 작업을
+    시작하기 전에 JSON 경로와 함께 schema.ConfigError로 보고된다.
+
+    Args:
+        config_name: config/ 기준 파일 이름 또는 절대 경로 (.json 또는 .jsonl, 항목 단위로
+            읽으면서 검증된 레코드만 남기므로 원본 설정 전체를 메모리에 올리지 않음)
+        mesh_mode: 건물 생성 방식 ('ops' 또는 'data', create_building 참고)
+        merge: True면 건물마다 파트를 머티리얼별 메시로 합침 (merge_building 참고)
+        instancing: True면 나무/차선 점선을 공유 메시로 만들고
+            EXT_mesh_gpu_instancing으로 내보냄
+        output_dir: 결과 glTF를 쓸 디렉토리
+        incremental: True면 설정이 바뀌지 않은 엔티티는 cache_dir의 .blend에서
+            불러오고 바뀐 엔티티만 새로 생성 (rebuild_cache 참고)
+        exporter: 'blender'면 Blender 오브젝트를 만들고 bpy.ops.export_scene.gltf로 내보냄,
+            'direct'면 layout 결과를 gltf_writer로 바로 씀 (텍스트만 Blender로 테셀레이션,
+            mesh_mode/merge/instancing/incremental은 무시)
+        binary: True면 .gltf + .bin 대신 .glb 하나로 저장
+        config: 이미 읽은 설정 dict 또는 schema.SceneConfig (주어지면 config_name 파일을 읽지 않음)
+        lods: True면 건물마다 간략화 단계 노드 (LOD0~2) 를 함께 내보냄
+            (create_building_lods 참고)
+
+    원기둥/구 분할 수는 설정의 scene.tessellation ({"tolerance": m, "budget": 삼각형 수},
+    tessellation 모듈 참고), 양자화 / 압축은 설정의 scene.export ({"quantize": bool, "compression": "none" | "draco" |
+    "meshopt"}) 를 따른다 (compression 모듈 참고). scene.export.cull이 true면 건물마다
+    가려진 면을 지우고 같은 평면 사각형을 합친다 (culling 모듈 참고). scene.conflicts가
+    'report'면 건물 / 나무 / 도로 바닥 영역이 겹치는 곳을 보고하고, 'resolve'면 겹친
+    건물 / 나무를 빼고 생성한다 (placement 모듈 참고).
+
+    Returns:
+        실행 통계 dict ('scene', 'output', 'materials': 머티리얼 캐시 hits/misses,
+        'entities': 증분 캐시 hits/misses, 'text': 텍스트 캐시 통계 (프로세스 누적),
+        'reset': clear_scene 결과, 'bytes': 내보낸 파일 크기 합계,
+        'triangles': 분할 정책 적용 전/후 삼각형 수 (plan_tessellation, 정책이 없으면 None),
+        'culling': 건물 면 제거 통계 (culling.cull_parts 합계, 증분 캐시에서 불러온 건물 제외,
+        cull이 꺼져 있으면 None), 'conflicts': 배치 충돌 보고서 (placement.check_conflicts,
+        scene.conflicts가 off면 None), direct면 'export': gltf_writer 통계)
+    """
+    check_mesh_mode(mesh_mode)
+    if exporter not in EXPORTERS:
+        raise ValueError(f"Unknown exporter: {exporter!r} (expected one of {EXPORTERS})")
+
+    # 설정을 끝까지 읽으며 검증해 레코드로 (bpy 작업 전에 ConfigError, 스트림에서는 원본 dict를 남기지 않음)
+    with span('validate_config'):
+        if config is None:
+            config = validate_config(iter_config(config_path(config_name)))
+        else:
+            config = normalize_config(config)
+    with span('check_conflicts'):
+        config, conflicts = apply_conflict_policy(config)
+    scene_name = config.scene.name
+    export = config.scene.export
+    if exporter == EXPORTER_DIRECT and export.compression == COMPRESSION_DRACO:
+        raise ValueError("draco compression needs the blender exporter (use 'meshopt' with exporter='direct')")
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"{scene_name}.{'glb' if binary else 'gltf'}")
+
+    # 원기둥/구 분할 수 (설정 scene.tessellation이 있을 때만, 없으면 Blender 기본)
+    triangles = None
+    if config.scene.tessellation.enabled:
+        with span('plan_tessellation'):
+            triangles = plan_tessellation(iter_layout(config, lods=lods), config.scene.tessellation.tolerance,
+                                          config.scene.tessellation.budget)
+        print(format_plan(triangles))
+    tolerance = triangles['tolerance'] if triangles else None
+    culling = empty_stats() if export.cull else None
+
+    # 직접 쓰기: Blender 오브젝트 없이 layout -> glTF
+    if exporter == EXPORTER_DIRECT:
+        with span('write_scene'), tessellation_policy(tolerance):
+            entities = iter_layout(config, lods=lods, cull=export.cull)
+            if culling is not None:
+                entities = collect_stats(entities, culling)
+            stats = write_scene(entities, output_file, text_mesher=text_mesh_faces, quantize=export.quantize)
+        if culling is not None:
+            # 구운 메시는 공유 도형보다 버퍼를 키우므로 삼각형 수와 함께 버퍼 크기도 보여 줌
+            print(f"{format_stats(culling)}, buffer {stats['bytes']} bytes")
+        with span('compress'):
+            finish_export(output_file, export, quantized=True)
+        print(f"Exported to: {output_file}")
+        return {'scene': scene_name, 'output': output_file, 'export': stats, 'bytes': scene_size(output_file),
+                'triangles': triangles, 'culling': culling, 'conflicts': conflicts}
+
+    with span('clear_scene'):
+        reset = clear_scene()
+    print(f"Scene reset: {reset['total']} blocks freed in {reset['seconds']:.3f}s")
+
+    entities = {'hits': 0, 'misses': 0}
+    seed = config.scene.seed
+    options = {'mesh_mode': mesh_mode, 'merge': merge, 'instancing': instancing, 'lods': lods, 'seed': seed,
+               'cull': export.cull, 'tolerance': tolerance}
+
+    def build_entity(kind, name, entry, build):
+        with span(f"entity:{kind}", name=name):
+            if not incremental:
+                return build()
+            return build_cached(kind, entry, build, options, cache_dir, entities)
+
+    # 실행 동안 같은 파라미터의 머티리얼 공유
+    with material_cache() as materials, tessellation_policy(tolerance):
+        # 건물 생성 (위치는 캐시 키에서 빼고 불러온 뒤 다시 지정)
+        for building in config.buildings:
+            entry = asdict(building)
+            del entry['position']
+            obj = build_entity('building', building.name, entry, lambda: build_building(
+                building, mesh_mode=mesh_mode, merge=merge, lods=lods, seed=seed, cull=export.cull,
+                cull_stats=culling))
+            x, y = building.position
+            obj.location = (x, y, 0)
+
+        # 도로 생성
+        for road in config.roads:
+            build_entity('road', road.name, asdict(road), lambda: build_road(road, instanced=instancing))
+
+        # 도로망 (교차로가 도로끼리 얽히므로 캐시 키에는 도로망 전체를 넣음)
+        if config.road_network is not None:
+            network = asdict(config.road_network)
+            for entity in network_entities(config.road_network):
+                build_entity('road', entity['name'], {'network': network, 'name': entity['name']},
+                             lambda: build_network_road(entity))
+
+        # 나무 생성
+        if instancing:
+            entry = [[tree.position, tree.height] for tree in config.trees]
+            build_entity('trees', 'trees', entry, lambda: build_tree_instances(config.trees, seed))
+        else:
+            for tree in config.trees:
+                entry = {'index': tree.index, 'height': tree.height}
+                obj = build_entity('tree', tree.name, entry, lambda: build_tree(tree, seed))
+                x, y = tree.position
+                obj.location = (x, y, 0)
+
+    print(f"Material cache: {materials['hits']} hits, {materials['misses']} misses")
+    text = text_cache_stats()
+    print(f"Text cache: {text['text_hits']} hits, {text['text_misses']} misses, "
+          f"{text['tessellations']} tessellations")
+    if incremental:
+        print(f"Entity cache: {entities['hits']} hits, {entities['misses']} misses")
+    if culling is not None:
+        print(format_stats(culling))
+
     # 내보내기
-    output_file = os.path.join(OUTPUT_DIR, f"{scene_name}.gltf")
-    export_to_gltf(output_file)
+    with span('export_to_gltf'):
+        export_to_gltf(output_file, export_format='GLB' if binary else 'GLTF_SEPARATE',
+                       extras=merge or lods, gpu_instances=instancing,
+                       draco=export.compression == COMPRESSION_DRACO)
+    with span('compress'):
+        finish_export(output_file, export)
+
+    return {
+        'scene': scene_name,
+        'output': output_file,
+        'materials': {'hits': materials['hits'], 'misses': materials['misses']},
+        'entities': entities,
+        'text': text,
+        'reset': reset,
+        'bytes': scene_size(output_file),
+        'triangles': triangles,
+        'culling': culling,
+        'conflicts': conflicts,
+    }
 
 
 def create_combined_scene():
@@ -0,0 +1,522 @@
+"""씬 설정 검증 + 정규화
+
+JSON 설정 (또는 config_stream의 (섹션, 값) 흐름) 을 기본값이 모두 채워진
+타입 있는 레코드로 바꾼다. 잘못된 값은 bpy 작업을 시작하기 전에 JSON 경로
+(예: $.buildings[3].floors) 와 함께 ConfigError로 한꺼번에 보고한다.
+
+항목별 검사는 필드 표 (_Field) 를 레코드 종류마다 한 번 '컴파일'한 함수로
+하므로, 항목 하나에 dict 조회와 타입 검사 몇 번만 든다 (10만 항목 1초 안팎).
+
+    config = validate_config(config_sections(raw))
+    for building in config.buildings:
+        building.floors, building.wall_color, ...
+"""
+
+from dataclasses import dataclass, field, replace
+
+from .config_stream import EMPTY_SECTION, config_sections
+
+# 한 번에 보고할 최대 오류 수 (넘으면 나머지는 생략)
+MAX_ERRORS = 50
+
+TEXT_POSITIONS = ("wall", "roof")
+
+# scene.export.compression 값 (compression 모듈 참고)
+COMPRESSIONS = ("none", "draco", "meshopt")
+
+# scene.conflicts 값 (placement 모듈 참고)
+CONFLICTS_OFF = "off"
+CONFLICTS_REPORT = "report"
+CONFLICTS_RESOLVE = "resolve"
+CONFLICT_MODES = (CONFLICTS_OFF, CONFLICTS_REPORT, CONFLICTS_RESOLVE)
+
+
+class ConfigError(ValueError):
+    """설정 검증 실패 (errors: [(JSON 경로, 메시지), ...])"""
+
+    def __init__(self, errors, truncated=False):
+        self.errors = list(errors)
+        count = f"{len(self.errors)} error" + ("" if len(self.errors) == 1 else "s")
+        lines = [f"{path}: {message}" for path, message in self.errors]
+        if truncated:
+            lines.append(f"... (stopped after {count})")
+        super().__init__(f"Invalid scene config ({count}):\n  " + "\n  ".join(lines))
+
+
+@dataclass(slots=True)
+class Entrance:
+    width: float = 2.0
+    height: float = 2.5
+
+
+@dataclass(slots=True)
+class Building:
+    name: str = "Building"
+    position: tuple = (0.0, 0.0)
+    width: float = 10.0
+    depth: float = 8.0
+    floor_height: float = 3.5
+    floors: int = 2
+    wall_color: tuple = (0.85, 0.82, 0.78, 1.0)
+    text: str = None
+    text_color: tuple = (0.1, 0.1, 0.1, 1.0)
+    text_position: str = "wall"
+    text_size: float = 1.0
+    text_floor: int = 1
+    entrance: Entrance = None
+    type: str = None
+
+    @property
+    def entrance_width(self):
+        """벽에 뚫을 입구 폭 (입구가 없으면 0)"""
+        return self.entrance.width if self.entrance else 0
+
+
+@dataclass(slots=True)
+class Tree:
+    index: int = 0
+    position: tuple = (0.0, 0.0)
+    height: float = 4.0
+
+    @property
+    def name(self):
+        return f"Tree_{self.index}"
+
+
+@dataclass(slots=True)
+class Road:
+    name: str = "Road"
+    position: tuple = (0.0, -18.0, 0.0)
+    length: float = 40.0
+    width: float = 8.0
+    rotation: float = 0.0
+    enabled: bool = True
+
+
+@dataclass(slots=True)
+class NetworkRoad:
+    name: str = "Street"
+    points: tuple = ()      # ((x, y), ...) - 노드 이름은 좌표로 바꿔 둠
+    width: float = 8.0
+    sidewalk: float = 2.0
+
+
+@dataclass(slots=True)
+class RoadNetwork:
+    """폴리라인 도로망 (nodes: {이름: (x, y)}, 노드를 여러 도로가 지나면 교차로)"""
+    nodes: dict = field(default_factory=dict)
+    roads: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ExportOptions:
+    quantize: bool = False
+    compression: str = "none"
+    cull: bool = False
+
+
+@dataclass(slots=True)
+class Tessellation:
+    tolerance: float = None
+    budget: int = None
+
+    @property
+    def enabled(self):
+        return self.tolerance is not None or self.budget is not None
+
+
+@dataclass(slots=True)
+class Scene:
+    name: str = "scene"
+    seed: int = None
+    ground: dict = None
+    conflicts: str = CONFLICTS_OFF
+    export: ExportOptions = field(default_factory=ExportOptions)
+    tessellation: Tessellation = field(default_factory=Tessellation)
+
+
+@dataclass(slots=True)
+class SceneConfig:
+    """검증된 설정 전체 (roads는 'road'/'roads'를 정리한 활성 도로만, road_network는 없으면 None)"""
+    scene: Scene = field(default_factory=Scene)
+    buildings: list = field(default_factory=list)
+    trees: list = field(default_factory=list)
+    roads: list = field(default_factory=list)
+    road_network: RoadNetwork = None
+
+    def with_entities(self, name, buildings=(), trees=(), roads=(), road_network=None):
+        """같은 씬 설정에 이름과 엔티티만 바꾼 SceneConfig (타일 분할 등)"""
+        return SceneConfig(replace(self.scene, name=name), list(buildings), list(trees), list(roads),
+                           road_network)
+
+
+_SEQUENCES = (list, tuple)
+
+
+class _Invalid(Exception):
+    """필드 검사 하나의 실패 (메시지만 담고, 경로는 호출한 쪽이 붙임)"""
+
+
+# 필드 검사 함수: 값 -> 정규화된 값 (잘못되면 _Invalid)
+
+def _is_number(value):
+    # bool은 int의 하위 타입이므로 type으로 비교, inf/nan은 v - v가 0이 아님
+    kind = type(value)
+    return kind is int or (kind is float and value - value == 0)
+
+
+def number(value):
+    if not _is_number(value):
+        raise _Invalid(f"expected a number, got {value!r}")
+    return value
+
+
+def positive(value):
+    if not _is_number(value) or value <= 0:
+        raise _Invalid(f"expected a positive number, got {value!r}")
+    return value
+
+
+def integer(value):
+    if type(value) is not int:
+        raise _Invalid(f"expected an integer, got {value!r}")
+    return value
+
+
+def positive_int(value):
+    if _is_number(value) and value >= 1 and value == int(value):
+        return int(value)
+    raise _Invalid(f"expected a positive integer, got {value!r}")
+
+
+def string(value):
+    if not isinstance(value, str):
+        raise _Invalid(f"expected a string, got {value!r}")
+    return value
+
+
+def optional_string(value):
+    return None if value is None or value == "" else string(value)
+
+
+def boolean(value):
+    if not isinstance(value, bool):
+        raise _Invalid(f"expected true or false, got {value!r}")
+    return value
+
+
+def one_of(choices):
+    def check(value):
+        if value not in choices:
+            raise _Invalid(f"expected one of {choices}, got {value!r}")
+        return value
+    return check
+
+
+def vector(*lengths):
+    """숫자 배열 (길이가 lengths 중 하나, 짧으면 0으로 채워 최대 길이로)"""
+    size = max(lengths)
+    padding = {n: (0,) * (size - n) for n in lengths}
+
+    def check(value):
+        if type(value) in _SEQUENCES and len(value) in padding:
+            for v in value:
+                if not _is_number(v):
+                    break
+            else:
+                return tuple(value) + padding[len(value)]
+        raise _Invalid(f"expected {' or '.join(map(str, lengths))} numbers, got {value!r}")
+    return check
+
+
+def color(value):
+    """[r, g, b] (0-1) -> (r, g, b, 1.0)"""
+    if type(value) in _SEQUENCES and len(value) == 3:
+        r, g, b = value
+        if _is_number(r) and _is_number(g) and _is_number(b) and 0 <= r <= 1 and 0 <= g <= 1 and 0 <= b <= 1:
+            return (r, g, b, 1.0)
+    raise _Invalid(f"expected [r, g, b] with components in 0-1, got {value!r}")
+
+
+def obj(value):
+    if not isinstance(value, dict):
+        raise _Invalid(f"expected an object, got {value!r}")
+    return value
+
+
+def sequence(value):
+    if type(value) not in _SEQUENCES:
+        raise _Invalid(f"expected an array, got {value!r}")
+    return value
+
+
+@dataclass(slots=True)
+class _Field:
+    key: str        # JSON 키
+    attr: str       # 레코드 속성
+    check: object   # 검사 함수
+
+
+def _compile(cls, fields):
+    """필드 표를 (raw dict, 경로, 오류 목록) -> 레코드 함수로
+
+    없는 키는 레코드의 기본값, 모르는 키는 오류 (오타로 기본값이 쓰이는 것을 막음).
+    """
+    by_key = {f.key: f for f in fields}
+
+    def validate(raw, path, errors, **preset):
+        if not isinstance(raw, dict):
+            errors.append((path, f"expected an object, got {raw!r}"))
+            return None
+        values = dict(preset)
+        ok = True
+        for key, value in raw.items():
+            spec = by_key.get(key)
+            if spec is None:
+                errors.append((f"{path}.{key}", "unknown key"))
+                ok = False
+                continue
+            try:
+                values[spec.attr] = spec.check(value)
+            except _Invalid as e:
+                errors.append((f"{path}.{key}", str(e)))
+                ok = False
+        return cls(**values) if ok else None
+
+    return validate
+
+
+_entrance = _compile(Entrance, [
+    _Field("width", "width", positive),
+    _Field("height", "height", positive),
+])
+
+
+def _entrance_field(value):
+    # 빈 값 / false 는 입구 없음
+    if not value:
+        return None
+    if not isinstance(value, dict):
+        raise _Invalid(f"expected an object, got {value!r}")
+    return value
+
+
+_building = _compile(Building, [
+    _Field("name", "name", string),
+    _Field("type", "type", string),
+    _Field("position", "position", vector(2, 3)),
+    _Field("width", "width", positive),
+    _Field("depth", "depth", positive),
+    _Field("floorHeight", "floor_height", positive),
+    _Field("floors", "floors", positive_int),
+    _Field("wallColor", "wall_color", color),
+    _Field("text", "text", optional_string),
+    _Field("textColor", "text_color", color),
+    _Field("textPosition", "text_position", one_of(TEXT_POSITIONS)),
+    _Field("textSize", "text_size", positive),
+    _Field("textFloor", "text_floor", positive_int),
+    _Field("entrance", "entrance", _entrance_field),
+])
+
+_tree = _compile(Tree, [
+    _Field("position", "position", vector(2, 3)),
+    _Field("height", "height", positive),
+])
+
+_road = _compile(Road, [
+    _Field("name", "name", string),
+    _Field("position", "position", vector(2, 3)),
+    _Field("length", "length", positive),
+    _Field("width", "width", positive),
+    _Field("rotation", "rotation", number),
+    _Field("enabled", "enabled", boolean),
+])
+
+_network_road = _compile(NetworkRoad, [
+    _Field("name", "name", string),
+    _Field("points", "points", sequence),
+    _Field("width", "width", positive),
+    _Field("sidewalk", "sidewalk", positive),
+])
+
+_road_network = _compile(RoadNetwork, [
+    _Field("nodes", "nodes", obj),
+    _Field("roads", "roads", sequence),
+])
+
+_export = _compile(ExportOptions, [
+    _Field("quantize", "quantize", boolean),
+    _Field("compression", "compression", one_of(COMPRESSIONS)),
+    _Field("cull", "cull", boolean),
+])
+
+_tessellation = _compile(Tessellation, [
+    _Field("tolerance", "tolerance", positive),
+    _Field("budget", "budget", positive_int),
+])
+
+_scene = _compile(Scene, [
+    _Field("name", "name", string),
+    _Field("seed", "seed", integer),
+    _Field("ground", "ground", obj),
+    _Field("conflicts", "conflicts", one_of(CONFLICT_MODES)),
+    _Field("export", "export", obj),
+    _Field("tessellation", "tessellation", obj),
+])
+
+
+def validate_scene(raw, path, errors):
+    scene = _scene(raw, path, errors)
+    if scene is None:
+        return None
+    if isinstance(scene.export, dict):
+        scene.export = _export(scene.export, f"{path}.export", errors)
+        if scene.export is None:
+            return None
+    if isinstance(scene.tessellation, dict):
+        scene.tessellation = _tessellation(scene.tessellation, f"{path}.tessellation", errors)
+        if scene.tessellation is None:
+            return None
+    return scene
+
+
+def validate_road_network(raw, path, errors):
+    """도로망 검증 (도로 points의 노드 이름은 nodes 좌표로 바꿈)"""
+    network = _road_network(raw, path, errors)
+    if network is None:
+        return None
+
+    point = vector(2)
+    nodes = {}
+    for name, value in network.nodes.items():
+        try:
+            nodes[name] = point(value)
+        except _Invalid as e:
+            errors.append((f"{path}.nodes.{name}", str(e)))
+    network.nodes = nodes
+
+    roads = []
+    for index, raw_road in enumerate(network.roads):
+        road_path = f"{path}.roads[{index}]"
+        road = _network_road(raw_road, road_path, errors, name=f"Street_{index}")
+        if road is None:
+            continue
+        if len(road.points) < 2:
+            errors.append((f"{road_path}.points", f"expected at least 2 points, got {len(road.points)}"))
+            continue
+        points = []
+        for i, value in enumerate(road.points):
+            try:
+                if isinstance(value, str):
+                    if value not in nodes:
+                        raise _Invalid(f"unknown node {value!r}")
+                    position = nodes[value]
+                else:
+                    position = point(value)
+                if points and position == points[-1]:
+                    raise _Invalid("repeats the previous point")
+            except _Invalid as e:
+                errors.append((f"{road_path}.points[{i}]", str(e)))
+                continue
+            points.append(position)
+        road.points = tuple(points)
+        roads.append(road)
+    network.roads = roads
+    return network
+
+
+def validate_building(raw, path, errors):
+    """건물 하나 검증 (필드 사이 제약 포함)"""
+    building = _building(raw, path, errors)
+    if building is None:
+        return None
+
+    building.position = building.position[:2]
+    if building.entrance is not None:
+        entrance = _entrance(building.entrance, f"{path}.entrance", errors)
+        if entrance is None:
+            return None
+        building.entrance = entrance
+        if entrance.width >= building.width:
+            errors.append((f"{path}.entrance.width",
+                           f"entrance width {entrance.width} must be less than building width {building.width}"))
+            return None
+        if entrance.height >= building.floor_height * building.floors:
+            errors.append((f"{path}.entrance.height",
+                           f"entrance height {entrance.height} must be less than building height "
+                           f"{building.floor_height * building.floors}"))
+            return None
+    if building.text and building.text_floor > building.floors:
+        errors.append((f"{path}.textFloor",
+                       f"textFloor {building.text_floor} is above the top floor ({building.floors})"))
+        return None
+    return building
+
+
+def validate_config(sections):
+    """(섹션, 값) 흐름을 검증해 SceneConfig로 (오류가 있으면 전부 모아 ConfigError)
+
+    흐름 하나를 끝까지 읽으므로 config_stream.iter_config의 결과를 바로 넘기면
+    원본 dict를 만들지 않고 레코드만 남는다.
+    """
+    config = SceneConfig()
+    errors = []
+    counts = {}
+    road = None
+    roads = None
+
+    for section, value in sections:
+        if len(errors) >= MAX_ERRORS:
+            raise ConfigError(errors[:MAX_ERRORS], truncated=True)
+
+        if value is EMPTY_SECTION:
+            # 명시적인 빈 배열: 원소는 없지만 섹션은 있었음
+            if section == "roads" and roads is None:
+                roads = []
+            continue
+
+        index = counts.get(section, 0)
+        counts[section] = index + 1
+
+        if section == "buildings":
+            building = validate_building(value, f"$.buildings[{index}]", errors)
+            if building is not None:
+                config.buildings.append(building)
+        elif section == "trees":
+            tree = _tree(value, f"$.trees[{index}]", errors, index=index)
+            if tree is not None:
+                tree.position = tree.position[:2]
+                config.trees.append(tree)
+        elif section == "roads":
+            if roads is None:
+                roads = []
+            roads.append(_road(value, f"$.roads[{index}]", errors, name=f"Road_{index}"))
+        elif section == "road":
+            road = _road(value, "$.road", errors)
+        elif section == "roadNetwork":
+            config.road_network = validate_road_network(value, "$.roadNetwork", errors)
+        elif section == "scene":
+            scene = validate_scene(value, "$.scene", errors)
+            if scene is not None:
+                config.scene = scene
+        else:
+            errors.append((f"$.{section}", "unknown key"))
+
+    if errors:
+        raise ConfigError(errors[:MAX_ERRORS], truncated=len(errors) > MAX_ERRORS)
+
+    # 'roads'가 있으면 그 도로들, 없으면 'road' 하나 (둘 다 없으면 도로망이 없을 때만 기본 도로)
+    if roads is None:
+        if road is not None:
+            roads = [road]
+        else:
+            roads = [] if config.road_network is not None else [Road()]
+    config.roads = [r for r in roads if r.enabled]
+    return config
+
+
+def normalize_config(config):
+    """설정 dict / SceneConfig를 SceneConfig로 (이미 검증된 것은 그대로)"""
+    if isinstance(config, SceneConfig):
+        return config
+    return validate_config(config_sections(config))
@@ -0,0 +1,171 @@
+"""2D 균일 격자 공간 인덱스
+
+축 정렬 사각형 (x0, y0, x1, y1) 을 cell_size 칸에 걸쳐 등록해 두고, 겹침
+질의는 질의 사각형이 걸친 칸만 본다. 사각형 크기가 칸 크기와 비슷하면
+삽입/질의가 항목 수와 무관하게 거의 상수 시간이다.
+
+- query / overlaps: 사각형 범위 질의
+- pairs: 서로 겹치는 항목 쌍 전체 (칸마다 안에서만 비교, 전체 쌍 비교 없음)
+- nearest: 점에서 가까운 항목 k개 (가운데 칸부터 고리 모양으로 넓혀 감)
+"""
+
+import math
+
+
+def rect_distance(rect, point):
+    """점에서 사각형까지 거리 (안쪽이면 0)"""
+    dx = max(rect[0] - point[0], 0.0, point[0] - rect[2])
+    dy = max(rect[1] - point[1], 0.0, point[1] - rect[3])
+    return math.hypot(dx, dy)
+
+
+def rects_overlap(a, b, margin=0.0):
+    """두 사각형이 margin보다 가깝게 겹치는지 (맞닿기만 하면 겹치지 않음)"""
+    return (a[0] < b[2] + margin and b[0] < a[2] + margin and
+            a[1] < b[3] + margin and b[1] < a[3] + margin)
+
+
+class GridIndex:
+    """사각형 항목의 균일 격자 인덱스"""
+
+    __slots__ = ('cell_size', 'cells', 'rects')
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (range(math.floor(rect[0] / size), math.floor(rect[2] / size) + 1),
+                range(math.floor(rect[1] / size), math.floor(rect[3] / size) + 1))
+
+    def insert(self, key, rect):
+        """key 항목을 사각형 rect로 등록 (같은 key를 다시 넣으면 안 됨)"""
+        self.rects[key] = rect
+        cells = self.cells
+        xs, ys = self._cell_range(rect)
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [key]
+                else:
+                    bucket.append(key)
+
+    def extend(self, items):
+        """(key, rect) 여러 개를 등록 (insert를 반복하는 것과 같고 더 빠름)"""
+        size = self.cell_size
+        cells = self.cells
+        rects = self.rects
+        floor = math.floor
+        for key, rect in items:
+            rects[key] = rect
+            x0, y0, x1, y1 = floor(rect[0] / size), floor(rect[1] / size), floor(rect[2] / size), floor(rect[3] / size)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [key]
+                    else:
+                        bucket.append(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key)
+        xs, ys = self._cell_range(rect)
+        for cx in xs:
+            for cy in ys:
+                bucket = self.cells[(cx, cy)]
+                bucket.remove(key)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def query(self, rect, margin=0.0):
+        """rect와 margin 안으로 겹치는 항목 key 집합"""
+        grown = (rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin)
+        xs, ys = self._cell_range(grown)
+        found = set()
+        for cx in xs:
+            for cy in ys:
+                for key in self.cells.get((cx, cy), ()):
+                    if key not in found and rects_overlap(rect, self.rects[key], margin):
+                        found.add(key)
+        return found
+
+    def overlaps(self, rect, margin=0.0):
+        """rect와 겹치는 항목이 하나라도 있는지 (query보다 빠름)"""
+        grown = (rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin)
+        xs, ys = self._cell_range(grown)
+        for cx in xs:
+            for cy in ys:
+                for key in self.cells.get((cx, cy), ()):
+                    if rects_overlap(rect, self.rects[key], margin):
+                        return True
+        return False
+
+    def pairs(self):
+        """사각형이 겹치는 (맞닿기만 한 것 제외) 항목 쌍 (key, key) 을 한 번씩 내보내는 제너레이터
+
+        두 사각형이 여러 칸을 함께 걸쳐도, 겹친 영역의 최소 모서리가 든 칸에서만 내보낸다.
+        """
+        size = self.cell_size
+        rects = self.rects
+        floor = math.floor
+        for (cx, cy), bucket in self.cells.items():
+            count = len(bucket)
+            if count < 2:
+                continue
+            for i in range(count - 1):
+                a = bucket[i]
+                a0, a1, a2, a3 = rects[a]
+                for j in range(i + 1, count):
+                    b = bucket[j]
+                    b0, b1, b2, b3 = rects[b]
+                    if (a0 < b2 and b0 < a2 and a1 < b3 and b1 < a3 and
+                            floor(max(a0, b0) / size) == cx and floor(max(a1, b1) / size) == cy):
+                        yield a, b
+
+    def nearest(self, point, k=1, max_distance=math.inf, distance=None):
+        """point에서 가까운 항목 k개의 [(거리, key), ...] (가까운 순, max_distance 이하만)
+
+        Args:
+            distance: distance(key, point) - 항목까지의 정확한 거리 (사각형까지 거리보다
+                작으면 안 됨, inf를 돌려주면 후보에서 뺌), None이면 사각형까지 거리
+        """
+        if not self.rects or k < 1:
+            return []
+        size = self.cell_size
+        cx, cy = math.floor(point[0] / size), math.floor(point[1] / size)
+        seen = set()
+        found = []
+        ring = 0
+        while True:
+            for gx in range(cx - ring, cx + ring + 1):
+                # 고리 테두리 칸만 (위/아래 줄은 전체, 가운데 줄은 양 끝)
+                step = 1 if gx in (cx - ring, cx + ring) else 2 * ring or 1
+                for gy in range(cy - ring, cy + ring + 1, step):
+                    for key in self.cells.get((gx, gy), ()):
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        d = (rect_distance(self.rects[key], point) if distance is None
+                             else distance(key, point))
+                        if d <= max_distance:
+                            found.append((d, key))
+            found.sort(key=lambda item: item[0])
+            del found[k:]
+            # 아직 안 본 항목은 모두 ring × 칸 크기보다 멀다
+            bound = ring * size
+            if len(found) == k and found[-1][0] <= bound:
+                break
+            if bound > max_distance:
+                break
+            if len(seen) == len(self.rects):
+                break
+            ring += 1
+        return found
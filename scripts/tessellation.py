@@ -0,0 +1,138 @@
+"""원기둥 / 구의 분할 수를 실제 크기와 씬 삼각형 예산으로 정하는 정책
+
+Blender 기본값 (원기둥 32각, UV 구 32×16) 은 반지름 2cm 문 손잡이에도 그대로
+쓰여 정점 수를 키운다. 허용 오차 (tolerance, m) 가 주어지면 원 둘레를 n각형으로
+근사할 때의 현 오차 r(1 - cos(π/n)) 가 허용 오차 이하가 되는 가장 작은 n을 쓴다.
+
+    with tessellation_policy(0.02):
+        add_part(part, material)      # segments(part.kind, part.size) 로 분할
+
+plan_tessellation은 씬 전체 삼각형 수가 예산 (budget) 을 넘지 않을 때까지
+허용 오차를 키운다. 박스와 텍스트는 분할과 무관하므로 고정 비용으로 센다.
+"""
+
+import math
+from collections import Counter
+from contextlib import contextmanager
+
+from .primitives import CYLINDER_VERTICES, SPHERE_SEGMENTS, SPHERE_RINGS
+
+# 분할 수 하한 (원기둥 / 구 둘레)
+MIN_SEGMENTS = 6
+
+# 예산을 맞출 때 허용 오차를 키우는 배율과 상한
+TOLERANCE_GROWTH = 1.25
+MAX_TOLERANCE = 10.0
+
+BOX_TRIANGLES = 12
+
+# None이면 Blender 기본 분할
+_tolerance = None
+
+
+@contextmanager
+def tessellation_policy(tolerance):
+    """블록 동안 허용 오차 tolerance (m, None이면 기본 분할) 로 분할"""
+    global _tolerance
+    previous = _tolerance
+    _tolerance = tolerance
+    try:
+        yield
+    finally:
+        _tolerance = previous
+
+
+def circle_segments(radius, tolerance, default):
+    """반지름 radius 원을 tolerance 이하 오차로 근사하는 분할 수 (짝수, MIN_SEGMENTS..default)"""
+    if tolerance is None:
+        return default
+    if radius <= tolerance:
+        return MIN_SEGMENTS
+    n = math.ceil(math.pi / math.acos(1 - tolerance / radius))
+    n += n % 2
+    return max(MIN_SEGMENTS, min(default, n))
+
+
+def part_segments(kind, size, tolerance):
+    """파트 종류 / 크기의 허용 오차 tolerance 기준 분할 수 (box, text는 None)
+
+    Returns:
+        cylinder: 둘레 정점 수, sphere: (segments, rings)
+    """
+    if kind == 'cylinder':
+        return circle_segments(max(size[0], size[1]) / 2, tolerance, CYLINDER_VERTICES)
+    if kind == 'sphere':
+        n = circle_segments(max(size) / 2, tolerance, SPHERE_SEGMENTS)
+        return n, max(3, min(SPHERE_RINGS, n // 2))
+    return None
+
+
+def segments(kind, size):
+    """현재 정책 (tessellation_policy) 의 분할 수"""
+    return part_segments(kind, size, _tolerance)
+
+
+def primitive_triangles(kind, divisions):
+    """segments() 결과 기준 삼각형 수"""
+    if kind == 'cylinder':
+        return 4 * divisions - 4
+    if kind == 'sphere':
+        n, rings = divisions
+        return 2 * n * (rings - 1)
+    return BOX_TRIANGLES
+
+
+def _curved_parts(entities):
+    """(원기둥/구 (종류, 크기) 개수, 그 밖의 파트와 미리 구운 메시의 삼각형 수)"""
+    curved = Counter()
+    fixed = 0
+    for entity in entities:
+        # 미리 구운 메시 (도로망, 가려진 면을 지운 건물) 는 분할과 무관한 고정 삼각형
+        for batch in entity.get('meshes', {}).values():
+            fixed += sum(total - 2 for total in batch.totals)
+        groups = [entity['parts'], *entity.get('lods', {}).values()]
+        for parts in groups:
+            for part in parts:
+                if part.kind in ('cylinder', 'sphere'):
+                    curved[(part.kind, part.size)] += 1
+                elif part.kind == 'box':
+                    fixed += BOX_TRIANGLES
+    return curved, fixed
+
+
+def _triangles(curved, fixed, tolerance):
+    return fixed + sum(primitive_triangles(kind, part_segments(kind, size, tolerance)) * n
+                       for (kind, size), n in curved.items())
+
+
+def plan_tessellation(entities, tolerance=None, budget=None):
+    """씬 엔티티 배치 (layout.iter_layout) 에 쓸 허용 오차와 삼각형 수 보고
+
+    Args:
+        tolerance: 시작 허용 오차 (m, None이면 기본 분할, 예산을 넘으면 1cm부터 키움)
+        budget: 씬 삼각형 예산 (None이면 tolerance 그대로)
+
+    Returns:
+        {'tolerance', 'before': 기본 분할 삼각형 수, 'after': 적용 후 삼각형 수, 'budget'}
+        (텍스트 제외, 예산을 못 맞추면 MAX_TOLERANCE에서 멈춤)
+    """
+    curved, fixed = _curved_parts(entities)
+    before = _triangles(curved, fixed, None)
+
+    if budget is not None and _triangles(curved, fixed, tolerance) > budget:
+        tolerance = tolerance if tolerance is not None else 0.01
+        while _triangles(curved, fixed, tolerance) > budget and tolerance < MAX_TOLERANCE:
+            tolerance = min(MAX_TOLERANCE, tolerance * TOLERANCE_GROWTH)
+
+    return {
+        'tolerance': tolerance,
+        'before': before,
+        'after': _triangles(curved, fixed, tolerance),
+        'budget': budget,
+    }
+
+
+def format_plan(plan):
+    """plan_tessellation 결과 한 줄 요약 (허용 오차가 없으면 기본 분할)"""
+    tolerance = "default segments" if plan['tolerance'] is None else f"tolerance {plan['tolerance']:.4g} m"
+    return f"Triangles: {plan['before']} -> {plan['after']} ({tolerance}, text excluded)"
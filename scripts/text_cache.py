@@ -0,0 +1,139 @@
+"""텍스트 메시 캐시
+
+글꼴 테셀레이션 (FONT 커브 -> 메시) 은 비싸므로 두 단계로 캐시한다.
+
+- 문자열 캐시: (text, size, extrude, align_x, align_y) -> 정점/면 데이터
+- 글자 캐시: (글자, size, extrude, align_y) -> 정점/면 데이터
+
+문자열 캐시에 없으면 글자 캐시의 글자 메시를 커닝 간격만큼 옮겨 이어 붙인다.
+글자 간격은 크기 1에서 글자 쌍마다 한 번 측정해 두고 size배 한다:
+    간격(a, b) = max_x(a + b + "|") - max_x(b + "|")
+뒤에 붙인 "|" 는 공백처럼 형상이 없는 글자도 잴 수 있게 하는 기준 글자다.
+
+캐시는 bpy 메시가 아닌 파이썬 데이터라 clear_scene 뒤에도 유효하다.
+"""
+
+from .instrument import count
+
+# 여러 줄 / 양쪽 정렬은 글자 단위로 조립하지 않고 문자열 전체를 테셀레이션
+COMPOSABLE_ALIGN_X = ('LEFT', 'CENTER', 'RIGHT')
+REFERENCE_GLYPH = "|"
+
+_texts = {}
+_glyphs = {}
+_max_x = {}
+_stats = {'text_hits': 0, 'text_misses': 0, 'glyph_hits': 0, 'glyph_misses': 0, 'tessellations': 0}
+
+
+def _tessellate(body, size=1.0, extrude=0.0, align_x='LEFT', align_y='TOP_BASELINE'):
+    """FONT 커브를 메시로 평가해 (정점 리스트, 면 인덱스 리스트) 반환 (씬에 아무것도 남기지 않음)"""
+    import bpy
+    _stats['tessellations'] += 1
+    count('tessellations')
+    curve = bpy.data.curves.new("TextCache", 'FONT')
+    curve.body = body
+    curve.size = size
+    curve.extrude = extrude
+    curve.align_x = align_x
+    curve.align_y = align_y
+
+    obj = bpy.data.objects.new("TextCache", curve)
+    bpy.context.scene.collection.objects.link(obj)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+
+    vertices = [v.co[:] for v in mesh.vertices]
+    polygons = [tuple(p.vertices) for p in mesh.polygons]
+
+    bpy.data.objects.remove(obj)
+    bpy.data.curves.remove(curve)
+    bpy.data.meshes.remove(mesh)
+    return vertices, polygons
+
+
+def _measure(body):
+    """크기 1, 왼쪽 정렬에서 문자열 형상의 최대 x"""
+    if body not in _max_x:
+        vertices, _ = _tessellate(body)
+        _max_x[body] = max((v[0] for v in vertices), default=0.0)
+    return _max_x[body]
+
+
+def pair_offset(a, b):
+    """크기 1에서 글자 a 원점부터 바로 뒤 글자 b 원점까지 거리 (커닝 포함)"""
+    return _measure(a + b + REFERENCE_GLYPH) - _measure(b + REFERENCE_GLYPH)
+
+
+def advance(char):
+    """크기 1에서 글자 하나의 전진 폭"""
+    return pair_offset(char, "")
+
+
+def glyph(char, size, extrude, align_y):
+    """글자 하나의 메시 데이터 (왼쪽 정렬, 원점 기준)"""
+    key = (char, size, extrude, align_y)
+    if key in _glyphs:
+        _stats['glyph_hits'] += 1
+    else:
+        _stats['glyph_misses'] += 1
+        _glyphs[key] = ([], []) if char.isspace() else _tessellate(char, size, extrude, 'LEFT', align_y)
+    return _glyphs[key]
+
+
+def _compose(body, size, extrude, align_x, align_y):
+    """캐시된 글자 메시를 이어 붙여 문자열 메시 데이터 생성"""
+    vertices = []
+    polygons = []
+    pen = 0.0
+    for i, char in enumerate(body):
+        if i:
+            pen += pair_offset(body[i - 1], char) * size
+        glyph_vertices, glyph_polygons = glyph(char, size, extrude, align_y)
+        base = len(vertices)
+        vertices.extend((x + pen, y, z) for x, y, z in glyph_vertices)
+        polygons.extend(tuple(base + j for j in polygon) for polygon in glyph_polygons)
+
+    width = pen + advance(body[-1]) * size
+    shift = {'LEFT': 0.0, 'CENTER': -width / 2, 'RIGHT': -width}[align_x]
+    if shift:
+        vertices = [(x + shift, y, z) for x, y, z in vertices]
+    return vertices, polygons
+
+
+def text_geometry(body, size=1.0, extrude=0.0, align_x='LEFT', align_y='TOP_BASELINE'):
+    """문자열 메시 데이터 (정점 리스트, 면 인덱스 리스트) - 텍스트 오브젝트 로컬 기준
+
+    반환값은 캐시와 공유되므로 수정하지 말 것.
+    """
+    key = (body, size, extrude, align_x, align_y)
+    if key in _texts:
+        _stats['text_hits'] += 1
+        return _texts[key]
+
+    _stats['text_misses'] += 1
+    if body and "\n" not in body and align_x in COMPOSABLE_ALIGN_X:
+        geometry = _compose(body, size, extrude, align_x, align_y)
+    else:
+        geometry = _tessellate(body, size, extrude, align_x, align_y)
+    _texts[key] = geometry
+    return geometry
+
+
+def part_geometry(part):
+    """layout 텍스트 Part의 메시 데이터"""
+    return text_geometry(part.extra['body'], part.size[0], part.size[2],
+                         part.extra['align_x'], part.extra['align_y'])
+
+
+def text_cache_stats():
+    """캐시 적중/실패 횟수와 실제 테셀레이션 횟수"""
+    return dict(_stats, texts=len(_texts), glyphs=len(_glyphs))
+
+
+def clear_text_cache():
+    """모든 캐시와 통계 초기화 (글꼴을 바꿨을 때 등)"""
+    _texts.clear()
+    _glyphs.clear()
+    _max_x.clear()
+    for key in _stats:
+        _stats[key] = 0
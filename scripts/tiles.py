@@ -0,0 +1,134 @@
+"""도시 규모 설정을 격자 타일로 나눠 타일마다 따로 내보내는 스트리밍 익스포트
+
+건물/나무를 position 기준 격자 칸으로 묶어 타일 하나씩 씬을 만들고
+GLB 하나로 내보낸 뒤 씬을 비운다. 한 번에 메모리에 올라가는 것은 타일
+하나뿐이고, 뷰어는 타일 인덱스 JSON의 경계 상자를 보고 필요한 타일만
+불러올 수 있다.
+"""
+
+import json
+import math
+import os
+from dataclasses import replace
+
+from .config_stream import iter_config
+from .layout import entity_bounds, iter_layout
+from .placement import apply_conflict_policy
+from .schema import CONFLICTS_OFF, Tessellation, normalize_config, validate_config
+from .scenes import EXPORTER_BLENDER, config_path, create_scene_from_config
+from .tessellation import format_plan, plan_tessellation
+from .utils import OUTPUT_DIR, clear_scene
+
+DEFAULT_TILE_SIZE = 100.0
+
+# 여러 타일에 걸치는 도로는 별도 타일 하나로 내보낸다
+ROAD_TILE = "road"
+
+
+def tile_of(position, tile_size):
+    """position (x, y, ...)이 속한 격자 칸 (ix, iy)"""
+    return math.floor(position[0] / tile_size), math.floor(position[1] / tile_size)
+
+
+def tile_id(tile):
+    return tile if tile == ROAD_TILE else f"{tile[0]}_{tile[1]}"
+
+
+def partition_config(config, tile_size=DEFAULT_TILE_SIZE):
+    """설정 (dict 또는 schema.SceneConfig) 을 타일별 SceneConfig로 나눔
+
+    Returns:
+        {(ix, iy) 또는 ROAD_TILE: 타일 SceneConfig} (키 순서대로 정렬)
+    """
+    config = normalize_config(config)
+    scene_name = config.scene.name
+    buildings = {}
+    trees = {}
+
+    for building in config.buildings:
+        buildings.setdefault(tile_of(building.position, tile_size), []).append(building)
+    for tree in config.trees:
+        trees.setdefault(tile_of(tree.position, tile_size), []).append(tree)
+
+    # 격자 타일에는 도로를 넣지 않음
+    tiles = {
+        tile: config.with_entities(f"{scene_name}_tile_{tile_id(tile)}",
+                                   buildings=buildings.get(tile, ()), trees=trees.get(tile, ()))
+        for tile in sorted(buildings.keys() | trees.keys())
+    }
+    if config.roads or config.road_network is not None:
+        tiles[ROAD_TILE] = config.with_entities(f"{scene_name}_tile_{ROAD_TILE}", roads=config.roads,
+                                                road_network=config.road_network)
+    return tiles
+
+
+def tile_bounds(tile_config):
+    """타일 안 엔티티 전체의 경계 상자 (glTF Y-up 좌표, {'min': [...], 'max': [...]})"""
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    for entity in iter_layout(tile_config):
+        entity_lo, entity_hi = entity_bounds(entity)
+        for axis in range(3):
+            lo[axis] = min(lo[axis], entity_lo[axis])
+            hi[axis] = max(hi[axis], entity_hi[axis])
+
+    # Blender Z-up -> glTF Y-up: (x, y, z) -> (x, z, -y)
+    return {
+        'min': [round(lo[0], 4), round(lo[2], 4), round(-hi[1], 4)],
+        'max': [round(hi[0], 4), round(hi[2], 4), round(-lo[1], 4)],
+    }
+
+
+def create_tiled_scene_from_config(config_name="scene_config.json", tile_size=DEFAULT_TILE_SIZE,
+                                   output_dir=OUTPUT_DIR, exporter=EXPORTER_BLENDER, **options):
+    """설정을 타일 단위로 생성해 타일마다 GLB 하나와 타일 인덱스 JSON을 저장
+
+    Args:
+        tile_size: 격자 칸 한 변 길이 (미터)
+        options: create_scene_from_config에 그대로 넘길 인자
+            (mesh_mode, merge, instancing, incremental, cache_dir)
+
+    Returns:
+        타일 인덱스 dict ({output_dir}/{scene}_tiles.json 으로도 저장)
+    """
+    if tile_size <= 0:
+        raise ValueError(f"tile_size must be positive, got {tile_size}")
+
+    config = validate_config(iter_config(config_path(config_name)))
+    # 타일 경계에 걸친 충돌도 찾도록 나누기 전에 한 번만 검사 (타일마다 다시 하지 않음)
+    config, _ = apply_conflict_policy(config)
+    # 삼각형 예산은 씬 전체 기준이므로 허용 오차도 나누기 전에 한 번 정하고 타일에는 고정값만 넘김
+    tessellation = config.scene.tessellation
+    if tessellation.enabled:
+        triangles = plan_tessellation(iter_layout(config, lods=options.get('lods', False)),
+                                      tessellation.tolerance, tessellation.budget)
+        print(f"{format_plan(triangles)} for all tiles")
+        tessellation = Tessellation(tolerance=triangles['tolerance'])
+    config.scene = replace(config.scene, conflicts=CONFLICTS_OFF, tessellation=tessellation)
+    scene_name = config.scene.name
+    os.makedirs(output_dir, exist_ok=True)
+
+    index = {'scene': scene_name, 'tileSize': tile_size, 'up': 'Y', 'tiles': []}
+    for tile, tile_config in partition_config(config, tile_size).items():
+        stats = create_scene_from_config(
+            config=tile_config, output_dir=output_dir, exporter=exporter, binary=True, **options
+        )
+        index['tiles'].append({
+            'id': tile_id(tile),
+            'file': os.path.basename(stats['output']),
+            'bounds': tile_bounds(tile_config),
+            'buildings': len(tile_config.buildings),
+            'trees': len(tile_config.trees),
+        })
+        print(f"Tile {tile_id(tile)}: {stats['output']}")
+
+    # 마지막 타일의 오브젝트/메시도 남기지 않는다
+    if exporter == EXPORTER_BLENDER:
+        clear_scene()
+
+    index_file = os.path.join(output_dir, f"{scene_name}_tiles.json")
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    print(f"Tile index: {index_file} ({len(index['tiles'])} tiles)")
+
+    return index
@@ -1,31 +1,92 @@
 """유틸리티 함수들"""
 
-import bpy
 import os
+import time
+from contextlib import contextmanager
+from .layout import material_key
+from .instrument import count
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
 
+# clear_scene이 비우는 bpy.data 컬렉션 (생성기와 기본 시작 씬이 만드는 종류)
+GENERATED_DATA = ('objects', 'meshes', 'materials', 'curves', 'fonts', 'images', 'textures',
+                  'cameras', 'lights')
+
+# material_cache() 안에서만 사용되는 머티리얼 캐시
+_material_cache = None
+
 
 def clear_scene():
-    """씬의 모든 오브젝트 삭제"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
+    """씬의 모든 오브젝트와 생성기가 만드는 데이터 블록을 한 번에 삭제
+
+    bpy.ops.object.delete와 종류별 remove 루프 대신 bpy.data.batch_remove로
+    한 번에 지우고, 남은 고아 데이터 (참조가 끊긴 블록) 도 정리한다.
+
+    Returns:
+        {'seconds': 걸린 시간, 'freed': {종류: 개수}, 'total': 전체 개수}
+    """
+    import bpy
+    start = time.perf_counter()
+
+    freed = {}
+    blocks = []
+    for kind in GENERATED_DATA:
+        items = list(getattr(bpy.data, kind))
+        if items:
+            freed[kind] = len(items)
+            blocks.extend(items)
+    bpy.data.batch_remove(blocks)
 
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
-    for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
-    for curve in bpy.data.curves:
-        bpy.data.curves.remove(curve)
+    orphans = bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    if orphans:
+        freed['orphans'] = orphans
+
+    if _material_cache is not None:
+        _material_cache['materials'].clear()
+
+    total = sum(freed.values())
+    count('freed', total)
+    return {'seconds': round(time.perf_counter() - start, 6), 'freed': freed, 'total': total}
+
+
+@contextmanager
+def material_cache():
+    """블록 안의 create_material 호출이 같은 파라미터의 머티리얼을 공유하도록 함
+
+    Yields:
+        캐시 dict - 'hits', 'misses' 카운터와 'materials' {키: 머티리얼}
+    """
+    global _material_cache
+    previous = _material_cache
+    cache = {'materials': {}, 'hits': 0, 'misses': 0}
+    _material_cache = cache
+    try:
+        yield cache
+    finally:
+        _material_cache = previous
 
 
 def create_material(name, color, metallic=0.0, roughness=0.5, alpha=1.0):
     """머티리얼 생성
 
+    material_cache() 안에서는 같은 (color, metallic, roughness, alpha)의
+    머티리얼을 재사용한다 (이름은 처음 만든 것을 따름).
+
     Args:
         alpha: 투명도 (0.0=완전 투명, 1.0=불투명)
     """
+    import bpy
+    key = None
+    if _material_cache is not None:
+        key = material_key(color, metallic, roughness, alpha)
+        cached = _material_cache['materials'].get(key)
+        if cached is not None:
+            _material_cache['hits'] += 1
+            return cached
+        _material_cache['misses'] += 1
+
     mat = bpy.data.materials.new(name=name)
+    count('materials')
     mat.use_nodes = True
     bsdf = mat.node_tree.nodes["Principled BSDF"]
     bsdf.inputs['Base Color'].default_value = color
@@ -38,15 +99,55 @@ def create_material(name, color, metallic=0.0, roughness=0.5, alpha=1.0):
         mat.blend_method = 'BLEND'
         mat.surface_render_method = 'BLENDED'
 
+    # .blend로 저장했다가 다시 불러와도 캐시에 합칠 수 있도록 키를 남김
+    mat["material_key"] = list(material_key(color, metallic, roughness, alpha))
+    if key is not None:
+        _material_cache['materials'][key] = mat
+
     return mat
 
 
-def export_to_gltf(filepath, export_format='GLTF_SEPARATE'):
-    """GLTF 형식으로 내보내기"""
+def share_material(mat):
+    """material_cache() 안에서 mat과 같은 키의 머티리얼을 반환
+
+    캐시에 없으면 mat을 등록하고 그대로 반환한다. 키가 없는 머티리얼이나
+    캐시가 비활성일 때도 mat을 그대로 반환한다.
+    """
+    if _material_cache is None or "material_key" not in mat:
+        return mat
+
+    key = tuple(round(v, 6) for v in mat["material_key"])
+    cached = _material_cache['materials'].get(key)
+    if cached is None:
+        _material_cache['materials'][key] = mat
+        return mat
+    _material_cache['hits'] += 1
+    return cached
+
+
+def export_to_gltf(filepath, export_format='GLTF_SEPARATE', extras=False, gpu_instances=False,
+                   draco=False, draco_level=6):
+    """GLTF 형식으로 내보내기
+
+    Args:
+        extras: True면 오브젝트 커스텀 속성을 glTF extras로 내보냄
+        gpu_instances: True면 같은 엠프티 아래 메시를 공유하는 오브젝트를
+            EXT_mesh_gpu_instancing으로 내보냄 (create_tree_instances 참고)
+        draco: True면 KHR_draco_mesh_compression으로 압축 (위치 14비트, 법선 10비트 양자화)
+        draco_level: Draco 압축 수준 (0-10, 높을수록 작고 느림)
+    """
+    import bpy
     bpy.ops.export_scene.gltf(
         filepath=filepath,
         export_format=export_format,
         export_apply=True,
-        export_materials='EXPORT'
+        export_materials='EXPORT',
+        export_extras=extras,
+        export_gpu_instances=gpu_instances,
+        export_draco_mesh_compression_enable=draco,
+        export_draco_mesh_compression_level=draco_level,
+        export_draco_position_quantization=14,
+        export_draco_normal_quantization=10
     )
+    count('ops')
     print(f"Exported to: {filepath}")
@@ -0,0 +1,96 @@
+"""(씬 시드, 엔티티 id) 해시 기반 결정적 변형
+
+엔티티마다 sha256(시드, 종류, id) 로 시드한 random.Random 인스턴스를 만들어
+변형 값을 미리 계산한다. 전역 random 상태를 쓰지 않으므로 병렬 / 증분 빌드나
+타일 분할과 무관하게 같은 엔티티는 항상 같은 결과가 나온다.
+
+- 건물: 벽 색 밝기, 창문 크기 (FACADE_STYLES), 창문 패턴 (층 × 앞/뒤 × 창 마스크)
+- 나무: 씬마다 TREE_SHAPES개의 잎 배치 / 크기 / 색 모양을 만들어 두고
+        나무마다 하나를 고름 (인스턴싱 프로토타입을 모양별로 공유할 수 있게)
+
+씬 설정에 scene.seed가 없으면 변형하지 않는다 (기존 출력과 같음).
+"""
+
+import hashlib
+import random
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+# 창문 (폭, 높이) 후보 - None은 기본 창문 (layout.WINDOW_WIDTH × WINDOW_HEIGHT)
+FACADE_STYLES = (
+    None,
+    (0.9, 1.8),
+    (1.6, 1.2),
+    (1.2, 1.1),
+)
+
+# 창문 패턴 - 'random'은 창마다 WINDOW_FILL 확률로 창을 둠
+WINDOW_PATTERNS = ('full', 'alternate', 'random')
+WINDOW_FILL = 0.8
+
+# 벽 색 밝기 배율 범위
+WALL_BRIGHTNESS = (0.88, 1.12)
+
+TREE_SHAPES = 8
+
+# 잎 구 개수 (layout.tree_parts와 같음)
+LEAF_COUNT = 5
+
+# window_size: (폭, 높이) 또는 None (기본), window_mask: 층마다 [앞 창 0..n-1, 뒤 창 0..n-1] 순서의 0/1 (array('B'))
+BuildingVariant = namedtuple('BuildingVariant', ['wall_color', 'window_size', 'window_mask'])
+
+# leaf_offsets: 잎마다 (dx, dy, dz) 높이 비율 (array('d')), leaf_scales: 잎 지름 배율 (array('d'))
+TreeVariant = namedtuple('TreeVariant', ['shape', 'leaf_offsets', 'leaf_scales', 'leaf_color'])
+
+
+def entity_rng(seed, kind, entity_id):
+    """(시드, 종류, id) 의 sha256으로 시드한 독립 난수 생성기"""
+    digest = hashlib.sha256(f"{seed}\0{kind}\0{entity_id}".encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'little'))
+
+
+def building_variant(building, windows, seed=None):
+    """건물 레코드 (schema.Building) 의 변형 (seed가 None이면 변형 없음)
+
+    Args:
+        windows: 층의 한 면당 창문 수 (layout.windows_per_floor)
+    """
+    if seed is None:
+        return BuildingVariant(building.wall_color, None, None)
+
+    rng = entity_rng(seed, 'building', building.name)
+    brightness = rng.uniform(*WALL_BRIGHTNESS)
+    wall_color = tuple(min(1.0, round(c * brightness, 4)) for c in building.wall_color[:3]) + (1.0,)
+    window_size = rng.choice(FACADE_STYLES)
+
+    pattern = rng.choice(WINDOW_PATTERNS)
+    if pattern == 'full':
+        mask = [1] * (2 * windows * building.floors)
+    elif pattern == 'alternate':
+        # 층마다 엇갈리는 체크 무늬
+        mask = [(i + floor) % 2 == 0 for floor in range(building.floors) for _ in range(2) for i in range(windows)]
+    else:
+        mask = [rng.random() < WINDOW_FILL for _ in range(2 * windows * building.floors)]
+    return BuildingVariant(wall_color, window_size, array('B', mask))
+
+
+@lru_cache(maxsize=64)
+def tree_shapes(seed):
+    """씬 시드의 나무 모양 TREE_SHAPES개"""
+    shapes = []
+    for shape in range(TREE_SHAPES):
+        rng = entity_rng(seed, 'tree_shape', shape)
+        offsets = array('d', (rng.uniform(-0.08, 0.08) for _ in range(LEAF_COUNT * 3)))
+        scales = array('d', (rng.uniform(0.8, 1.15) for _ in range(LEAF_COUNT)))
+        leaf_color = (round(rng.uniform(0.15, 0.3), 4), round(rng.uniform(0.42, 0.58), 4),
+                      round(rng.uniform(0.1, 0.2), 4), 1.0)
+        shapes.append(TreeVariant(shape, offsets, scales, leaf_color))
+    return tuple(shapes)
+
+
+def tree_variant(tree, seed=None):
+    """나무 레코드 (schema.Tree) 의 모양 (seed가 None이면 None)"""
+    if seed is None:
+        return None
+    return tree_shapes(seed)[entity_rng(seed, 'tree', tree.index).randrange(TREE_SHAPES)]
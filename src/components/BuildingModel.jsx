@@ -1,11 +1,40 @@
 import { useMemo } from 'react'
+import { LOD } from 'three'
 import { useGLTF, Center, Bounds } from '@react-three/drei'
 
+// extras의 lod_distances가 있는 건물 노드를 THREE.LOD로 바꿔 거리별 단계를 고름
+function applyLods(root) {
+  const buildings = []
+  root.traverse((child) => {
+    if (child.userData.lod_distances) buildings.push(child)
+  })
+
+  buildings.forEach((building) => {
+    const lod = new LOD()
+    lod.name = building.name
+    lod.userData = building.userData
+    lod.position.copy(building.position)
+    lod.quaternion.copy(building.quaternion)
+    lod.scale.copy(building.scale)
+
+    const distances = building.userData.lod_distances
+    building.children
+      .filter((level) => level.userData.lod !== undefined)
+      .forEach((level) => lod.addLevel(level, distances[level.userData.lod] ?? 0))
+
+    building.parent.add(lod)
+    building.removeFromParent()
+  })
+}
+
 function Model({ url }) {
-  const { scene } = useGLTF(url)
+  // scene.export.compression으로 압축된 파일도 읽도록 Draco / meshopt 디코더를 켬
+  // (KHR_mesh_quantization은 GLTFLoader가 바로 지원)
+  const { scene } = useGLTF(url, true, true)
 
   const clonedScene = useMemo(() => {
     const cloned = scene.clone(true)
+    applyLods(cloned)
     cloned.traverse((child) => {
       if (child.isMesh) {
         child.castShadow = true
@@ -0,0 +1,6 @@
+"""테스트에서 저장소 루트의 scripts 패키지를 불러오도록 경로 추가"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
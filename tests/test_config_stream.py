@@ -0,0 +1,43 @@
+"""config_stream 스트리밍 JSON 로더 검사 (bpy 없이)"""
+
+import json
+import os
+from io import StringIO
+
+import pytest
+
+from scripts import config_stream
+from scripts.config_stream import collect_config, iter_json_sections
+from scripts.schema import validate_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(ROOT, "config", "scene_config.json")
+
+
+def test_empty_roads_stay_empty():
+    config = validate_config(iter_json_sections(StringIO('{"roads": []}')))
+    assert config.roads == []
+
+
+def test_missing_roads_get_default_road():
+    config = validate_config(iter_json_sections(StringIO('{"scene": {"name": "x"}}')))
+    assert len(config.roads) == 1
+
+
+@pytest.mark.parametrize("text", ['{"a": 1} x', '{"scene": {"name": "x"}} garbage{{{', '{} {}'])
+def test_trailing_content_is_rejected(text):
+    with pytest.raises(ValueError):
+        list(iter_json_sections(StringIO(text)))
+
+
+def test_trailing_whitespace_is_allowed():
+    assert list(iter_json_sections(StringIO('{"a": 1}\n  \n'))) == [("a", 1)]
+
+
+def test_small_chunks_match_json_load(monkeypatch):
+    # 원소 / 숫자 / 문자열이 조각 경계에 걸리도록 아주 작은 조각으로 읽음
+    monkeypatch.setattr(config_stream, "CHUNK_SIZE", 7)
+    with open(CONFIG, encoding="utf-8") as f:
+        streamed = collect_config(iter_json_sections(f))
+    with open(CONFIG, encoding="utf-8") as f:
+        assert streamed == json.load(f)
@@ -0,0 +1,146 @@
+"""exporter='direct' 결과를 Blender 익스포터로 만든 output/combined_scene.gltf와 비교
+
+Blender 없이 돌도록 설정에서 텍스트를 빼고 (텍스트 테셀레이션은 bpy가 필요),
+기준 파일에서도 텍스트 노드와 그 머티리얼을 뺀 뒤 비교한다.
+
+- 노드 트리: 부모 경로 / 이름 (Blender 중복 접미사 제외), 회전
+- 머티리얼: 노드별 파라미터와 쓰인 파라미터 목록 (이름은 direct 쪽에서 공유되므로 제외)
+- 접근자 / 버퍼 뷰: POSITION, NORMAL, 인덱스의 componentType, count, type,
+  byteStride, target, byteLength, 노드 스케일을 곱한 min/max
+  (Blender는 원기둥/구 크기를 정점에 굽고 direct는 단위 도형을 노드 스케일로 맞춤)
+
+위치는 비교하지 않는다. 기준 파일은 나무 / 도로 자식 노드에 부모 위치가 한 번 더
+더해져 있다 (layout 분리 전 create_tree / create_road의 부모 지정 방식).
+"""
+
+import json
+import os
+
+import pytest
+
+from scripts.gltf_writer import _base_name, read_gltf
+from scripts.scenes import EXPORTER_DIRECT, create_scene_from_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "output", "combined_scene.gltf")
+CONFIG = os.path.join(ROOT, "config", "scene_config.json")
+
+TEXT_KEYS = ("text", "textColor", "textPosition", "textFloor", "textSize")
+ATTRIBUTES = ("POSITION", "NORMAL")
+
+
+def is_text(name):
+    return "_Text_" in name or "_RoofText_" in name
+
+
+def material_params(material):
+    pbr = material.get("pbrMetallicRoughness", {})
+    return (
+        tuple(round(c, 4) for c in pbr.get("baseColorFactor", [1, 1, 1, 1])),
+        round(pbr.get("metallicFactor", 1.0), 4),
+        round(pbr.get("roughnessFactor", 1.0), 4),
+        material.get("alphaMode", "OPAQUE"),
+        material.get("doubleSided", False),
+    )
+
+
+def accessor_layout(doc, index, scale=None):
+    accessor = doc["accessors"][index]
+    view = doc["bufferViews"][accessor["bufferView"]]
+    layout = {
+        "componentType": accessor["componentType"],
+        "count": accessor["count"],
+        "type": accessor["type"],
+        "byteStride": view.get("byteStride"),
+        "target": view.get("target"),
+        "byteLength": view["byteLength"],
+    }
+    if "min" in accessor:
+        layout["min"] = tuple(c * s for c, s in zip(accessor["min"], scale))
+        layout["max"] = tuple(c * s for c, s in zip(accessor["max"], scale))
+    return layout
+
+
+def scene_summary(doc):
+    """{(부모 경로, 노드 이름): 노드 요약} (텍스트 노드 제외)"""
+    nodes = doc["nodes"]
+    summary = {}
+
+    def visit(index, path):
+        node = nodes[index]
+        name = _base_name(node["name"])
+        if is_text(name):
+            return
+        key = (path, name)
+        assert key not in summary, f"duplicate node {key}"
+        entry = {
+            "rotation": tuple(node.get("rotation", (0, 0, 0, 1))),
+            "children": sorted(_base_name(nodes[c]["name"]) for c in node.get("children", [])
+                               if not is_text(nodes[c]["name"])),
+        }
+        if "mesh" in node:
+            primitive = doc["meshes"][node["mesh"]]["primitives"][0]
+            scale = node.get("scale", (1, 1, 1))
+            entry["material"] = material_params(doc["materials"][primitive["material"]])
+            entry["indices"] = accessor_layout(doc, primitive["indices"])
+            for attribute in ATTRIBUTES:
+                entry[attribute] = accessor_layout(doc, primitive["attributes"][attribute], scale)
+        summary[key] = entry
+        for child in node.get("children", []):
+            visit(child, f"{path}/{name}")
+
+    for root in doc["scenes"][doc.get("scene", 0)]["nodes"]:
+        visit(root, "")
+    return summary
+
+
+@pytest.fixture(scope="module")
+def documents(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("direct")
+    with open(CONFIG, encoding="utf-8") as f:
+        config = json.load(f)
+    for building in config["buildings"]:
+        for key in TEXT_KEYS:
+            building.pop(key, None)
+    config_file = tmp_path / "scene_config.json"
+    config_file.write_text(json.dumps(config), encoding="utf-8")
+
+    result = create_scene_from_config(str(config_file), exporter=EXPORTER_DIRECT,
+                                      output_dir=str(tmp_path / "output"))
+    return read_gltf(BASELINE), read_gltf(result["output"])
+
+
+def test_node_tree(documents):
+    baseline, direct = (scene_summary(doc) for doc in documents)
+
+    assert sorted(direct) == sorted(baseline)
+    for key, entry in baseline.items():
+        assert direct[key]["children"] == entry["children"], key
+        assert direct[key]["rotation"] == pytest.approx(entry["rotation"], abs=1e-6), key
+
+
+def test_materials(documents):
+    baseline, direct = (scene_summary(doc) for doc in documents)
+
+    used = {entry["material"] for entry in baseline.values() if "material" in entry}
+    assert {material_params(m) for m in documents[1]["materials"]} == used
+    for key, entry in baseline.items():
+        assert direct[key].get("material") == entry.get("material"), key
+
+
+def test_accessor_layout(documents):
+    baseline, direct = (scene_summary(doc) for doc in documents)
+
+    meshes = 0
+    for key, entry in baseline.items():
+        for field in ("indices", *ATTRIBUTES):
+            if field not in entry:
+                continue
+            expected = dict(entry[field])
+            actual = dict(direct[key][field])
+            for bound in ("min", "max"):
+                if bound in expected:
+                    assert actual.pop(bound) == pytest.approx(expected.pop(bound), rel=1e-5, abs=1e-6), (key, field)
+            assert actual == expected, (key, field)
+        meshes += "indices" in entry
+    assert meshes == 266
@@ -0,0 +1,136 @@
+"""layout 모듈 (bpy 없이) 의 파트 수 / 위치 / 크기 / 머티리얼 슬롯 검사
+
+기대값은 layout 분리 전 Blender 함수 (create_floor, create_building, create_entrance,
+create_tree, create_road) 가 만들던 오브젝트의 위치 / 스케일에서 옮겨 적은 것이다.
+"""
+
+import math
+from collections import Counter
+
+import pytest
+
+from scripts.layout import floor_parts, iter_layout, scene_layout
+from scripts.schema import normalize_config
+
+SCENE = {
+    "scene": {"name": "layout_test"},
+    "buildings": [{
+        "name": "Shop", "position": [10, 20], "floors": 1, "width": 8, "depth": 6,
+        "floorHeight": 4, "entrance": {"width": 3, "height": 2.8},
+    }],
+    "road": {"length": 30, "width": 6, "position": [0, -15, 0]},
+    "trees": [{"position": [5, 5], "height": 4}],
+}
+
+
+def by_name(parts):
+    return {part.name: part for part in parts}
+
+
+def assert_part(part, location, size, material, rotation=(0, 0, 0)):
+    assert part.location == pytest.approx(location)
+    assert part.size == pytest.approx(size)
+    assert part.rotation == pytest.approx(rotation)
+    assert part.material == material
+
+
+@pytest.fixture(scope="module")
+def entities():
+    return {entity['kind']: entity for entity in scene_layout(SCENE)}
+
+
+def test_floor_parts():
+    parts = floor_parts(8, 6, 3.5, 2)
+    named = by_name(parts)
+
+    assert len(parts) == 9
+    assert Counter(parts.materials) == {'concrete': 1, 'wall': 4, 'glass': 4}
+    assert_part(named["Floor_2_Slab"], (0, 0, 3.6), (8, 6, 0.2), 'concrete')
+    assert_part(named["Floor_2_Wall_Back"], (0, 2.925, 5.35), (8, 0.15, 3.3), 'wall')
+    assert_part(named["Floor_2_Wall_Front"], (0, -2.925, 5.35), (8, 0.15, 3.3), 'wall')
+    assert_part(named["Floor_2_Wall_Right"], (3.925, 0, 5.35), (0.15, 5.7, 3.3), 'wall')
+    assert_part(named["Floor_2_Wall_Left"], (-3.925, 0, 5.35), (0.15, 5.7, 3.3), 'wall')
+    assert_part(named["Floor_2_Window_Front_0"], (-4/3, -2.925, 5.35), (1.2, 0.17, 1.5), 'glass')
+    assert_part(named["Floor_2_Window_Back_1"], (4/3, 2.925, 5.35), (1.2, 0.17, 1.5), 'glass')
+
+
+def test_floor_parts_keeps_default_window_size_on_low_floors():
+    windows = [part for part in floor_parts(8, 6, 2.0, 1) if 'Window' in part.name]
+    assert windows
+    assert all(part.size == pytest.approx((1.2, 0.17, 1.5)) for part in windows)
+
+
+def test_building_with_entrance(entities):
+    building = entities['building']
+    parts = building['parts']
+    named = by_name(parts)
+
+    assert building['location'] == (10, 20, 0)
+    assert 'rotation' not in building
+    assert len(parts) == 28
+    assert Counter(parts.materials) == {
+        'concrete': 1, 'wall': 6, 'glass': 2, 'roof': 1,
+        'frame': 12, 'door_glass': 2, 'handle': 2, 'canopy': 1, 'canopy_glass': 1,
+    }
+    assert set(parts.materials) == set(building['materials'])
+
+    # 입구 폭 3: 앞벽은 좌/우/위로 나뉘고 앞 창문 (x = ±4/3) 은 입구와 겹쳐 빠짐
+    assert_part(named["Floor_1_Wall_Front_Left"], (-2.75, -2.925, 2.1), (2.5, 0.15, 3.8), 'wall')
+    assert_part(named["Floor_1_Wall_Front_Right"], (2.75, -2.925, 2.1), (2.5, 0.15, 3.8), 'wall')
+    assert_part(named["Floor_1_Wall_Front_Above"], (0, -2.925, 3.5), (3, 0.15, 1.0), 'wall')
+    assert not any(name.startswith("Floor_1_Window_Front") for name in named)
+    assert_part(named["Shop_Roof"], (0, 0, 4.15), (8.3, 6.3, 0.3), 'roof')
+
+    door_width = (3 - 0.06) / 2
+    assert_part(named["Shop_Entrance_TopFrame"], (0, -2.96, 2.8), (3.1, 0.08, 0.1), 'frame')
+    assert_part(named["Shop_DoorGlass_1"], (door_width/2 + 0.015, -2.96, 1.35),
+                (door_width - 0.08, 0.02, 2.58), 'door_glass')
+    assert_part(named["Shop_DoorHandle_0"], (-door_width/2 - 0.015 - (door_width/2 - 0.15), -3.02, 1.26),
+                (0.04, 0.04, 0.15), 'handle', rotation=(math.pi/2, 0, 0))
+    assert named["Shop_DoorHandle_0"].kind == 'cylinder'
+    assert_part(named["Shop_CanopyFrame"], (0, -3.6, 2.95), (3.8, 1.0, 0.05), 'canopy')
+
+
+def test_tree(entities):
+    tree = entities['tree']
+    parts = tree['parts']
+
+    assert tree['location'] == (5, 5, 0)
+    assert len(parts) == 6
+    assert sorted(tree['materials']) == ['leaves', 'trunk']
+    assert parts.kinds == ['cylinder'] + ['sphere'] * 5
+    assert_part(parts[0], (0, 0, 0.8), (0.3, 0.3, 1.6), 'trunk')
+    assert_part(parts[1], (0, 0, 2.8), (2, 2, 2), 'leaves')
+    assert_part(parts[5], (-0.3, -0.3, 2.2), (2, 2, 2), 'leaves')
+
+
+def test_road(entities):
+    road = entities['road']
+    parts = road['parts']
+    named = by_name(parts)
+
+    assert road['location'] == (0, -15, 0)
+    assert road['rotation'] == pytest.approx((0, 0, 0))
+    # 표면 + 중앙선 + 점선 10개 × 2줄 + 인도 2
+    assert len(parts) == 24
+    assert Counter(parts.materials) == {'asphalt': 1, 'line': 21, 'sidewalk': 2}
+    assert sorted(road['materials']) == ['asphalt', 'line', 'sidewalk']
+    assert_part(named["Road_Surface"], (0, 0, -0.05), (30, 6, 0.1), 'asphalt')
+    assert_part(named["Road_CenterLine"], (0, 0, 0.01), (30, 0.15, 0.02), 'line')
+    assert_part(named["Road_Dash_0_-1.5"], (-13, -1.5, 0.01), (2, 0.1, 0.02), 'line')
+    assert_part(named["Road_Dash_9_1.5"], (14, 1.5, 0.01), (2, 0.1, 0.02), 'line')
+    assert_part(named["Sidewalk_-4.0"], (0, -4, 0.05), (30, 2, 0.2), 'sidewalk')
+    assert_part(named["Sidewalk_4.0"], (0, 4, 0.05), (30, 2, 0.2), 'sidewalk')
+
+
+def test_culled_building_keeps_untrimmed_parts():
+    building = next(iter_layout(normalize_config(SCENE), cull=True))
+    named = by_name(building['parts'])
+    stats = building['cull']
+
+    # 창문 (옆면이 벽에 조각으로만 덮임) 과 문 손잡이는 굽지 않고 공유 도형 파트로 남김
+    assert "Floor_1_Window_Back_0" in named
+    assert named["Shop_DoorHandle_0"].kind == 'cylinder'
+    assert "Floor_1_Wall_Back" not in named
+    assert stats['kept'] == len(building['parts'])
+    assert stats['after'] < stats['before']
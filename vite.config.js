@@ -1,6 +1,26 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// output/의 glTF가 다시 써지면 (데몬 감시 모드 등) 뷰어를 새로 고침
+function reloadOnOutput() {
+  const pattern = /[\\/]output[\\/].*\.(gltf|glb|bin)$/
+  let timer = null
+  return {
+    name: 'reload-on-output',
+    configureServer(server) {
+      server.watcher.add('output')
+      const reload = (file) => {
+        if (!pattern.test(file)) return
+        // .gltf와 .bin이 연달아 써지므로 한 번만 새로 고침
+        clearTimeout(timer)
+        timer = setTimeout(() => server.ws.send({ type: 'full-reload' }), 100)
+      }
+      server.watcher.on('add', reload)
+      server.watcher.on('change', reload)
+    },
+  }
+}
+
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), reloadOnOutput()],
 })